@@ -4,6 +4,7 @@ An unofficial, reverse-engineered API client for AlignBooks Accounting & ERP.
 """
 
 from .client import AlignBooksClient
+from .enterprise import EnterpriseClient
 from .services import (
     ConfigService,
     CustomersService,
@@ -13,7 +14,9 @@ from .services import (
     ItemsService,
     LedgersService,
     MastersService,
+    NotificationsService,
     PurchaseService,
+    QueryService,
     ReportsService,
     SalesService,
     VendorsService,
@@ -33,6 +36,7 @@ class AlignBooks(AlignBooksClient):
         >>> ab = AlignBooks(email="...", password="...", api_key="...", ...)
         >>> vendors = ab.vendors.list()
         >>> pdf_bytes, name = ab.documents.get_pdf(doc_id, vtype=18)
+        >>> rows = ab.query.select("mst_item", ["id", "name"], limit=10)
     """
 
     def __init__(self, *args, **kwargs):
@@ -51,5 +55,7 @@ class AlignBooks(AlignBooksClient):
         self.reports = ReportsService(self)
         self.config = ConfigService(self)
         self.documents = DocumentsService(self)
+        self.query = QueryService(self)
+        self.notifications = NotificationsService(self)
 
-__all__ = ["AlignBooks", "AlignBooksClient"]
+__all__ = ["AlignBooks", "AlignBooksClient", "EnterpriseClient"]
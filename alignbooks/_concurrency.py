@@ -0,0 +1,77 @@
+"""Small thread-pool helpers shared by the fan-out and bulk APIs."""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def run_parallel(
+    fn: Callable[[T], Any],
+    items: Iterable[T],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    *,
+    return_exceptions: bool = False,
+) -> list[Any]:
+    """Call ``fn`` for every item on a thread pool and return results in input order.
+
+    Each task runs inside a copy of the caller's context, so context-local
+    state (deadlines, trace spans) follows the work onto the pool threads.
+
+    Args:
+        fn: Callable applied to each item.
+        items: Work items.
+        max_workers: Upper bound on concurrent threads.
+        return_exceptions: If True, exceptions are returned in place of results
+            instead of being raised.
+
+    Returns:
+        List of results (or exceptions) aligned with ``items``.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    workers = max(1, min(max_workers, len(items)))
+    results: list[Any] = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="alignbooks") as pool:
+        futures = [pool.submit(contextvars.copy_context().run, fn, item) for item in items]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as exc:
+                if not return_exceptions:
+                    raise
+                results.append(exc)
+    return results
+
+
+class RateLimiter:
+    """Spaces out calls to at most ``rate`` per second, across threads.
+
+    Args:
+        rate: Maximum calls started per second.
+    """
+
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.interval = 1.0 / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the caller may start its next call."""
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next)
+            self._next = at + self.interval
+        if at > now:
+            time.sleep(at - now)
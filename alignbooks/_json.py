@@ -0,0 +1,56 @@
+"""JSON encoding for request bodies and responses.
+
+Uses ``orjson`` when it is installed (``pip install alignbooks-sdk[fast]``) and
+falls back to the standard library with compact separators otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+EMPTY_BODY = b"{}"
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize ``obj`` to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON text; raises ``json.JSONDecodeError`` on invalid input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class EncodedBody:
+    """A request body serialized once and reusable across calls.
+
+    Build one with :meth:`AlignBooksClient.prepare
+    <alignbooks.client.AlignBooksClient.prepare>` for bodies sent repeatedly
+    (polling, pagination templates). The original dict is kept for cache keys.
+
+    Attributes:
+        body: The original request body.
+        data: Its JSON encoding.
+    """
+
+    __slots__ = ("body", "data")
+
+    def __init__(self, body: dict[str, Any] | None):
+        self.body = body or {}
+        self.data = dumps(self.body) if body else EMPTY_BODY
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return f"EncodedBody({len(self.data)} bytes)"
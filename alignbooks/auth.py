@@ -1,14 +1,20 @@
 """Authentication utilities for AlignBooks API.
 
-Handles AES-256-CBC encryption for ab_token generation and login response decryption.
+Handles AES-256-CBC encryption for ab_token generation and login response decryption,
+and the reverse direction (:func:`decode_ab_token`) for proxies and local stand-in
+servers that need to inspect incoming requests.
 """
 
 from __future__ import annotations
 
 import base64
+import binascii
+import hashlib
 import json
 import os
 from datetime import datetime
+from functools import lru_cache, partial
+from typing import Any, Iterable
 
 from Crypto.Cipher import AES
 from Crypto.Protocol.KDF import PBKDF2
@@ -21,6 +27,10 @@ from .constants import (
     PBKDF2_ITERATIONS,
     PBKDF2_KEY_LENGTH,
 )
+from .exceptions import InvalidTokenError
+from .executors import Executor, map_chunked
+
+TOKEN_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 
 def make_ab_token(
@@ -60,7 +70,7 @@ def make_ab_token(
         "apiname": apiname,
         "apikey": api_key,
         "master_type": master_type,
-        "client_date_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "client_date_time": datetime.now().strftime(TOKEN_TIME_FORMAT),
     }
     plaintext = json.dumps(header_info).encode("utf-8")
     salt = os.urandom(16)
@@ -87,3 +97,127 @@ def decrypt_login_response(encrypted_b64: str) -> dict:
     cipher = AES.new(AES_KEY, AES.MODE_CBC, iv=AES_IV_ZERO)
     decrypted = unpad(cipher.decrypt(encrypted), AES.block_size).decode("utf-8")
     return json.loads(decrypted)
+
+
+@lru_cache(maxsize=4096)
+def _token_key(salt: bytes) -> bytes:
+    # Same derivation as make_ab_token (PBKDF2-HMAC-SHA1), memoized per salt.
+    return hashlib.pbkdf2_hmac("sha1", AES_KEY, salt, PBKDF2_ITERATIONS, PBKDF2_KEY_LENGTH)
+
+
+def decode_ab_token(token: str | bytes, *, include_password: bool = False) -> dict[str, Any]:
+    """Decrypt an ab_token header value back into its auth fields.
+
+    Keys derived from each token's salt are memoized, so repeated tokens
+    (retries, replayed logs) skip the PBKDF2 step.
+
+    Args:
+        token: Base64 ab_token as built by :func:`make_ab_token`.
+        include_password: Keep the ``password`` field (dropped by default so
+            decoded tokens are safe to log).
+
+    Returns:
+        The token fields (``apiname``, ``company_id``, ``user_id``, ...).
+
+    Raises:
+        InvalidTokenError: If the token is malformed or was not encrypted with
+            this SDK's key.
+    """
+    try:
+        raw = base64.b64decode(token, validate=True)
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidTokenError(f"ab_token is not valid base64: {exc}") from exc
+    if len(raw) < 48 or (len(raw) - 32) % AES.block_size:
+        raise InvalidTokenError(f"ab_token has an invalid length ({len(raw)} bytes)")
+
+    salt, iv, ciphertext = raw[:16], raw[16:32], raw[32:]
+    cipher = AES.new(_token_key(salt), AES.MODE_CBC, iv)
+    try:
+        info = json.loads(unpad(cipher.decrypt(ciphertext), AES.block_size))
+    except ValueError as exc:
+        raise InvalidTokenError("ab_token could not be decrypted") from exc
+    if not isinstance(info, dict):
+        raise InvalidTokenError("ab_token payload is not a JSON object")
+    if not include_password:
+        info.pop("password", None)
+    return info
+
+
+def verify_ab_token(
+    token: str | bytes,
+    *,
+    max_age: float | None = None,
+    now: datetime | None = None,
+    **expected: Any,
+) -> dict[str, Any]:
+    """Decode an ab_token and check its fields.
+
+    Args:
+        token: Base64 ab_token.
+        max_age: Reject tokens whose ``client_date_time`` is older than this
+            many seconds (or that far in the future).
+        now: Reference time for ``max_age`` (default: current local time).
+        **expected: Field values the token must carry, e.g.
+            ``company_id="..."`` or ``apiname="QueryExecute"``.
+
+    Returns:
+        The decoded token fields.
+
+    Raises:
+        InvalidTokenError: If decoding fails or a check does not pass.
+    """
+    info = decode_ab_token(token, include_password="password" in expected)
+    for field, value in expected.items():
+        if info.get(field) != value:
+            raise InvalidTokenError(f"ab_token {field} mismatch: {info.get(field)!r}")
+    if max_age is not None:
+        try:
+            issued = datetime.strptime(info.get("client_date_time", ""), TOKEN_TIME_FORMAT)
+        except (TypeError, ValueError) as exc:
+            raise InvalidTokenError("ab_token has no valid client_date_time") from exc
+        age = ((now or datetime.now()) - issued).total_seconds()
+        if abs(age) > max_age:
+            raise InvalidTokenError(f"ab_token is {age:.0f}s old (max {max_age:.0f}s)")
+    return info
+
+
+def _decode_chunk(tokens: list[str], include_password: bool) -> list[dict[str, Any] | None]:
+    decoded: dict[str, dict[str, Any] | None] = {}
+    out = []
+    for token in tokens:
+        if token not in decoded:
+            try:
+                decoded[token] = decode_ab_token(token, include_password=include_password)
+            except InvalidTokenError:
+                decoded[token] = None
+        out.append(decoded[token])
+    return out
+
+
+def decode_ab_tokens(
+    tokens: Iterable[str],
+    *,
+    include_password: bool = False,
+    executor: Executor | str | None = None,
+    chunk_size: int = 1000,
+) -> list[dict[str, Any] | None]:
+    """Decode many ab_tokens, e.g. when replaying a request log.
+
+    Duplicate tokens within a chunk are decoded once. Pass
+    ``executor="process"`` to spread large logs over all cores.
+
+    Args:
+        tokens: Base64 ab_tokens.
+        include_password: Keep the ``password`` field.
+        executor: Where to run the decoding (see :mod:`alignbooks.executors`).
+        chunk_size: Tokens per worker task.
+
+    Returns:
+        Decoded fields per token, in input order; None for invalid tokens.
+    """
+    return map_chunked(
+        partial(_decode_chunk, include_password=include_password),
+        [t.decode("ascii") if isinstance(t, bytes) else t for t in tokens],
+        executor,
+        chunk_size,
+    )
@@ -0,0 +1,234 @@
+"""Write coalescing for bursts of small master updates.
+
+A pricing job that edits the same item several times within seconds pays a
+full ``SaveUpdate_*`` round trip for every edit. :class:`WriteBatcher` holds
+updates per (service, record id) for a short window, merges successive
+(partial) updates into one record and sends only the result, over a bounded
+pool. Every caller gets a future that resolves to the API response (with its
+``IDValue``) of the write that included its update.
+
+Updates to the same record are never sent concurrently: edits arriving while
+a write is in flight are batched into the next one.
+
+Example:
+    >>> with WriteBatcher(window=0.5) as batcher:
+    ...     batcher.update(ab.items, {"id": item_id, "sale_rate": 110})
+    ...     future = batcher.update(ab.items, {"id": item_id, "mrp": 150})
+    >>> future.result()["IDValue"]                 # one SaveUpdate_Item call
+"""
+
+from __future__ import annotations
+
+import copy
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Mapping
+
+from .exceptions import ValidationError
+
+if TYPE_CHECKING:
+    from .services.masters import MasterServiceBase
+
+logger = logging.getLogger("alignbooks")
+
+Key = tuple  # (id of the service object, record id)
+
+
+def merge_update(base: dict[str, Any], patch: Mapping[str, Any]) -> dict[str, Any]:
+    """Apply ``patch`` onto ``base`` in place; nested dicts merge, other values replace."""
+    for key, value in patch.items():
+        current = base.get(key)
+        if isinstance(value, Mapping) and isinstance(current, dict):
+            merge_update(current, value)
+        else:
+            base[key] = copy.deepcopy(value)
+    return base
+
+
+class _Pending:
+    __slots__ = ("service", "record", "futures", "due")
+
+    def __init__(self, service: MasterServiceBase, due: float):
+        self.service = service
+        self.record: dict[str, Any] = {}
+        self.futures: list[Future] = []
+        self.due = due
+
+
+class WriteBatcher:
+    """Coalesce master updates per record and flush them on a bounded pool.
+
+    Args:
+        window: Seconds an update waits for more edits of the same record.
+        max_workers: Maximum concurrent writes.
+        loader: Optional ``(service, record_id) -> dict`` returning the current
+            full record. Merged patches are applied on top of it before the
+            write, so callers can submit partial updates safely. Without a
+            loader, submit full records (later partial patches still merge).
+    """
+
+    def __init__(
+        self,
+        window: float = 0.5,
+        max_workers: int = 4,
+        loader: Callable[[MasterServiceBase, str], dict[str, Any]] | None = None,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.window = window
+        self.max_workers = max_workers
+        self.loader = loader
+
+        self._pending: dict[Key, _Pending] = {}
+        self._in_flight: set[Key] = set()
+        self._heap: list[tuple[float, Key]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="alignbooks-write")
+        self._closed = False
+        self._flush_all = False
+
+        self.submitted = 0
+        self.writes = 0
+        self.coalesced = 0
+        self.failures = 0
+
+        self._thread = threading.Thread(
+            target=self._run, name="alignbooks-write-batcher", daemon=True
+        )
+        self._thread.start()
+
+    # --- submitting ---
+
+    def update(self, service: MasterServiceBase, data: Mapping[str, Any]) -> Future:
+        """Queue an update of one master record.
+
+        Args:
+            service: Master service whose ``update`` sends the record
+                (e.g. ``ab.items``).
+            data: Full record or partial patch; must contain ``id``.
+
+        Returns:
+            Future resolving to the API response of the write that included
+            this update, or raising its error.
+        """
+        record_id = data.get("id")
+        if not record_id:
+            raise ValidationError("Batched updates need the record 'id'; send creates directly")
+        # Keyed by service object: ItemsService of two companies (EnterpriseClient)
+        # must never share a write.
+        key = (id(service), str(record_id))
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("WriteBatcher is closed")
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _Pending(service, time.monotonic() + self.window)
+                heapq.heappush(self._heap, (pending.due, key))
+                self._wakeup.notify()
+            merge_update(pending.record, data)
+            pending.futures.append(future)
+            self.submitted += 1
+        return future
+
+    # --- flushing ---
+
+    def _run(self) -> None:
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._heap and (self._flush_all or self._heap[0][0] <= now):
+                    due, key = heapq.heappop(self._heap)
+                    pending = self._pending.get(key)
+                    if pending is None or pending.due != due:
+                        continue
+                    if key in self._in_flight:
+                        continue  # re-queued by _write once the current write finishes
+                    del self._pending[key]
+                    self._in_flight.add(key)
+                    self._pool.submit(self._write, key, pending)
+                if self._closed and not self._pending and not self._in_flight:
+                    self._idle.notify_all()
+                    return
+                if not self._pending and not self._in_flight:
+                    self._flush_all = False
+                    self._idle.notify_all()
+                timeout = self._heap[0][0] - now if self._heap and not self._flush_all else None
+                self._wakeup.wait(timeout)
+
+    def _write(self, key: Key, pending: _Pending) -> None:
+        try:
+            record = pending.record
+            if self.loader is not None:
+                record = merge_update(copy.deepcopy(self.loader(pending.service, key[1])), record)
+            result = pending.service.update(record)
+        except Exception as exc:
+            logger.warning(
+                "Batched update of %s %s failed: %s", type(pending.service).__name__, key[1], exc
+            )
+            with self._lock:
+                self.failures += len(pending.futures)
+            for future in pending.futures:
+                future.set_exception(exc)
+        else:
+            with self._lock:
+                self.writes += 1
+                self.coalesced += len(pending.futures) - 1
+            for future in pending.futures:
+                future.set_result(result)
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+                waiting = self._pending.get(key)
+                if waiting is not None:
+                    heapq.heappush(self._heap, (waiting.due, key))
+                self._wakeup.notify()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Send all pending updates now and wait for them.
+
+        Returns:
+            True if everything was written (or failed) before ``timeout``.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._flush_all = True
+            self._wakeup.notify()
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        """Flush pending updates, wait for them and stop the batcher."""
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        self._thread.join()
+        self._pool.shutdown()
+
+    def stats(self) -> dict[str, int]:
+        """Submitted updates, writes sent, updates merged into another write,
+        failed updates and queued records."""
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "writes": self.writes,
+                "coalesced": self.coalesced,
+                "failures": self.failures,
+                "pending": len(self._pending) + len(self._in_flight),
+            }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
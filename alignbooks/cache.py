@@ -0,0 +1,245 @@
+"""Response cache for idempotent read endpoints.
+
+Setup-style endpoints (``Display_CompanySetup``, ``GetPrintFormatList``, ...)
+rarely change within a day but cost a full round trip and decode per call.
+:class:`ResponseCache` keeps decoded responses in a size-bounded in-memory LRU,
+optionally backed by an SQLite file so entries survive process restarts.
+
+Only endpoints with a TTL policy are cached; everything else passes through.
+
+Example:
+    >>> cache = ResponseCache(path="~/.cache/alignbooks.sqlite")
+    >>> ab = AlignBooks(..., cache=cache)
+    >>> ab.config.get_company_setup()          # network
+    >>> ab.config.get_company_setup()          # memory
+    >>> ab.api_call("Display_CompanySetup", use_cache=False)   # bypass + refresh
+    >>> ab.invalidate_cache("Display_CompanySetup")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+# Per-endpoint TTLs (seconds) for endpoints that are effectively static.
+DEFAULT_TTLS: dict[str, float] = {
+    "Display_CompanySetup": 24 * 3600,
+    "Display_DocumentNumberingSetup": 24 * 3600,
+    "GetPrintFormatList": 24 * 3600,
+    "GetLedgerInfo": 3600,
+    "GetPartyInfo": 3600,
+}
+
+
+def cache_key(
+    service: str,
+    endpoint: str,
+    body: dict[str, Any] | None,
+    company_id: str,
+    variant: str = "",
+) -> str:
+    """Stable key for one request: (service, endpoint, canonical body, company)."""
+    canonical = json.dumps(body or {}, sort_keys=True, separators=(",", ":"), default=str)
+    raw = "\x1f".join((service, endpoint, canonical, company_id, variant))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + optional SQLite) response cache with TTL policies.
+
+    Cached values are shared between callers; treat them as read-only.
+
+    Args:
+        ttls: Endpoint to TTL (seconds) policies; None disables caching of an
+            endpoint. Defaults to :data:`DEFAULT_TTLS`.
+        max_entries: Maximum entries in the memory tier (default 1024).
+        max_bytes: Approximate memory budget, measured as response text size
+            (default 32 MB).
+        path: Optional SQLite file for the on-disk tier.
+        registry_hints: Also cache endpoints without an explicit policy that the
+            endpoint registry marks cacheable, using its TTL hint. Explicit
+            ``ttls`` (including None opt-outs) always win.
+    """
+
+    def __init__(
+        self,
+        ttls: dict[str, float | None] | None = None,
+        max_entries: int = 1024,
+        max_bytes: int = 32 * 1024 * 1024,
+        path: str | None = None,
+        registry_hints: bool = False,
+    ):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.registry_hints = registry_hints
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # key -> (expires_at, endpoint, size, value)
+        self._memory: OrderedDict[str, tuple[float, str, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db: sqlite3.Connection | None = None
+        if path:
+            path = os.path.expanduser(path)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, endpoint TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_endpoint ON responses(endpoint)")
+
+    def ttl_for(self, endpoint: str) -> float | None:
+        """TTL policy for an endpoint, or None if it is not cacheable."""
+        if endpoint in self.ttls:
+            return self.ttls[endpoint]
+        if self.registry_hints:
+            from .registry import endpoint_info
+
+            info = endpoint_info(endpoint)
+            if info is not None and info.cacheable:
+                return info.ttl
+        return None
+
+    def set_ttl(self, endpoint: str, ttl: float | None) -> None:
+        """Add or change an endpoint's TTL policy; ``None`` disables caching of it."""
+        self.ttls[endpoint] = ttl
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Look up a live entry (memory first, then disk)."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[3]
+                self._drop(key)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT endpoint, expires_at, value FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    endpoint, expires_at, text = row
+                    if expires_at > now:
+                        value = json.loads(text)
+                        self._store(key, endpoint, expires_at, len(text), value)
+                        self.hits += 1
+                        return value
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+            self.misses += 1
+            return default
+
+    def set(
+        self,
+        key: str,
+        endpoint: str,
+        value: Any,
+        ttl: float,
+        size: int | None = None,
+        persist: bool = True,
+    ) -> None:
+        """Store a value for ``ttl`` seconds.
+
+        Args:
+            key: Key from :func:`cache_key`.
+            endpoint: Endpoint name (used for invalidation).
+            value: Decoded response.
+            ttl: Lifetime in seconds.
+            size: Size estimate in bytes (default: length of the JSON encoding).
+            persist: Also write to the disk tier (value must be JSON-serializable).
+        """
+        text = None
+        if size is None or (persist and self._db is not None):
+            text = json.dumps(value, separators=(",", ":"), default=str)
+            size = len(text) if size is None else size
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._store(key, endpoint, expires_at, size, value)
+            if persist and self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, endpoint, expires_at, value)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, endpoint, expires_at, text),
+                )
+
+    def invalidate(self, endpoint: str | None = None, key: str | None = None) -> int:
+        """Remove entries by key, by endpoint, or (no arguments) all of them.
+
+        Returns:
+            Number of memory entries removed.
+        """
+        with self._lock:
+            if key is not None:
+                targets = [key] if key in self._memory else []
+            elif endpoint is not None:
+                targets = [k for k, e in self._memory.items() if e[1] == endpoint]
+            else:
+                targets = list(self._memory)
+            for k in targets:
+                self._drop(k)
+
+            if self._db is not None:
+                if key is not None:
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                elif endpoint is not None:
+                    self._db.execute("DELETE FROM responses WHERE endpoint = ?", (endpoint,))
+                else:
+                    self._db.execute("DELETE FROM responses")
+            return len(targets)
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        self.invalidate()
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss/eviction counters and current memory usage."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._memory),
+                "bytes": self._bytes,
+            }
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _store(self, key: str, endpoint: str, expires_at: float, size: int, value: Any) -> None:
+        if key in self._memory:
+            self._drop(key)
+        if size > self.max_bytes:
+            return
+        self._memory[key] = (expires_at, endpoint, size, value)
+        self._bytes += size
+        while len(self._memory) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._memory))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
@@ -5,18 +5,40 @@ Provides a high-level interface for making authenticated API calls to AlignBooks
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import functools
 import json
 import logging
-from typing import Any
+import threading
+from typing import Any, Iterable
 
 import requests
+from urllib3.util.request import ACCEPT_ENCODING
 
+from ._json import EncodedBody, dumps, loads
 from .auth import make_ab_token
-from .constants import API_BASE, DEFAULT_MASTER_TYPE, SERVICE_MAP, Service
-from .exceptions import APIError, AuthenticationError, SessionExpiredError
+from .cache import ResponseCache, cache_key
+from .constants import (
+    API_BASE,
+    CONNECT_TIMEOUT,
+    DEFAULT_MASTER_TYPE,
+    HEAVY_READ_TIMEOUT,
+    READ_TIMEOUT,
+    Service,
+)
+from .deadline import Timeout, as_timeout, check, clip, remaining
+from .exceptions import APIError, AuthenticationError, DeadlineExceededError, SessionExpiredError
+from .records import Record, decode_records
+from .registry import get_registry
+from .tracing import Tracer, annotate, span
+from .transport import RequestsTransport, Transport, WireStats, wire_size
+from .warmup import DEFAULT_MASTERS, WarmupReport, warmup
 
 logger = logging.getLogger("alignbooks")
 
+_MISS = object()
+
 
 class AlignBooksClient:
     """Low-level HTTP client for AlignBooks API.
@@ -32,8 +54,22 @@ class AlignBooksClient:
         user_id: User ID (GUID).
         master_type: Master type code (default 2037).
         base_url: API base URL (default: https://service.alignbooks.com).
-        timeout: Request timeout in seconds (default 60).
+        timeout: Read timeout in seconds, or a ``(connect, read)`` pair
+            (default ``(10, 60)``). A scalar keeps the default connect timeout.
+        heavy_timeout: Read timeout (or pair) for endpoints the registry marks
+            heavy, such as reports, ``QueryExecute`` and ``GetDocumentPrint``
+            (default 300).
+        endpoint_timeouts: Per-endpoint overrides, e.g. ``{"ShortList": 15}``.
         auto_login: Automatically login on first API call (default True).
+        session: Optional shared ``requests.Session``. When provided, the client
+            reuses its connection pool and leaves closing it to the caller.
+        cache: Optional :class:`~alignbooks.cache.ResponseCache` for idempotent
+            read endpoints with a TTL policy.
+        transport: Optional :class:`~alignbooks.transport.Transport` that sends
+            requests (default: :class:`~alignbooks.transport.RequestsTransport`
+            over ``session``). Use a recording/replay transport for offline runs.
+        tracer: Optional :class:`~alignbooks.tracing.Tracer` recording a span
+            timeline of every call.
 
     Example:
         >>> client = AlignBooksClient(
@@ -58,8 +94,14 @@ class AlignBooksClient:
         user_id: str,
         master_type: int = DEFAULT_MASTER_TYPE,
         base_url: str = API_BASE,
-        timeout: int = 60,
+        timeout: float | Timeout = (CONNECT_TIMEOUT, READ_TIMEOUT),
         auto_login: bool = True,
+        session: requests.Session | None = None,
+        cache: ResponseCache | None = None,
+        transport: Transport | None = None,
+        tracer: Tracer | None = None,
+        heavy_timeout: float | Timeout = HEAVY_READ_TIMEOUT,
+        endpoint_timeouts: dict[str, float | Timeout] | None = None,
     ):
         self.email = email
         self.password = password
@@ -69,11 +111,22 @@ class AlignBooksClient:
         self.user_id = user_id
         self.master_type = master_type
         self.base_url = base_url.rstrip("/")
-        self.timeout = timeout
+        self.timeout = as_timeout(timeout, CONNECT_TIMEOUT)
+        self.heavy_timeout = as_timeout(heavy_timeout, self.timeout[0])
+        self.endpoint_timeouts = {
+            name: as_timeout(value, self.timeout[0])
+            for name, value in (endpoint_timeouts or {}).items()
+        }
         self.auto_login = auto_login
 
-        self._session = requests.Session()
+        self._owns_session = session is None
+        self._session = session if session is not None else requests.Session()
+        self.transport = transport if transport is not None else RequestsTransport(self._session)
         self._logged_in = False
+        self._login_lock = threading.Lock()
+        self.cache = cache
+        self.wire_stats = WireStats()
+        self.tracer = tracer
 
     def _make_token(self, apiname: str) -> str:
         """Generate ab_token for the given endpoint."""
@@ -90,7 +143,50 @@ class AlignBooksClient:
 
     def _get_service(self, endpoint: str) -> str:
         """Resolve the service URL suffix for an endpoint."""
-        return SERVICE_MAP.get(endpoint, Service.DATA)
+        return get_registry().service_for(endpoint)
+
+    def timeout_for(self, endpoint: str) -> Timeout:
+        """(connect, read) timeout for an endpoint, before deadline clipping."""
+        timeout = self.endpoint_timeouts.get(endpoint)
+        if timeout is None:
+            info = get_registry().get(endpoint)
+            timeout = self.heavy_timeout if info is not None and info.heavy else self.timeout
+        return timeout
+
+    def _post(self, endpoint: str, url: str, data: bytes, timeout: float | Timeout | None):
+        """Send one request with a deadline-clipped timeout."""
+        check(endpoint)
+        base = self.timeout_for(endpoint) if timeout is None else as_timeout(timeout, self.timeout[0])
+        try:
+            resp = self.transport.post(
+                url, headers=self._headers(endpoint), data=data, timeout=clip(base, endpoint)
+            )
+        except requests.Timeout as exc:
+            left = remaining()
+            if left is not None and left <= 0:
+                raise DeadlineExceededError(f"Deadline exceeded during {endpoint}") from exc
+            raise
+        resp.raise_for_status()
+        return resp
+
+    @staticmethod
+    def prepare(body: dict[str, Any] | None) -> EncodedBody:
+        """Serialize a request body once for repeated :meth:`api_call` use.
+
+        Example:
+            >>> poll = client.prepare({"warehouse_id": wh, "voucher_type": 4})
+            >>> rows = client.api_call("GetItemBalanceForList", poll)
+        """
+        return EncodedBody(body)
+
+    def _headers(self, endpoint: str) -> dict[str, str]:
+        with span("token"):
+            token = self._make_token(endpoint)
+        return {
+            "Content-Type": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "ab_token": token,
+        }
 
     def login(self) -> dict[str, Any]:
         """Establish a server-side session.
@@ -116,9 +212,12 @@ class AlignBooksClient:
     def api_call(
         self,
         endpoint: str,
-        body: dict[str, Any] | None = None,
+        body: dict[str, Any] | EncodedBody | None = None,
         service: str | None = None,
         *,
+        records: type[Record] | None = None,
+        use_cache: bool = True,
+        timeout: float | Timeout | None = None,
         _skip_auto_login: bool = False,
         _retry_on_session: bool = True,
     ) -> Any:
@@ -126,8 +225,16 @@ class AlignBooksClient:
 
         Args:
             endpoint: API endpoint name (e.g. 'ShortList', 'SaveUpdate_Invoice').
-            body: Request body dictionary.
+            body: Request body dictionary, or an :class:`EncodedBody` from
+                :meth:`prepare` to skip re-serialization.
             service: Override service URL suffix (auto-detected if not provided).
+            records: Optional :class:`~alignbooks.records.Record` subclass. When set,
+                JsonDataTable objects are decoded straight into slot records.
+            use_cache: Set False to bypass the response cache lookup. The fresh
+                response still replaces the cached entry.
+            timeout: Read timeout or ``(connect, read)`` pair for this call
+                (default: :meth:`timeout_for` the endpoint). Always clipped to
+                the current :func:`~alignbooks.deadline.deadline`.
             _skip_auto_login: Internal flag to prevent login recursion.
             _retry_on_session: Retry with fresh login on session errors.
 
@@ -139,27 +246,63 @@ class AlignBooksClient:
             APIError: If the API returns a non-zero ReturnCode.
             AuthenticationError: If authentication fails.
             SessionExpiredError: If session expired and retry fails.
+            DeadlineExceededError: If the current deadline passed before or
+                during the call.
         """
+        kwargs = dict(
+            records=records, use_cache=use_cache, timeout=timeout,
+            _skip_auto_login=_skip_auto_login, _retry_on_session=_retry_on_session,
+        )
+        if self.tracer is None:
+            return self._api_call(endpoint, body, service, **kwargs)
+        with self.tracer.span("api_call", endpoint=endpoint):
+            return self._api_call(endpoint, body, service, **kwargs)
+
+    def _api_call(
+        self,
+        endpoint: str,
+        body: dict[str, Any] | EncodedBody | None,
+        service: str | None,
+        *,
+        records: type[Record] | None,
+        use_cache: bool,
+        timeout: float | Timeout | None,
+        _skip_auto_login: bool,
+        _retry_on_session: bool,
+    ) -> Any:
         if self.auto_login and not self._logged_in and not _skip_auto_login:
-            self.login()
+            with self._login_lock:
+                if not self._logged_in:
+                    self.login()
 
         if service is None:
             service = self._get_service(endpoint)
 
-        url = f"{self.base_url}/{service}/{endpoint}"
-        headers = {
-            "Content-Type": "application/json",
-            "ab_token": self._make_token(endpoint),
-        }
+        ttl = self.cache.ttl_for(endpoint) if self.cache is not None else None
+        if ttl:
+            key = cache_key(
+                service, endpoint, body.body if isinstance(body, EncodedBody) else body,
+                self.company_id,
+                records.__name__ if records is not None else "",
+            )
+            if use_cache:
+                cached = self.cache.get(key, _MISS)
+                if cached is not _MISS:
+                    logger.debug("Cache hit %s", endpoint)
+                    annotate(cache="hit")
+                    return cached
+
+        if not isinstance(body, EncodedBody):
+            body = EncodedBody(body)
 
+        url = f"{self.base_url}/{service}/{endpoint}"
         logger.debug("POST %s", url)
-        resp = self._session.post(
-            url, headers=headers, json=body or {}, timeout=self.timeout
-        )
-        resp.raise_for_status()
+        resp = self._post(endpoint, url, body.data, timeout)
 
         text = resp.text.lstrip("\ufeff")  # Strip BOM
-        data = json.loads(text)
+        self.wire_stats.add(len(body.data), wire_size(resp), len(resp.content))
+        with span("parse.envelope", bytes=len(text)):
+            data = loads(text)
 
         rc = data.get("ReturnCode", -1)
 
@@ -171,8 +314,8 @@ class AlignBooksClient:
                 self._logged_in = False
                 self.login()
                 return self.api_call(
-                    endpoint, body, service,
-                    _skip_auto_login=False, _retry_on_session=False,
+                    endpoint, body, service, records=records, use_cache=use_cache,
+                    timeout=timeout, _skip_auto_login=False, _retry_on_session=False,
                 )
 
         if rc != 0:
@@ -182,16 +325,64 @@ class AlignBooksClient:
                 endpoint=endpoint,
             )
 
-        # Parse JsonDataTable if present
+        with span("parse.table"):
+            result = self._decode_result(data, records)
+        if ttl and result is not None:
+            self.cache.set(key, endpoint, result, ttl, size=len(text), persist=records is None)
+        return result
+
+    @staticmethod
+    def _decode_result(data: dict[str, Any], records: type[Record] | None) -> Any:
+        """Parse JsonDataTable if present, else return the full response dict."""
         jdt = data.get("JsonDataTable")
         if jdt:
             try:
-                return json.loads(jdt)
+                if records is not None:
+                    return decode_records(jdt, records)
+                return loads(jdt)
             except (json.JSONDecodeError, TypeError):
                 return jdt
 
         return data
 
+    def invalidate_cache(self, endpoint: str | None = None) -> int:
+        """Drop cached responses for one endpoint, or all of them.
+
+        Returns:
+            Number of in-memory entries removed (0 when no cache is configured).
+        """
+        if self.cache is None:
+            return 0
+        return self.cache.invalidate(endpoint)
+
+    def warmup(
+        self,
+        masters: Iterable[int] = DEFAULT_MASTERS,
+        *,
+        setup: bool = True,
+        extra: Iterable[tuple[str, dict[str, Any] | None]] = (),
+        max_workers: int = 8,
+        refresh: bool = False,
+    ) -> WarmupReport:
+        """Log in and pre-load master lists and setup concurrently.
+
+        See :func:`alignbooks.warmup.warmup` for the arguments.
+
+        Returns:
+            A :class:`~alignbooks.warmup.WarmupReport` with per-step timings.
+        """
+        kwargs = dict(setup=setup, extra=extra, max_workers=max_workers, refresh=refresh)
+        if self.tracer is None:
+            return warmup(self, masters, **kwargs)
+        with self.tracer.span("warmup"):
+            return warmup(self, masters, **kwargs)
+
+    async def awarmup(self, *args: Any, **kwargs: Any) -> WarmupReport:
+        """:meth:`warmup` on the event loop's default executor, for async start-up hooks."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, self.warmup, *args, **kwargs)
+        return await loop.run_in_executor(None, call)
+
     def get_pdf(
         self,
         voucher_id: str,
@@ -218,15 +409,11 @@ class AlignBooksClient:
             body["format_id"] = format_id
 
         url = f"{self.base_url}/{Service.UTILITY}/GetDocumentPrint"
-        headers = {
-            "Content-Type": "application/json",
-            "ab_token": self._make_token("GetDocumentPrint"),
-        }
-
-        resp = self._session.post(url, headers=headers, json=body, timeout=self.timeout)
-        resp.raise_for_status()
+        data_bytes = dumps(body)
+        resp = self._post("GetDocumentPrint", url, data_bytes, None)
 
-        data = json.loads(resp.text.lstrip("\ufeff"))
+        self.wire_stats.add(len(data_bytes), wire_size(resp), len(resp.content))
+        data = loads(resp.text.lstrip("\ufeff"))
         if data["ReturnCode"] != 0:
             raise APIError(data.get("Message", ""), data["ReturnCode"], "GetDocumentPrint")
 
@@ -235,8 +422,9 @@ class AlignBooksClient:
         return pdf_bytes, filename
 
     def close(self) -> None:
-        """Close the HTTP session."""
-        self._session.close()
+        """Close the HTTP session (unless it is shared with other clients)."""
+        if self._owns_session:
+            self._session.close()
 
     def __enter__(self):
         return self
@@ -0,0 +1,312 @@
+"""Memory-mapped columnar store for very large query results.
+
+Millions of ``et_stock`` rows do not fit comfortably in a worker as Python
+dicts. :class:`ColumnStoreWriter` spills rows page by page into a directory of
+flat column files; :class:`ColumnStore` reopens it with ``numpy.memmap``, so
+columns are zero-copy views of the page cache and several worker processes can
+share one dataset read-only::
+
+    <path>/meta.json              row count, schema, key
+    <path>/<column>.col           one fixed-width array per column
+    <path>/strings.bin            UTF-8 string dictionary shared by all
+    <path>/strings.off            string columns (column files hold codes)
+    <path>/index.keys, index.rows sorted primary keys and their row numbers
+
+Inferred number columns are ``float64`` (see
+:func:`~alignbooks.export.infer_schema`), so later pages cannot be truncated;
+declared ``int64`` columns reject fractional values. Nulls are NaN for floats,
+``NULL_INT`` for integers, -1 for booleans and string codes. A dataset is written to a temporary directory and renamed into place
+when complete, so readers never see a partial one.
+
+Requires ``numpy`` (``pip install alignbooks-sdk[numpy]``).
+
+Example:
+    >>> store = ab.query.spill(Select("et_stock"), "cache/et_stock", key="id")
+    >>> qty = store.column("qty")               # numpy memmap, no copy
+    >>> store.get(row_id)["warehouse_id"]
+    >>> ColumnStore("cache/et_stock")           # in another process
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+
+from .exceptions import NotFoundError, ValidationError
+from .export import Schema, _to_int, infer_schema
+
+FORMAT_VERSION = 1
+NULL_INT = -(2 ** 63)
+
+_DTYPES = {"float64": "<f8", "int64": "<i8", "bool": "i1", "string": "<i4"}
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError(
+            "The column store requires numpy: pip install alignbooks-sdk[numpy]"
+        ) from exc
+    return numpy
+
+
+def _encode(value: Any, kind: str, strings: dict[str, int]) -> Any:
+    if value is None or (value == "" and kind != "string"):
+        return {"float64": float("nan"), "int64": NULL_INT, "bool": -1, "string": -1}[kind]
+    try:
+        if kind == "float64":
+            return float(value)
+        if kind == "int64":
+            return _to_int(value)
+        if kind == "bool":
+            return 1 if value else 0
+    except (TypeError, ValueError):
+        return {"float64": float("nan"), "int64": NULL_INT}[kind]
+    text = value if isinstance(value, str) else str(value)
+    code = strings.get(text)
+    if code is None:
+        code = strings[text] = len(strings)
+    return code
+
+
+class ColumnStoreWriter:
+    """Stream rows into a column store directory.
+
+    Args:
+        path: Dataset directory (replaced atomically on :meth:`close`).
+        schema: Columns as ``(name, kind)`` pairs (kinds as in
+            :mod:`alignbooks.export`). None infers them from the first batch.
+        key: Primary-key column to index (None for no index).
+    """
+
+    def __init__(self, path: str, schema: Schema | None = None, key: str | None = "id"):
+        self._np = _numpy()
+        self.path = path
+        self.schema = list(schema) if schema is not None else None
+        self.key = key
+        self.rows = 0
+        self._tmp = f"{path}.tmp-{os.getpid()}"
+        shutil.rmtree(self._tmp, ignore_errors=True)
+        os.makedirs(self._tmp)
+        self._files: dict[str, Any] = {}
+        self._strings: dict[str, int] = {}
+        self._store: ColumnStore | None = None
+
+    def _open_columns(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        if self.schema is None:
+            self.schema = infer_schema(rows)
+        names = {name for name, _ in self.schema}
+        if self.key is not None and self.key not in names:
+            raise ValidationError(f"Key column {self.key!r} is not in the schema")
+        for name, kind in self.schema:
+            if kind not in _DTYPES:
+                raise ValidationError(f"Unsupported column kind {kind!r} for {name!r}")
+            self._files[name] = open(os.path.join(self._tmp, f"{name}.col"), "wb")
+
+    def write(self, rows: Sequence[Mapping[str, Any]]) -> int:
+        """Append one batch of rows (e.g. a QueryExecute page)."""
+        if not rows:
+            return 0
+        if not self._files:
+            self._open_columns(rows)
+        np = self._np
+        for name, kind in self.schema:
+            values = [_encode(row.get(name), kind, self._strings) for row in rows]
+            self._files[name].write(np.asarray(values, dtype=_DTYPES[kind]).tobytes())
+        self.rows += len(rows)
+        return len(rows)
+
+    def close(self) -> ColumnStore:
+        """Finish the files, build the key index and publish the dataset."""
+        if self._store is not None:
+            return self._store
+        try:
+            self._store = self._publish()
+        except BaseException:
+            self._discard()
+            raise
+        return self._store
+
+    def _publish(self) -> ColumnStore:
+        np = self._np
+        if not self._files:
+            if self.schema is None:
+                # Nothing written and nothing declared: an empty dataset without index.
+                self.schema, self.key = [], None
+            self._open_columns([])
+        for fh in self._files.values():
+            fh.close()
+
+        blobs = [s.encode("utf-8") for s in self._strings]
+        offsets = np.zeros(len(blobs) + 1, dtype="<i8")
+        np.cumsum([len(b) for b in blobs], out=offsets[1:])
+        with open(os.path.join(self._tmp, "strings.bin"), "wb") as fh:
+            fh.write(b"".join(blobs))
+        offsets.tofile(os.path.join(self._tmp, "strings.off"))
+
+        index = None
+        if self.key is not None and self.rows:
+            kind = dict(self.schema)[self.key]
+            column = np.fromfile(os.path.join(self._tmp, f"{self.key}.col"), dtype=_DTYPES[kind])
+            if kind == "string":
+                keys = np.array(
+                    [blobs[c] if c >= 0 else b"" for c in column.tolist()], dtype=bytes
+                )
+            else:
+                keys = column
+            order = np.argsort(keys, kind="stable")
+            keys[order].tofile(os.path.join(self._tmp, "index.keys"))
+            order.astype("<i8").tofile(os.path.join(self._tmp, "index.rows"))
+            index = keys.dtype.str
+
+        meta = {
+            "version": FORMAT_VERSION,
+            "rows": self.rows,
+            "columns": [{"name": n, "kind": k, "dtype": _DTYPES[k]} for n, k in self.schema],
+            "strings": len(blobs),
+            "key": self.key if index else None,
+            "index_dtype": index,
+        }
+        with open(os.path.join(self._tmp, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(self._tmp, self.path)
+        return ColumnStore(self.path)
+
+    def _discard(self) -> None:
+        for fh in self._files.values():
+            fh.close()
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+
+class ColumnStore:
+    """Read-only, memory-mapped view of a column store directory.
+
+    Args:
+        path: Directory written by :class:`ColumnStoreWriter`.
+    """
+
+    def __init__(self, path: str):
+        self._np = _numpy()
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValidationError(f"Unsupported column store version: {meta.get('version')}")
+        self._meta = meta
+        self.key: str | None = meta["key"]
+        self.kinds: dict[str, str] = {c["name"]: c["kind"] for c in meta["columns"]}
+        self._rows = meta["rows"]
+        self._columns: dict[str, Any] = {}
+        self._blob = self._map("strings.bin", "u1")
+        self._offsets = self._map("strings.off", "<i8")
+        self._index_keys = self._index_rows = None
+        if self.key is not None:
+            self._index_keys = self._map("index.keys", meta["index_dtype"])
+            self._index_rows = self._map("index.rows", "<i8")
+        self._decoded: list[str | None] = [None] * meta["strings"]
+
+    def _map(self, name: str, dtype: str):
+        np = self._np
+        path = os.path.join(self.path, name)
+        if os.path.getsize(path) == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r")
+
+    @property
+    def columns(self) -> list[str]:
+        """Column names in schema order."""
+        return list(self.kinds)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def column(self, name: str):
+        """Zero-copy array of a column (string columns hold dictionary codes)."""
+        array = self._columns.get(name)
+        if array is None:
+            if name not in self.kinds:
+                raise KeyError(name)
+            array = self._columns[name] = self._map(f"{name}.col", _DTYPES[self.kinds[name]])
+        return array
+
+    def string(self, code: int) -> str | None:
+        """Decode one string dictionary code (-1 is null)."""
+        if code < 0:
+            return None
+        text = self._decoded[code]
+        if text is None:
+            start, end = int(self._offsets[code]), int(self._offsets[code + 1])
+            text = self._decoded[code] = bytes(self._blob[start:end]).decode("utf-8")
+        return text
+
+    def values(self, name: str, rows: Any = slice(None)) -> list[Any]:
+        """Column values as Python objects (decoded strings, None for nulls)."""
+        kind = self.kinds[name]
+        data = self.column(name)[rows]
+        if kind == "string":
+            return [self.string(c) for c in data.tolist()]
+        if kind == "float64":
+            return [None if v != v else v for v in data.tolist()]
+        if kind == "int64":
+            return [None if v == NULL_INT else v for v in data.tolist()]
+        return [None if v < 0 else bool(v) for v in data.tolist()]
+
+    def row(self, position: int) -> dict[str, Any]:
+        """One row as a dict."""
+        if not 0 <= position < self._rows:
+            raise IndexError(position)
+        return {name: self.values(name, [position])[0] for name in self.kinds}
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for position in range(self._rows):
+            yield self.row(position)
+
+    def locate(self, keys: Iterable[Any]):
+        """Row positions of primary keys (-1 where a key is missing), vectorized."""
+        if self.key is None:
+            raise ValidationError("This column store has no key index")
+        np = self._np
+        index = self._index_keys
+        wanted = np.asarray(
+            [k.encode("utf-8") if isinstance(k, str) else k for k in keys], dtype=index.dtype
+        )
+        pos = np.searchsorted(index, wanted)
+        clipped = np.minimum(pos, max(len(index) - 1, 0))
+        found = (pos < len(index)) & (index[clipped] == wanted) if len(index) else pos < 0
+        return np.where(found, self._index_rows[clipped] if len(index) else -1, -1)
+
+    def get(self, key: Any) -> dict[str, Any]:
+        """Row by primary key.
+
+        Raises:
+            NotFoundError: If the key is not in the store.
+        """
+        position = int(self.locate([key])[0])
+        if position < 0:
+            raise NotFoundError(f"Key {key!r} not in column store {self.path}")
+        return self.row(position)
+
+    def close(self) -> None:
+        """Drop the memory maps."""
+        self._columns.clear()
+        self._blob = self._offsets = self._index_keys = self._index_rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -24,6 +24,12 @@ PBKDF2_KEY_LENGTH = 32
 # Default master_type for auth
 DEFAULT_MASTER_TYPE = 2037
 
+# Request timeouts (seconds): connect, read, and read for heavy endpoints
+# (reports, QueryExecute, List_Document, GetDocumentPrint; see registry.py)
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 60
+HEAVY_READ_TIMEOUT = 300
+
 
 class Service:
     """Service URL suffixes (append to https://service.alignbooks.com/)"""
@@ -35,6 +41,17 @@ class Service:
     ENTERPRISE    = "ABEnterpriseService.svc"     # 23 endpoints (multi-company)
 
 
+class MasterType:
+    """
+    AlignBooks master types.
+    Pass as master_type in ShortList and the master List_*/Display_* calls.
+    """
+    CUSTOMER               = 1
+    VENDOR                 = 2
+    ITEM                   = 3
+    LEDGER                 = 4
+
+
 class VType:
     """
     AlignBooks Voucher Types (Et_* enum from ABMenuMaster).
@@ -77,6 +94,12 @@ class VType:
     CREDIT_NOTE            = 14   # Et_CreditNote
     DEBIT_NOTE             = 15   # Et_DebitNote
 
+    # ── Aliases used by the service modules ───────────────────
+    SALES_ESTIMATE         = ESTIMATE
+    RECEIPT_VOUCHER        = SALES_CHALLAN
+    PAYMENT_VOUCHER        = PURCHASE_CHALLAN
+    JOURNAL_VOUCHER        = JOURNAL
+
 
 # Company credentials removed — use environment variables or .env file
 SERVICE_MAP: dict[str, str] = {
@@ -0,0 +1,82 @@
+"""Overall deadlines for API calls, retries and bulk operations.
+
+A per-request timeout bounds a single HTTP exchange. A deadline bounds
+everything done inside a ``with`` block: relogins, session retries, and work
+fanned out by the SDK's thread pools (the deadline lives in a context variable
+that :func:`~alignbooks._concurrency.run_parallel` carries onto its workers).
+Each request's (connect, read) timeout is clipped to the remaining budget, and
+calls made after it runs out fail fast with
+:class:`~alignbooks.exceptions.DeadlineExceededError`.
+
+Example:
+    >>> with deadline(30):
+    ...     ab.items.bulk_upsert(feed)         # whole sync bounded to ~30 s
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, Tuple, Union
+
+from .exceptions import DeadlineExceededError
+
+Timeout = Tuple[float, float]  # (connect, read) seconds
+
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "alignbooks_deadline", default=None
+)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """Bound all calls in the block to ``seconds`` from now.
+
+    Nested deadlines can only shorten the budget, never extend it.
+
+    Yields:
+        The absolute deadline (``time.monotonic()`` clock).
+    """
+    at = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        at = min(at, outer)
+    token = _deadline.set(at)
+    try:
+        yield at
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline, or None without one."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def check(endpoint: str = "") -> None:
+    """Raise :class:`DeadlineExceededError` if the current deadline has passed."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError(
+            f"Deadline exceeded{f' before {endpoint}' if endpoint else ''} "
+            f"({-left:.2f}s over budget)"
+        )
+
+
+def as_timeout(value: Union[float, Timeout], connect: float) -> Timeout:
+    """Normalize a scalar read timeout or a (connect, read) pair."""
+    if isinstance(value, (tuple, list)):
+        return float(value[0]), float(value[1])
+    return min(connect, float(value)), float(value)
+
+
+def clip(timeout: Timeout, endpoint: str = "") -> Timeout:
+    """Shrink a (connect, read) timeout to the time left before the deadline."""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        check(endpoint)
+    return min(timeout[0], left), min(timeout[1], left)
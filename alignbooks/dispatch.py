@@ -0,0 +1,346 @@
+"""Persistent, concurrent WhatsApp dispatch through ``SendWhatsAppMessage``.
+
+Each ``SendWhatsAppMessage`` call blocks on a slow proxy, and invoice messages
+also need a ``GetDocumentPrint`` PDF first. :class:`WhatsAppDispatcher` stores
+outgoing messages in a local SQLite queue and sends them in parallel:
+
+* messages to different recipients go out concurrently, while messages to the
+  same recipient keep their enqueue order;
+* duplicates (same recipient, text and document) are dropped on enqueue;
+* failures are retried with exponential backoff, up to ``max_attempts``;
+* PDFs are rendered by a separate pool a few messages ahead of sending, so
+  generation overlaps with the sends while memory stays bounded;
+* queue state survives restarts. A message interrupted mid-send is retried,
+  so delivery is at-least-once.
+
+Example:
+    >>> dispatcher = ab.notifications.dispatcher("whatsapp.db")
+    >>> for inv in invoices:
+    ...     dispatcher.enqueue(inv["phone"], f"Invoice {inv['vno']}",
+    ...                        doc_id=inv["id"], vtype=VType.SALES_INVOICE)
+    >>> dispatcher.run()
+    DispatchReport(sent=2000, failed=0, retried=7, ...)
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
+
+from ._concurrency import run_parallel
+
+if TYPE_CHECKING:
+    from .client import AlignBooksClient
+
+logger = logging.getLogger("alignbooks")
+
+PENDING, SENDING, SENT, FAILED = "pending", "sending", "sent", "failed"
+
+
+def default_attachment(pdf_bytes: bytes, filename: str) -> dict[str, Any]:
+    """Attachment entry for ``SendWhatsAppMessage`` (base64-encoded file)."""
+    return {"file_name": filename, "file_content": base64.b64encode(pdf_bytes).decode("ascii")}
+
+
+class DispatchReport:
+    """Outcome of one :meth:`WhatsAppDispatcher.run`.
+
+    Attributes:
+        sent: Messages delivered in this run.
+        failed: Messages that exhausted their attempts in this run.
+        retried: Failed attempts that were rescheduled.
+        pending: Messages still queued when the run returned.
+        elapsed: Wall time in seconds.
+    """
+
+    __slots__ = ("sent", "failed", "retried", "pending", "elapsed")
+
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.pending = 0
+        self.elapsed = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"DispatchReport(sent={self.sent}, failed={self.failed}, retried={self.retried}, "
+            f"pending={self.pending}, elapsed={self.elapsed:.1f}s)"
+        )
+
+
+class WhatsAppDispatcher:
+    """SQLite-backed WhatsApp queue with per-recipient ordering.
+
+    Args:
+        client: The AlignBooks client.
+        path: SQLite file holding the queue (``":memory:"`` for a throwaway queue).
+        max_workers: Recipients served concurrently.
+        pdf_workers: Concurrent ``GetDocumentPrint`` calls.
+        pdf_lookahead: PDFs rendered ahead per recipient lane, including the
+            one being sent. At most ``max_workers * pdf_lookahead`` rendered
+            PDFs are held at a time.
+        max_attempts: Attempts per message before it is marked failed.
+        backoff: Base of the exponential retry delay in seconds.
+        max_backoff: Upper bound of the retry delay in seconds.
+        attachment: Builds one ``attachments`` entry from ``(pdf_bytes, filename)``.
+    """
+
+    def __init__(
+        self,
+        client: AlignBooksClient,
+        path: str = "whatsapp_queue.db",
+        max_workers: int = 8,
+        pdf_workers: int = 4,
+        pdf_lookahead: int = 2,
+        max_attempts: int = 5,
+        backoff: float = 2.0,
+        max_backoff: float = 300.0,
+        attachment: Callable[[bytes, str], dict[str, Any]] = default_attachment,
+    ):
+        self._client = client
+        self.max_workers = max_workers
+        self.pdf_workers = pdf_workers
+        self.pdf_lookahead = max(1, pdf_lookahead)
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.attachment = attachment
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " dedupe_key TEXT UNIQUE NOT NULL,"
+            " recipient TEXT NOT NULL,"
+            " message TEXT NOT NULL,"
+            " doc_id TEXT, vtype INTEGER, format_id TEXT,"
+            " status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_attempt REAL NOT NULL DEFAULT 0, last_error TEXT,"
+            " created REAL NOT NULL, sent_at REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS messages_status ON messages(status)")
+        # Sends interrupted by a crash are retried (at-least-once delivery).
+        self._db.execute("UPDATE messages SET status = ? WHERE status = ?", (PENDING, SENDING))
+
+    # --- queueing ---
+
+    def enqueue(
+        self,
+        phone: str,
+        message: str,
+        *,
+        doc_id: str | None = None,
+        vtype: int | None = None,
+        format_id: str = "",
+        dedupe_key: str | None = None,
+    ) -> bool:
+        """Queue a message, optionally with a document PDF attached.
+
+        Args:
+            phone: Recipient number without ``+`` (e.g. ``919XXXXXXXXX``).
+            message: Message text.
+            doc_id: Document to render and attach via ``GetDocumentPrint``.
+            vtype: Document type of ``doc_id``.
+            format_id: Print format (default format if empty).
+            dedupe_key: Explicit idempotency key (default: hash of the content).
+
+        Returns:
+            False if an identical message was already queued or sent.
+        """
+        phone = phone.strip().lstrip("+")
+        if dedupe_key is None:
+            raw = f"{phone}\x1f{message}\x1f{doc_id or ''}\x1f{vtype or ''}\x1f{format_id}"
+            dedupe_key = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT OR IGNORE INTO messages"
+                " (dedupe_key, recipient, message, doc_id, vtype, format_id, status, created)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (dedupe_key, phone, message, doc_id, vtype, format_id, PENDING, time.time()),
+            )
+        return cur.rowcount == 1
+
+    def counts(self) -> dict[str, int]:
+        """Number of messages per status."""
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM messages GROUP BY status")
+            return dict(rows.fetchall())
+
+    def failed(self) -> list[dict[str, Any]]:
+        """Messages that exhausted their attempts, with their last error."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, recipient, message, doc_id, attempts, last_error"
+                " FROM messages WHERE status = ? ORDER BY id",
+                (FAILED,),
+            ).fetchall()
+        keys = ("id", "recipient", "message", "doc_id", "attempts", "last_error")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def retry_failed(self) -> int:
+        """Re-queue every failed message with a fresh attempt budget."""
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE messages SET status = ?, attempts = 0, next_attempt = 0 WHERE status = ?",
+                (PENDING, FAILED),
+            )
+        return cur.rowcount
+
+    # --- sending ---
+
+    def send(self, phone: str, message: str, attachments: list[dict[str, Any]] | None = None) -> Any:
+        """Send one message immediately (no queueing)."""
+        return self._client.api_call("SendWhatsAppMessage", {
+            "phone_nos": phone,
+            "message": message,
+            "attachments": attachments or [],
+        })
+
+    def run(self, wait_for_retries: bool = True) -> DispatchReport:
+        """Send everything that is due.
+
+        Args:
+            wait_for_retries: Keep going until no message is pending, sleeping
+                until the next scheduled retry. If False, return after one pass.
+
+        Returns:
+            A :class:`DispatchReport`.
+        """
+        started = time.perf_counter()
+        report = DispatchReport()
+        report_lock = threading.Lock()
+
+        with ThreadPoolExecutor(self.pdf_workers, thread_name_prefix="alignbooks-pdf") as pdfs:
+            while True:
+                lanes = self._due_lanes()
+                if lanes:
+                    run_parallel(
+                        lambda lane: self._send_lane(lane, pdfs, report, report_lock),
+                        list(lanes.values()),
+                        self.max_workers,
+                    )
+                    continue
+                next_due = self._next_due()
+                if next_due is None or not wait_for_retries:
+                    break
+                time.sleep(max(0.0, next_due - time.time()))
+
+        report.pending = self.counts().get(PENDING, 0)
+        report.elapsed = time.perf_counter() - started
+        logger.info("WhatsApp dispatch: %r", report)
+        return report
+
+    def _due_lanes(self) -> dict[str, list[tuple]]:
+        # A recipient's lane starts at its oldest pending message; it is only due
+        # when that message is, so later messages never overtake a retry.
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, recipient, message, doc_id, vtype, format_id, next_attempt"
+                " FROM messages WHERE status = ? ORDER BY id",
+                (PENDING,),
+            ).fetchall()
+        now = time.time()
+        lanes: dict[str, list[tuple]] = {}
+        blocked: set[str] = set()
+        for row in rows:
+            recipient = row[1]
+            if recipient in blocked:
+                continue
+            if recipient not in lanes and row[6] > now:
+                blocked.add(recipient)
+                continue
+            lanes.setdefault(recipient, []).append(row)
+        return lanes
+
+    def _next_due(self) -> float | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MIN(next_attempt) FROM messages WHERE status = ?", (PENDING,)
+            ).fetchone()
+        return row[0]
+
+    def _send_lane(
+        self,
+        lane: list[tuple],
+        pdfs: ThreadPoolExecutor,
+        report: DispatchReport,
+        report_lock: threading.Lock,
+    ) -> None:
+        docs = iter([row for row in lane if row[3]])
+        ahead: dict[int, Future] = {}  # rendered or rendering PDFs, at most pdf_lookahead
+
+        def prefetch() -> None:
+            while len(ahead) < self.pdf_lookahead:
+                row = next(docs, None)
+                if row is None:
+                    return
+                ahead[row[0]] = pdfs.submit(self._client.get_pdf, row[3], row[4], row[5] or "")
+
+        try:
+            for msg_id, recipient, message, doc_id, *_ in lane:
+                prefetch()
+                self._set(msg_id, status=SENDING)
+                try:
+                    attachments = []
+                    if doc_id:
+                        pdf_bytes, filename = ahead.pop(msg_id).result()
+                        attachments.append(self.attachment(pdf_bytes, filename))
+                    self.send(recipient, message, attachments)
+                except Exception as exc:
+                    outcome = self._fail(msg_id, exc)
+                    with report_lock:
+                        if outcome == FAILED:
+                            report.failed += 1
+                        else:
+                            report.retried += 1
+                    return  # keep per-recipient order: the rest of the lane waits
+                self._set(msg_id, status=SENT, sent_at=time.time(), last_error=None)
+                with report_lock:
+                    report.sent += 1
+        finally:
+            for future in ahead.values():
+                future.cancel()
+
+    def _fail(self, msg_id: int, exc: Exception) -> str:
+        with self._lock:
+            attempts = self._db.execute(
+                "SELECT attempts FROM messages WHERE id = ?", (msg_id,)
+            ).fetchone()[0] + 1
+        if attempts >= self.max_attempts:
+            logger.warning("WhatsApp message %d failed permanently: %s", msg_id, exc)
+            self._set(msg_id, status=FAILED, attempts=attempts, last_error=str(exc))
+            return FAILED
+        delay = min(self.max_backoff, self.backoff ** attempts) * random.uniform(0.8, 1.2)
+        self._set(
+            msg_id, status=PENDING, attempts=attempts,
+            next_attempt=time.time() + delay, last_error=str(exc),
+        )
+        return PENDING
+
+    def _set(self, msg_id: int, **fields: Any) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(
+                f"UPDATE messages SET {assignments} WHERE id = ?", (*fields.values(), msg_id)
+            )
+
+    def close(self) -> None:
+        """Close the queue database."""
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,175 @@
+"""Multi-company access for a single AlignBooks enterprise.
+
+Every ab_token carries one company_id, so each company gets its own client.
+The clients share one HTTP connection pool and calls fan out concurrently.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ._concurrency import DEFAULT_MAX_WORKERS, run_parallel
+from .cache import ResponseCache
+from .constants import API_BASE, CONNECT_TIMEOUT, DEFAULT_MASTER_TYPE, READ_TIMEOUT
+from .deadline import Timeout
+
+if TYPE_CHECKING:
+    from . import AlignBooks
+
+logger = logging.getLogger("alignbooks")
+
+
+class EnterpriseClient:
+    """Run the same SDK call across every company in an enterprise.
+
+    The enterprise's companies are discovered via ``GetCompaniesListofEnterprise``
+    using the seed ``company_id``. A per-company :class:`AlignBooks` facade is
+    created lazily for each one, and all of them share one ``requests.Session``.
+
+    Args:
+        email: Login email address.
+        password: Login password.
+        api_key: AlignBooks API key (GUID).
+        enterprise_id: Enterprise ID (GUID).
+        company_id: Seed company used for discovery (GUID).
+        user_id: User ID (GUID).
+        company_ids: Explicit company IDs; skips discovery when given.
+        master_type: Master type code (default 2037).
+        base_url: API base URL (default: https://service.alignbooks.com).
+        timeout: Read timeout in seconds or ``(connect, read)`` pair (default ``(10, 60)``).
+        max_workers: Maximum companies queried concurrently (default 8).
+        cache: Optional :class:`ResponseCache` shared by all companies (entries
+            are keyed by company_id).
+
+    Example:
+        >>> enterprise = EnterpriseClient(email="...", password="...", api_key="...",
+        ...                               enterprise_id="...", company_id="...", user_id="...")
+        >>> balances = enterprise.map(lambda c: c.items.list_with_balance())
+        >>> for company_id, items in balances.items():
+        ...     print(enterprise.companies[company_id], len(items))
+    """
+
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        api_key: str,
+        enterprise_id: str,
+        company_id: str,
+        user_id: str,
+        company_ids: Iterable[str] | None = None,
+        master_type: int = DEFAULT_MASTER_TYPE,
+        base_url: str = API_BASE,
+        timeout: float | Timeout = (CONNECT_TIMEOUT, READ_TIMEOUT),
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        cache: ResponseCache | None = None,
+    ):
+        self._credentials = {
+            "email": email,
+            "password": password,
+            "api_key": api_key,
+            "enterprise_id": enterprise_id,
+            "user_id": user_id,
+            "master_type": master_type,
+            "base_url": base_url,
+            "timeout": timeout,
+            "cache": cache,
+        }
+        self.enterprise_id = enterprise_id
+        self.seed_company_id = company_id
+        self.max_workers = max_workers
+
+        # One pool sized for the fan-out, shared by every company client.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(max_workers, 10))
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        self._clients: dict[str, AlignBooks] = {}
+        self.companies: dict[str, str] = {}
+        if company_ids is not None:
+            self.companies = {cid: "" for cid in company_ids}
+
+    def company(self, company_id: str) -> AlignBooks:
+        """Return the (cached) client bound to one company."""
+        client = self._clients.get(company_id)
+        if client is None:
+            from . import AlignBooks
+
+            client = AlignBooks(
+                company_id=company_id, session=self._session, **self._credentials
+            )
+            self._clients[company_id] = client
+        return client
+
+    def discover(self) -> dict[str, str]:
+        """Fetch the enterprise's company list.
+
+        Returns:
+            Mapping of company ID to company name.
+        """
+        result = self.company(self.seed_company_id).api_call(
+            "GetCompaniesListofEnterprise", {"enterprise_id": self.enterprise_id}
+        )
+        rows = result if isinstance(result, list) else []
+
+        companies: dict[str, str] = {}
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            cid = row.get("company_id") or row.get("id")
+            if cid:
+                companies[cid] = row.get("company_name") or row.get("name") or ""
+        if not companies:
+            companies = {self.seed_company_id: ""}
+
+        logger.info("Discovered %d companies in enterprise", len(companies))
+        self.companies = companies
+        return companies
+
+    def map(
+        self,
+        fn: Callable[[AlignBooks], Any],
+        companies: Iterable[str] | None = None,
+        *,
+        return_exceptions: bool = False,
+    ) -> dict[str, Any]:
+        """Call ``fn`` with each company's client concurrently.
+
+        Total wall time is bounded by the slowest company rather than the sum.
+
+        Args:
+            fn: Callable taking an :class:`AlignBooks` client.
+            companies: Company IDs to target (default: all discovered companies).
+            return_exceptions: If True, a failing company's exception is stored as
+                its result instead of being raised.
+
+        Returns:
+            Mapping of company ID to ``fn``'s return value.
+        """
+        if companies is None:
+            if not self.companies:
+                self.discover()
+            companies = self.companies
+        company_ids = list(companies)
+
+        # Create clients up front so workers never race on the client map.
+        clients = [self.company(cid) for cid in company_ids]
+        results = run_parallel(
+            fn, clients, self.max_workers, return_exceptions=return_exceptions
+        )
+        return dict(zip(company_ids, results))
+
+    def close(self) -> None:
+        """Close the shared HTTP session."""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
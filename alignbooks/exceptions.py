@@ -36,3 +36,18 @@ class NotFoundError(AlignBooksError):
 class ValidationError(AlignBooksError):
     """Raised for client-side validation errors."""
     pass
+
+
+class ReplayMissError(AlignBooksError):
+    """Raised when a replay transport has no recorded exchange for a request."""
+    pass
+
+
+class InvalidTokenError(AuthenticationError):
+    """Raised when an ab_token cannot be decoded or fails verification."""
+    pass
+
+
+class DeadlineExceededError(AlignBooksError):
+    """Raised when a call is attempted or times out after its deadline passed."""
+    pass
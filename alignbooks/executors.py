@@ -0,0 +1,179 @@
+"""Executor strategies for CPU-bound stages of the bulk APIs.
+
+Building 100K invoice lines or aggregating GST over a year of invoices is pure
+Python work and does not scale on threads because of the GIL. The bulk helpers
+accept an ``executor`` that decides where those CPU stages run:
+
+* :class:`SerialExecutor`: in the calling thread (the default);
+* :class:`ThreadExecutor`: on a thread pool (useful when the stage releases the GIL);
+* :class:`ProcessExecutor`: on a process pool, one chunk per task.
+
+Process workers receive each chunk as compact JSON bytes rather than a pickled
+dict tree, and send their results back the same way. Workers never touch the
+network: the main process keeps the HTTP session and sends whatever the
+workers built.
+
+Stage functions take a list (one chunk) and return a list. They must be
+module-level (or a ``functools.partial`` of one) so process workers can import
+them.
+
+Example:
+    >>> with ProcessExecutor(max_workers=4) as pool:
+    ...     lines = item_lines_to_api(rows, executor=pool)
+    ...     gst = aggregate_invoices(invoices, executor=pool)
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Sequence, Union
+
+from ._concurrency import run_parallel
+from ._json import dumps, loads
+from .exceptions import ValidationError
+from .sql import chunked
+
+ChunkFn = Callable[[list], list]
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _run_encoded(fn: ChunkFn, payload: bytes) -> bytes:
+    return dumps(fn(loads(payload)))
+
+
+def _run_encoded_each(fn: ChunkFn, payload: bytes) -> list[bytes]:
+    return [dumps(result) for result in fn(loads(payload))]
+
+
+class SerialExecutor:
+    """Run chunk functions in the calling thread."""
+
+    def map_chunks(self, fn: ChunkFn, chunks: Sequence[list]) -> list[list]:
+        """Apply ``fn`` to every chunk; results keep chunk order."""
+        return [fn(chunk) for chunk in chunks]
+
+    def encode_chunks(self, fn: ChunkFn, chunks: Sequence[list]) -> list[list[bytes]]:
+        """Like :meth:`map_chunks`, but each result item is returned JSON-encoded."""
+        return [[dumps(result) for result in fn(chunk)] for chunk in chunks]
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ThreadExecutor(SerialExecutor):
+    """Run chunk functions on a thread pool.
+
+    Args:
+        max_workers: Maximum concurrent chunks.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+
+    def map_chunks(self, fn: ChunkFn, chunks: Sequence[list]) -> list[list]:
+        return run_parallel(fn, chunks, self.max_workers)
+
+    def encode_chunks(self, fn: ChunkFn, chunks: Sequence[list]) -> list[list[bytes]]:
+        return run_parallel(lambda chunk: [dumps(r) for r in fn(chunk)], chunks, self.max_workers)
+
+
+class ProcessExecutor(SerialExecutor):
+    """Run chunk functions on a process pool, passing chunks as JSON bytes.
+
+    The pool starts on first use and is reused until :meth:`close`.
+
+    Args:
+        max_workers: Worker processes (default: CPU count).
+        mp_context: Optional ``multiprocessing`` context (e.g. ``"spawn"``).
+    """
+
+    def __init__(self, max_workers: int | None = None, mp_context: Any = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        if isinstance(mp_context, str):
+            import multiprocessing
+
+            mp_context = multiprocessing.get_context(mp_context)
+        self._mp_context = mp_context
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.max_workers, mp_context=self._mp_context)
+        return self._pool
+
+    def map_chunks(self, fn: ChunkFn, chunks: Sequence[list]) -> list[list]:
+        pool = self._get_pool()
+        futures = [pool.submit(_run_encoded, fn, dumps(chunk)) for chunk in chunks]
+        return [loads(future.result()) for future in futures]
+
+    def encode_chunks(self, fn: ChunkFn, chunks: Sequence[list]) -> list[list[bytes]]:
+        pool = self._get_pool()
+        futures = [pool.submit(_run_encoded_each, fn, dumps(chunk)) for chunk in chunks]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+Executor = Union[SerialExecutor, ThreadExecutor, ProcessExecutor]
+
+
+def resolve_executor(executor: Executor | str | None) -> Executor:
+    """Accept an executor instance or one of ``"serial"``, ``"thread"``, ``"process"``."""
+    if executor is None or executor == "serial":
+        return SerialExecutor()
+    if executor == "thread":
+        return ThreadExecutor()
+    if executor == "process":
+        return ProcessExecutor()
+    if isinstance(executor, SerialExecutor):
+        return executor
+    raise ValidationError(f"Unknown executor: {executor!r}")
+
+
+def map_chunked(
+    fn: ChunkFn,
+    items: Iterable[Any],
+    executor: Executor | str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[Any]:
+    """Split ``items`` into chunks, run ``fn`` on each and flatten the results."""
+    owned = not isinstance(executor, SerialExecutor)
+    ex = resolve_executor(executor)
+    try:
+        results = ex.map_chunks(fn, list(chunked(list(items), chunk_size)))
+    finally:
+        if owned:
+            ex.close()
+    return [item for chunk in results for item in chunk]
+
+
+def encode_chunked(
+    fn: ChunkFn,
+    items: Iterable[Any],
+    executor: Executor | str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[bytes]:
+    """Like :func:`map_chunked`, but returns each result JSON-encoded.
+
+    The bytes can be sent as-is (see :class:`~alignbooks._json.EncodedBody`),
+    so results built in worker processes are never decoded in the main one.
+    """
+    owned = not isinstance(executor, SerialExecutor)
+    ex = resolve_executor(executor)
+    try:
+        results = ex.encode_chunks(fn, list(chunked(list(items), chunk_size)))
+    finally:
+        if owned:
+            ex.close()
+    return [item for chunk in results for item in chunk]
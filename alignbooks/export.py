@@ -0,0 +1,518 @@
+"""Partitioned Parquet / Arrow IPC export of vouchers and table rows.
+
+Streams SDK results into a Hive-style dataset for warehouse loading::
+
+    <root>/company=<id>/vtype=<n>/month=YYYY-MM/part-00000.parquet
+
+:class:`DatasetWriter` buffers rows per partition and writes each buffer out
+as one row group once it reaches ``row_group_size``, so memory stays bounded by
+the buffers rather than the size of the export. Column schemas for hydrated
+documents are derived from :func:`~alignbooks.models.build_document_shell` and
+:class:`~alignbooks.models.ItemDetail`; other sources (``List_Document``
+headers, ``et_stock``) infer theirs from the first buffered rows. Nested
+``{id, name}`` references are flattened to ``party_id`` / ``party_name``
+columns; lists are stored as JSON text.
+
+Requires ``pyarrow`` (``pip install alignbooks-sdk[arrow]``).
+
+Example:
+    >>> export_documents(ab.documents, "warehouse/headers", [VType.SALES_INVOICE],
+    ...                  "2025-04-01", "2026-03-31")
+    >>> export_table(ab.query, "warehouse/et_stock", "et_stock", since="2025-04-01")
+    >>> with DatasetWriter("warehouse/lines", line_schema(), company_id=ab.company_id) as w:
+    ...     for doc in hydrated:
+    ...         w.write(document_lines(doc))
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, Sequence, Tuple
+
+from ._json import dumps
+from .exceptions import ValidationError
+from .models import ItemDetail, build_document_shell
+from .report_runner import date_chunks
+from .sql import Select
+
+if TYPE_CHECKING:
+    from .services.documents import DocumentsService
+    from .services.query import QueryService
+
+logger = logging.getLogger("alignbooks")
+
+# Column list: (name, kind) with kind one of "string", "float64", "int64", "bool".
+Schema = Sequence[Tuple[str, str]]
+
+PARTITIONS = ("company", "vtype", "month")
+FORMATS = {"parquet": "parquet", "ipc": "arrow", "arrow": "arrow"}
+
+
+def _arrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError(
+            "Parquet/Arrow export requires pyarrow: pip install alignbooks-sdk[arrow]"
+        ) from exc
+    return pyarrow
+
+
+# --- flattening and schemas ---
+
+
+def flatten(obj: Mapping[str, Any], prefix: str = "") -> dict[str, Any]:
+    """Flatten nested dicts into ``parent_child`` keys; other values are kept as-is."""
+    out: dict[str, Any] = {}
+    for key, value in obj.items():
+        if isinstance(value, Mapping):
+            out.update(flatten(value, f"{prefix}{key}_"))
+        else:
+            out[prefix + key] = value
+    return out
+
+
+def _kind(value: Any) -> str:
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return "float64"
+    return "string"
+
+
+def schema_from_template(
+    template: Mapping[str, Any],
+    exclude: Iterable[str] = (),
+    extra: Schema = (),
+) -> list[tuple[str, str]]:
+    """Derive a column schema from an example payload.
+
+    Numbers map to ``float64`` (amounts and rates share one type), booleans to
+    ``bool`` and everything else, including lists, to ``string``.
+
+    Args:
+        template: Example payload (nested dicts are flattened).
+        exclude: Top-level keys to leave out (e.g. ``item_detail``).
+        extra: Columns prepended to the derived ones.
+    """
+    skip = set(exclude)
+    flat = flatten({k: v for k, v in template.items() if k not in skip})
+    columns = list(extra)
+    seen = {name for name, _ in columns}
+    columns.extend((name, _kind(value)) for name, value in flat.items() if name not in seen)
+    return columns
+
+
+@lru_cache(maxsize=None)
+def header_schema() -> tuple[tuple[str, str], ...]:
+    """Columns of a hydrated document header (``build_document_shell`` shape)."""
+    return tuple(schema_from_template(
+        build_document_shell(party_id=""), exclude=("item_detail",), extra=[("vtype", "int64")],
+    ))
+
+
+@lru_cache(maxsize=None)
+def line_schema() -> tuple[tuple[str, str], ...]:
+    """Columns of a document line (``ItemDetail.to_api_dict`` shape) plus its document keys."""
+    extra = [("document_id", "string"), ("vtype", "int64"), ("vdate", "string"),
+             ("line_no", "int64")]
+    return tuple(schema_from_template(ItemDetail("").to_api_dict(), extra=extra))
+
+
+# Columns inferred as int64 when all their values are integers.
+INT_COLUMNS = frozenset({"vtype", "line_no"})
+
+
+def infer_schema(
+    rows: Sequence[Mapping[str, Any]], int_columns: Iterable[str] = INT_COLUMNS
+) -> list[tuple[str, str]]:
+    """Infer columns from flat rows: all-bool, number, else string.
+
+    Numbers are ``float64`` so that a later page with ``2.5`` in a column that
+    held only ``5`` and ``10`` so far is not truncated. Only ``int_columns`` whose
+    values are all integers become ``int64``.
+    """
+    int_columns = frozenset(int_columns)
+    kinds: dict[str, set[str]] = {}
+    for row in rows:
+        for name, value in row.items():
+            seen = kinds.setdefault(name, set())
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                seen.add("bool")
+            elif isinstance(value, int):
+                seen.add("int64")
+            elif isinstance(value, float):
+                seen.add("float64")
+            else:
+                seen.add("string")
+    columns = []
+    for name, seen in kinds.items():
+        if seen == {"bool"}:
+            kind = "bool"
+        elif seen == {"int64"} and name in int_columns:
+            kind = "int64"
+        elif seen and seen <= {"int64", "float64"}:
+            kind = "float64"
+        else:
+            kind = "string"
+        columns.append((name, kind))
+    return columns
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    if value is None or value == "" and kind != "string":
+        return None
+    if kind == "string":
+        if isinstance(value, str):
+            return value
+        if isinstance(value, (list, tuple, Mapping)):
+            return dumps(value).decode("utf-8")
+        return str(value)
+    try:
+        if kind == "float64":
+            return float(value)
+        if kind == "int64":
+            return _to_int(value)
+        return bool(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value: Any) -> int:
+    """``int(value)``, refusing values that would lose a fractional part."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    number = float(value)
+    if not number.is_integer():
+        raise ValidationError(f"Value {value!r} does not fit an int64 column")
+    return int(number)
+
+
+def document_lines(document: Mapping[str, Any], vtype: int | None = None) -> list[dict[str, Any]]:
+    """Flat line rows of a hydrated document, keyed by its id, vtype and vdate."""
+    vtype = vtype if vtype is not None else document.get("vtype")
+    base = {"document_id": document.get("id"), "vtype": vtype, "vdate": document.get("vdate")}
+    return [
+        {**base, "line_no": i, **flatten(line)}
+        for i, line in enumerate(document.get("item_detail") or [], 1)
+    ]
+
+
+def document_header(document: Mapping[str, Any], vtype: int | None = None) -> dict[str, Any]:
+    """Flat header row of a hydrated document (without its lines)."""
+    row = flatten({k: v for k, v in document.items() if k != "item_detail"})
+    if vtype is not None:
+        row["vtype"] = vtype
+    return row
+
+
+# --- writer ---
+
+
+class _Partition:
+    __slots__ = ("path", "rows", "writer", "written")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows: list[Mapping[str, Any]] = []
+        self.writer: Any = None
+        self.written = 0
+
+
+class DatasetWriter:
+    """Incremental, partitioned Parquet / Arrow IPC writer.
+
+    Args:
+        root: Dataset directory.
+        schema: Columns as ``(name, kind)`` pairs (see :func:`header_schema`,
+            :func:`line_schema`). None infers them from the rows buffered at the
+            first write (see :func:`infer_schema`); columns that appear later
+            are dropped.
+        company_id: Value of the ``company`` partition.
+        file_format: ``"parquet"`` or ``"ipc"`` (Arrow IPC file).
+        partition_by: Subset of ``("company", "vtype", "month")``, outermost first.
+        date_field: Row field giving the ``month`` partition (``YYYY-MM`` prefix).
+        vtype: Default ``vtype`` partition for rows without a ``vtype`` field.
+        row_group_size: Rows per partition buffered before a row group is written.
+        max_buffered_rows: Total buffered rows across partitions; beyond this
+            the largest buffer is written early.
+        compression: Parquet/IPC compression codec.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        schema: Schema | None = None,
+        *,
+        company_id: str = "",
+        file_format: str = "parquet",
+        partition_by: Sequence[str] = PARTITIONS,
+        date_field: str = "vdate",
+        vtype: int | None = None,
+        row_group_size: int = 50_000,
+        max_buffered_rows: int = 200_000,
+        compression: str = "zstd",
+    ):
+        if file_format not in FORMATS:
+            raise ValidationError(f"Unknown export format: {file_format!r}")
+        unknown = set(partition_by) - set(PARTITIONS)
+        if unknown:
+            raise ValidationError(f"Unknown partition keys: {sorted(unknown)}")
+        self._pa = _arrow()
+        self.root = root
+        self.schema = list(schema) if schema is not None else None
+        self.company_id = company_id
+        self.file_format = file_format
+        self.partition_by = tuple(partition_by)
+        self.date_field = date_field
+        self.vtype = vtype
+        self.row_group_size = row_group_size
+        self.max_buffered_rows = max_buffered_rows
+        self.compression = compression
+
+        self._arrow_schema = None
+        self._partitions: dict[tuple, _Partition] = {}
+        self._buffered = 0
+        self._files: dict[str, int] | None = None
+        self.rows_written = 0
+        self.row_groups = 0
+
+    # --- partitioning ---
+
+    def _partition_key(self, row: Mapping[str, Any], vtype: Any) -> tuple:
+        values = []
+        for name in self.partition_by:
+            if name == "company":
+                values.append(self.company_id or "none")
+            elif name == "vtype":
+                value = row.get("vtype")
+                if value in (None, ""):
+                    value = vtype
+                values.append("unknown" if value in (None, "") else str(value))
+            else:
+                day = str(row.get(self.date_field) or "")[:7]
+                values.append(day if len(day) == 7 else "unknown")
+        return tuple(values)
+
+    def _partition(self, key: tuple) -> _Partition:
+        part = self._partitions.get(key)
+        if part is None:
+            directory = os.path.join(
+                self.root, *(f"{name}={value}" for name, value in zip(self.partition_by, key))
+            )
+            path = os.path.join(directory, f"part-00000.{FORMATS[self.file_format]}")
+            part = self._partitions[key] = _Partition(path)
+        return part
+
+    # --- writing ---
+
+    def write(self, rows: Iterable[Any], vtype: int | None = None) -> int:
+        """Buffer rows, writing row groups for partitions that fill up.
+
+        Args:
+            rows: Flat or nested mappings (or :class:`~alignbooks.records.Record`).
+            vtype: ``vtype`` partition for rows without a ``vtype`` field.
+
+        Returns:
+            Number of rows accepted.
+        """
+        vtype = vtype if vtype is not None else self.vtype
+        count = 0
+        for row in rows:
+            if not isinstance(row, Mapping):
+                row = row.to_dict()
+            row = flatten(row)
+            if vtype is not None and row.get("vtype") in (None, ""):
+                row["vtype"] = vtype
+            part = self._partition(self._partition_key(row, vtype))
+            part.rows.append(row)
+            self._buffered += 1
+            count += 1
+            if len(part.rows) >= self.row_group_size:
+                self._flush(part)
+            elif self._buffered >= self.max_buffered_rows:
+                self._flush(max(self._partitions.values(), key=lambda p: len(p.rows)))
+        return count
+
+    def _resolve_schema(self):
+        if self._arrow_schema is None:
+            if self.schema is None:
+                self.schema = infer_schema([r for p in self._partitions.values() for r in p.rows])
+            pa = self._pa
+            types = {"string": pa.string(), "float64": pa.float64(),
+                     "int64": pa.int64(), "bool": pa.bool_()}
+            self._arrow_schema = pa.schema([(name, types[kind]) for name, kind in self.schema])
+        return self._arrow_schema
+
+    def _flush(self, part: _Partition) -> None:
+        if not part.rows:
+            return
+        schema = self._resolve_schema()
+        columns = {
+            name: [_coerce(row.get(name), kind) for row in part.rows] for name, kind in self.schema
+        }
+        table = self._pa.table(columns, schema=schema)
+        if part.writer is None:
+            os.makedirs(os.path.dirname(part.path), exist_ok=True)
+            part.writer = self._open(part.path, schema)
+        if self.file_format == "parquet":
+            part.writer.write_table(table, row_group_size=len(part.rows))
+        else:
+            part.writer.write_table(table)
+        part.written += len(part.rows)
+        self.rows_written += len(part.rows)
+        self.row_groups += 1
+        self._buffered -= len(part.rows)
+        part.rows = []
+
+    def _open(self, path: str, schema: Any) -> Any:
+        if self.file_format == "parquet":
+            import pyarrow.parquet as pq
+
+            return pq.ParquetWriter(path, schema, compression=self.compression)
+        import pyarrow.ipc as ipc
+
+        options = ipc.IpcWriteOptions(compression=self.compression)
+        return ipc.new_file(path, schema, options=options)
+
+    def close(self) -> dict[str, int]:
+        """Write remaining buffers and close all files.
+
+        Returns:
+            Rows written per file path.
+        """
+        if self._files is not None:
+            return self._files
+        for part in self._partitions.values():
+            self._flush(part)
+        for part in self._partitions.values():
+            if part.writer is not None:
+                part.writer.close()
+                part.writer = None
+        logger.info("Exported %d rows to %d files under %s",
+                    self.rows_written, len(self._partitions), self.root)
+        self._files = {p.path: p.written for p in self._partitions.values() if p.written}
+        return self._files
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# --- sources ---
+
+
+def export_documents(
+    documents: DocumentsService,
+    root: str,
+    vtypes: Iterable[int],
+    from_date: str,
+    to_date: str,
+    **writer_options: Any,
+) -> dict[str, int]:
+    """Export ``List_Document`` headers month by month.
+
+    Only one month of one VType is held in memory at a time.
+
+    Args:
+        documents: The client's :class:`~alignbooks.services.documents.DocumentsService`.
+        root: Dataset directory.
+        vtypes: Document types to export.
+        from_date: Start date (YYYY-MM-DD).
+        to_date: End date (YYYY-MM-DD).
+        **writer_options: Passed to :class:`DatasetWriter`.
+
+    Returns:
+        Rows written per file path.
+    """
+    writer_options.setdefault("company_id", documents._client.company_id)
+    with DatasetWriter(root, **writer_options) as writer:
+        for vtype in vtypes:
+            for start, end in date_chunks(from_date, to_date, "month"):
+                writer.write(documents.list(vtype, start.isoformat(), end.isoformat()), vtype)
+    return writer.close()
+
+
+def export_hydrated(
+    documents: Iterable[Mapping[str, Any]],
+    root: str,
+    *,
+    vtype: int | None = None,
+    **writer_options: Any,
+) -> dict[str, int]:
+    """Export hydrated documents as ``<root>/documents`` and ``<root>/lines`` datasets.
+
+    Args:
+        documents: ``Display_*`` payloads in ``build_document_shell`` shape; may be
+            a generator so documents are fetched while earlier ones are written.
+        root: Dataset directory.
+        vtype: Document type for documents without a ``vtype`` field.
+        **writer_options: Passed to both :class:`DatasetWriter` instances.
+
+    Returns:
+        Rows written per file path.
+    """
+    headers = DatasetWriter(os.path.join(root, "documents"), header_schema(), **writer_options)
+    lines = DatasetWriter(os.path.join(root, "lines"), line_schema(), **writer_options)
+    with headers, lines:
+        for doc in documents:
+            doc_vtype = doc.get("vtype", vtype)
+            headers.write([document_header(doc, doc_vtype)], doc_vtype)
+            lines.write(document_lines(doc, doc_vtype), doc_vtype)
+    return {**headers.close(), **lines.close()}
+
+
+def _pages(
+    query: QueryService, table: str, columns: Iterable[str] | str, since: str,
+    date_field: str, order_by: Sequence[str], page_size: int,
+) -> Iterator[list[dict[str, Any]]]:
+    select = Select(table, columns)
+    if since:
+        select.where(date_field, ">=", since)
+    return query.query_iter(select.order_by(*order_by), page_size)
+
+
+def export_table(
+    query: QueryService,
+    root: str,
+    table: str = "et_stock",
+    columns: Iterable[str] | str = "*",
+    *,
+    since: str = "",
+    date_field: str = "vdate",
+    order_by: Sequence[str] = ("vdate", "id"),
+    page_size: int = 50_000,
+    **writer_options: Any,
+) -> dict[str, int]:
+    """Export a company table page by page via QueryExecute.
+
+    Args:
+        query: The client's :class:`~alignbooks.services.query.QueryService`.
+        root: Dataset directory.
+        table: Source table (default ``et_stock``).
+        columns: Columns to select.
+        since: Only rows dated on/after this date.
+        date_field: Date column for ``since`` and the ``month`` partition.
+        order_by: Stable sort for paging.
+        page_size: Rows per QueryExecute call.
+        **writer_options: Passed to :class:`DatasetWriter`.
+
+    Returns:
+        Rows written per file path.
+    """
+    writer_options.setdefault("company_id", query._client.company_id)
+    with DatasetWriter(root, date_field=date_field, **writer_options) as writer:
+        for rows in _pages(query, table, columns, since, date_field, order_by, page_size):
+            writer.write(rows)
+    return writer.close()
@@ -0,0 +1,354 @@
+"""Offline GSTR-style summaries from hydrated invoices or et_stock rows.
+
+``GetGSTR`` and the ABReportService report endpoints are slow and partially
+blocked. Every invoice line already carries the CGST/SGST/IGST split, tax rate
+and HSN code (see :class:`~alignbooks.models.ItemDetail`), so the summaries can
+be built locally in one streaming pass.
+
+Memory is bounded by the number of distinct aggregation keys (HSN x rate, GSTIN
+x rate, state x rate), not by the number of invoices.
+
+Example:
+    >>> gst = GSTAggregator()
+    >>> for bill in bills:                       # Display_Invoice payloads
+    ...     gst.add_invoice(bill)
+    >>> gst.gstr1()["hsn"][:3]
+    >>> gst.gstr3b()["3.1a"]
+
+For a year of invoices, :func:`aggregate_invoices` runs the aggregation on a
+process pool and merges the partial sums.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Any, Iterable, Mapping
+
+from .constants import VType
+from .executors import Executor, map_chunked
+
+# Document types counted as outward supplies / inward supplies (ITC).
+# Returns carry a negative sign; other types (orders, challans) are ignored.
+OUTWARD_VTYPES = frozenset({VType.SALES_INVOICE, VType.DEBIT_NOTE})
+OUTWARD_RETURN_VTYPES = frozenset({VType.SALES_RETURN, VType.CREDIT_NOTE})
+INWARD_VTYPES = frozenset({VType.PURCHASE_BILL})
+INWARD_RETURN_VTYPES = frozenset({VType.PURCHASE_RETURN})
+
+# GSTR-1 B2C (Large): inter-state invoices to unregistered parties above this value.
+B2CL_THRESHOLD = 100_000
+
+_AMOUNTS = ("taxable", "igst", "cgst", "sgst", "cess")
+
+# Default et_stock / flat-row field names for add_row().
+DEFAULT_ROW_FIELDS: dict[str, str] = {
+    "vtype": "vtype",
+    "hsn": "hsn_code",
+    "rate": "tax_rate",
+    "qty": "qty",
+    "unit": "unit_name",
+    "taxable": "taxable",
+    "igst": "igst_tax_amount",
+    "cgst": "cgst_tax_amount",
+    "sgst": "sgst_tax_amount",
+    "cess": "cess_amount",
+    "gstin": "party_gst_no",
+    "state": "place_of_supply",
+    "supplier_state": "location_state_id",
+    "invoice_value": "invoice_value",
+}
+
+
+def _ref_id(value: Any) -> str:
+    """Extract an id from either a plain value or an {id, name} reference."""
+    if isinstance(value, Mapping):
+        return str(value.get("id") or value.get("name") or "")
+    return "" if value is None else str(value)
+
+
+def _is_inter(supplier_state: str, place_of_supply: str, igst: float) -> bool:
+    """Inter-state from the two states when both are known, else from the IGST amount."""
+    if supplier_state and place_of_supply:
+        return supplier_state != place_of_supply
+    return bool(igst)
+
+
+def _num(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _bucket(buckets: dict, key: tuple) -> list[float]:
+    acc = buckets.get(key)
+    if acc is None:
+        acc = buckets[key] = [0.0] * (len(_AMOUNTS) + 2)  # amounts + qty + line count
+    return acc
+
+
+def _add(acc: list[float], amounts: tuple[float, ...], qty: float) -> None:
+    for i, value in enumerate(amounts):
+        acc[i] += value
+    acc[-2] += qty
+    acc[-1] += 1
+
+
+def _rows(buckets: dict, key_names: tuple[str, ...]) -> list[dict[str, Any]]:
+    out = []
+    for key, acc in sorted(buckets.items(), key=lambda kv: tuple(str(k) for k in kv[0])):
+        row = dict(zip(key_names, key))
+        for name, value in zip(_AMOUNTS, acc):
+            row[name] = round(value, 2)
+        row["tax"] = round(sum(acc[1:5]), 2)
+        row["qty"] = round(acc[-2], 3)
+        row["lines"] = int(acc[-1])
+        out.append(row)
+    return out
+
+
+class GSTAggregator:
+    """Streaming group-by over invoice lines for GSTR-1 / GSTR-3B summaries.
+
+    Args:
+        b2cl_threshold: Invoice value above which an inter-state B2C invoice is
+            reported as B2C Large.
+    """
+
+    def __init__(self, b2cl_threshold: float = B2CL_THRESHOLD):
+        self.b2cl_threshold = b2cl_threshold
+        self.documents = 0
+        self._hsn: dict[tuple, list[float]] = {}
+        self._rate: dict[tuple, list[float]] = {}
+        self._b2b: dict[tuple, list[float]] = {}
+        self._b2c: dict[tuple, list[float]] = {}
+        self._inward: dict[tuple, list[float]] = {}
+
+    # --- feeding ---
+
+    def add_line(
+        self,
+        *,
+        vtype: int,
+        hsn: str,
+        rate: float,
+        taxable: float,
+        igst: float = 0.0,
+        cgst: float = 0.0,
+        sgst: float = 0.0,
+        cess: float = 0.0,
+        qty: float = 0.0,
+        unit: str = "",
+        gstin: str = "",
+        state: str = "",
+        b2cl: bool = False,
+        inter: bool | None = None,
+    ) -> None:
+        """Aggregate one invoice line (amounts in document currency).
+
+        ``inter`` marks an inter-state supply; None infers it from ``igst``
+        (which misses zero-rated inter-state lines).
+        """
+        inward = vtype in INWARD_VTYPES or vtype in INWARD_RETURN_VTYPES
+        if not inward and vtype not in OUTWARD_VTYPES and vtype not in OUTWARD_RETURN_VTYPES:
+            return
+        sign = -1.0 if vtype in OUTWARD_RETURN_VTYPES or vtype in INWARD_RETURN_VTYPES else 1.0
+        amounts = tuple(sign * v for v in (taxable, igst, cgst, sgst, cess))
+        qty *= sign
+        supply = "inter" if (bool(igst) if inter is None else inter) else "intra"
+
+        if inward:
+            _add(_bucket(self._inward, (rate, supply)), amounts, qty)
+            return
+
+        _add(_bucket(self._hsn, (hsn, unit, rate)), amounts, qty)
+        _add(_bucket(self._rate, (rate, supply)), amounts, qty)
+        if gstin:
+            _add(_bucket(self._b2b, (gstin, rate)), amounts, qty)
+        else:
+            kind = "B2CL" if b2cl else "B2CS"
+            _add(_bucket(self._b2c, (kind, state, rate)), amounts, qty)
+
+    def add_invoice(self, invoice: Mapping[str, Any], vtype: int | None = None) -> None:
+        """Aggregate a hydrated document (``Display_Invoice`` / ``build_document_shell`` shape).
+
+        Args:
+            invoice: Document dict with ``item_detail`` lines.
+            vtype: Document type; defaults to the document's own ``vtype``.
+        """
+        vtype = int(vtype if vtype is not None else invoice.get("vtype") or VType.SALES_INVOICE)
+        gstin = (invoice.get("party_gst_no") or "").strip()
+        state = _ref_id(invoice.get("place_of_supply")) or invoice.get("party_state_id") or ""
+        lines = invoice.get("item_detail") or []
+
+        is_inter = _is_inter(
+            _ref_id(invoice.get("location_state_id")), str(state),
+            sum(abs(_num(line.get("igst_tax_amount"))) for line in lines),
+        )
+        total = sum(
+            _num(line.get("taxable")) + _num(line.get("tax_amount")) + _num(line.get("cess_amount"))
+            for line in lines
+        )
+        b2cl = not gstin and is_inter and total > self.b2cl_threshold
+
+        for line in lines:
+            item = line.get("item")
+            unit = line.get("unit")
+            hsn = line.get("hsn_code") or (item.get("hsn_code") if isinstance(item, Mapping) else "")
+            self.add_line(
+                vtype=vtype,
+                hsn=str(hsn or ""),
+                rate=_num(line.get("tax_rate")),
+                taxable=_num(line.get("taxable")),
+                igst=_num(line.get("igst_tax_amount")),
+                cgst=_num(line.get("cgst_tax_amount")),
+                sgst=_num(line.get("sgst_tax_amount")),
+                cess=_num(line.get("cess_amount")),
+                qty=_num(line.get("qty")),
+                unit=str(unit.get("name") or "") if isinstance(unit, Mapping) else _ref_id(unit),
+                gstin=gstin,
+                state=str(state),
+                b2cl=b2cl,
+                inter=is_inter,
+            )
+        self.documents += 1
+
+    def add_row(self, row: Mapping[str, Any], fields: Mapping[str, str] | None = None) -> None:
+        """Aggregate one flat line row (e.g. et_stock joined with tax columns).
+
+        B2C Large needs the whole invoice's value, so rows should carry it
+        (``invoice_value``, e.g. joined from the document header); unregistered
+        rows without it are reported as B2C Small. Inter-state is taken from
+        ``supplier_state`` and ``state`` when both are present, else from IGST.
+
+        Args:
+            row: Flat row.
+            fields: Overrides for :data:`DEFAULT_ROW_FIELDS` (logical name -> column).
+        """
+        f = {**DEFAULT_ROW_FIELDS, **(fields or {})}
+        gstin = str(row.get(f["gstin"]) or "").strip()
+        state = _ref_id(row.get(f["state"]))
+        igst = _num(row.get(f["igst"]))
+        inter = _is_inter(_ref_id(row.get(f["supplier_state"])), state, igst)
+        self.add_line(
+            vtype=int(row.get(f["vtype"]) or VType.SALES_INVOICE),
+            hsn=str(row.get(f["hsn"]) or ""),
+            rate=_num(row.get(f["rate"])),
+            taxable=_num(row.get(f["taxable"])),
+            igst=igst,
+            cgst=_num(row.get(f["cgst"])),
+            sgst=_num(row.get(f["sgst"])),
+            cess=_num(row.get(f["cess"])),
+            qty=_num(row.get(f["qty"])),
+            unit=str(row.get(f["unit"]) or ""),
+            gstin=gstin,
+            state=state,
+            b2cl=not gstin and inter and _num(row.get(f["invoice_value"])) > self.b2cl_threshold,
+            inter=inter,
+        )
+
+    def add_invoices(self, invoices: Iterable[Mapping[str, Any]]) -> GSTAggregator:
+        """Aggregate an iterable of documents; returns self for chaining."""
+        for invoice in invoices:
+            self.add_invoice(invoice)
+        return self
+
+    def merge(self, other: GSTAggregator) -> GSTAggregator:
+        """Fold another aggregator's partial sums into this one."""
+        for name in self._TABLES:
+            mine = getattr(self, name)
+            for key, acc in getattr(other, name).items():
+                target = _bucket(mine, key)
+                for i, value in enumerate(acc):
+                    target[i] += value
+        self.documents += other.documents
+        return self
+
+    _TABLES = ("_hsn", "_rate", "_b2b", "_b2c", "_inward")
+
+    def to_state(self) -> list[Any]:
+        """JSON-serializable partial sums (see :meth:`from_state`)."""
+        return [self.documents] + [
+            [[list(key), acc] for key, acc in getattr(self, name).items()]
+            for name in self._TABLES
+        ]
+
+    @classmethod
+    def from_state(cls, state: list[Any], b2cl_threshold: float = B2CL_THRESHOLD) -> GSTAggregator:
+        """Rebuild an aggregator from :meth:`to_state` output."""
+        agg = cls(b2cl_threshold)
+        agg.documents = state[0]
+        for name, entries in zip(cls._TABLES, state[1:]):
+            setattr(agg, name, {tuple(key): acc for key, acc in entries})
+        return agg
+
+    # --- summaries ---
+
+    def hsn_summary(self) -> list[dict[str, Any]]:
+        """GSTR-1 Table 12: HSN-wise summary of outward supplies."""
+        return _rows(self._hsn, ("hsn", "unit", "rate"))
+
+    def rate_summary(self) -> list[dict[str, Any]]:
+        """Outward supplies by tax rate and inter/intra-state."""
+        return _rows(self._rate, ("rate", "supply"))
+
+    def b2b(self) -> list[dict[str, Any]]:
+        """GSTR-1 B2B: supplies to registered parties by GSTIN and rate."""
+        return _rows(self._b2b, ("gstin", "rate"))
+
+    def b2c(self) -> list[dict[str, Any]]:
+        """GSTR-1 B2CL/B2CS: supplies to unregistered parties by state and rate."""
+        return _rows(self._b2c, ("kind", "state", "rate"))
+
+    def gstr1(self) -> dict[str, Any]:
+        """GSTR-1 style summary sections."""
+        return {
+            "b2b": self.b2b(),
+            "b2c": self.b2c(),
+            "hsn": self.hsn_summary(),
+            "rates": self.rate_summary(),
+        }
+
+    def gstr3b(self) -> dict[str, dict[str, float]]:
+        """GSTR-3B style totals: 3.1(a) outward taxable supplies and 4 eligible ITC."""
+        def total(buckets: dict) -> dict[str, float]:
+            sums = [0.0] * len(_AMOUNTS)
+            for acc in buckets.values():
+                for i in range(len(_AMOUNTS)):
+                    sums[i] += acc[i]
+            return {name: round(value, 2) for name, value in zip(_AMOUNTS, sums)}
+
+        outward = total(self._rate)
+        itc = total(self._inward)
+        itc.pop("taxable")
+        return {"3.1a": outward, "4": itc}
+
+
+def _aggregate_chunk(chunk: list[dict[str, Any]], b2cl_threshold: float) -> list[Any]:
+    return [GSTAggregator(b2cl_threshold).add_invoices(chunk).to_state()]
+
+
+def aggregate_invoices(
+    invoices: Iterable[Mapping[str, Any]],
+    executor: Executor | str | None = None,
+    chunk_size: int = 250,
+    b2cl_threshold: float = B2CL_THRESHOLD,
+) -> GSTAggregator:
+    """Aggregate many documents, optionally on a process pool.
+
+    Each chunk is aggregated independently and the partial sums are merged, so
+    only the small per-chunk bucket tables travel back to the main process.
+
+    Args:
+        invoices: Hydrated documents (see :meth:`GSTAggregator.add_invoice`).
+        executor: Where to run the aggregation (see :mod:`alignbooks.executors`).
+        chunk_size: Documents per worker task.
+        b2cl_threshold: See :class:`GSTAggregator`.
+    """
+    states = map_chunked(
+        partial(_aggregate_chunk, b2cl_threshold=b2cl_threshold),
+        invoices, executor, chunk_size,
+    )
+    total = GSTAggregator(b2cl_threshold)
+    for state in states:
+        total.merge(GSTAggregator.from_state(state, b2cl_threshold))
+    return total
@@ -0,0 +1,241 @@
+"""Client-side joins and aggregation for QueryExecute result sets.
+
+Server-side JOINs in QueryExecute are unreliable (see endpoint_status.json), so
+tables such as ``et_stock``, ``mst_item`` and ``mst_party`` are fetched
+separately and combined here. Joins are hash joins: the right side is indexed
+once (O(n)) and every left row is matched with a dict lookup, instead of a
+nested loop over both sides.
+
+Rows may be plain dicts or :class:`~alignbooks.records.Record` instances.
+
+Example:
+    >>> items = Index(ab.query.select("mst_item", ["id", "name"]), "id")
+    >>> stock = ab.query.select("et_stock", ["item_id", "warehouse_id", "qty"])
+    >>> rows = hash_join(stock, items, on="item_id", right_on="id")
+    >>> totals = group_by(rows, "name", {"qty": ("sum", "qty")})
+"""
+
+from __future__ import annotations
+
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+from .exceptions import ValidationError
+
+Row = Mapping[str, Any]
+
+
+def _key_func(key: str | Sequence[str]) -> Callable[[Row], Any]:
+    """Return a fast key extractor (scalar for one column, tuple for several)."""
+    if isinstance(key, str):
+        return itemgetter(key)
+    key = tuple(key)
+    if len(key) == 1:
+        return itemgetter(key[0])
+    return itemgetter(*key)
+
+
+class Index:
+    """Hash index over rows keyed by one or more columns.
+
+    Build it once and reuse it across joins and lookups.
+
+    Args:
+        rows: Rows to index.
+        key: Column name or sequence of column names.
+    """
+
+    def __init__(self, rows: Iterable[Row], key: str | Sequence[str]):
+        self.key = key
+        get_key = _key_func(key)
+        buckets: dict[Any, list[Row]] = {}
+        for row in rows:
+            k = get_key(row)
+            bucket = buckets.get(k)
+            if bucket is None:
+                buckets[k] = [row]
+            else:
+                bucket.append(row)
+        self._buckets = buckets
+        self._columns: tuple[str, ...] | None = None
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """Column names of the indexed rows (from the first row)."""
+        if self._columns is None:
+            for bucket in self._buckets.values():
+                self._columns = tuple(bucket[0].keys())
+                break
+            else:
+                self._columns = ()
+        return self._columns
+
+    def get(self, key: Any) -> list[Row]:
+        """All rows with the given key (empty list if none)."""
+        return self._buckets.get(key, [])
+
+    def first(self, key: Any, default: Any = None) -> Any:
+        """The first row with the given key, or ``default``."""
+        bucket = self._buckets.get(key)
+        return bucket[0] if bucket else default
+
+    def keys(self):
+        return self._buckets.keys()
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._buckets
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+def hash_join(
+    left: Iterable[Row],
+    right: Iterable[Row] | Index,
+    on: str | Sequence[str],
+    *,
+    right_on: str | Sequence[str] | None = None,
+    how: str = "inner",
+    columns: Sequence[str] | None = None,
+    suffix: str = "_right",
+) -> list[dict[str, Any]]:
+    """Join two row sets on equal keys.
+
+    Args:
+        left: Left rows (typically the large fact table, e.g. ``et_stock``).
+        right: Right rows or a prebuilt :class:`Index` (e.g. ``mst_item`` on ``id``).
+        on: Left key column(s).
+        right_on: Right key column(s) (default: same as ``on``). Ignored when an
+            :class:`Index` is passed, which carries its own key.
+        how: ``"inner"`` or ``"left"`` (unmatched left rows get ``None`` values).
+        columns: Right columns to bring over (default: all non-key columns).
+        suffix: Appended to right column names that clash with left columns.
+
+    Returns:
+        List of merged dictionaries.
+    """
+    if how not in ("inner", "left"):
+        raise ValidationError(f"Unsupported join type: {how!r}")
+
+    index = right if isinstance(right, Index) else Index(right, right_on or on)
+    right_keys = {index.key} if isinstance(index.key, str) else set(index.key)
+    wanted = tuple(columns) if columns is not None else tuple(
+        c for c in index.columns if c not in right_keys
+    )
+
+    left = iter(left)
+    first = next(left, None)
+    if first is None:
+        return []
+    left_cols = set(first.keys())
+    renamed = tuple((c, c + suffix if c in left_cols else c) for c in wanted)
+
+    # Project each right bucket once, not once per matching left row.
+    projected: dict[Any, list[dict[str, Any]]] = {
+        k: [{out: row.get(c) for c, out in renamed} for row in index.get(k)]
+        for k in index.keys()
+    }
+    empty = [{out: None for _, out in renamed}] if how == "left" else []
+
+    get_key = _key_func(on)
+    out: list[dict[str, Any]] = []
+    append = out.append
+    for row in _chain(first, left):
+        for extra in projected.get(get_key(row), empty):
+            merged = dict(row)
+            merged.update(extra)
+            append(merged)
+    return out
+
+
+def _chain(first: Row, rest: Iterable[Row]) -> Iterable[Row]:
+    yield first
+    yield from rest
+
+
+_AGGREGATES = ("sum", "count", "min", "max", "avg", "first", "last")
+
+
+def group_by(
+    rows: Iterable[Row],
+    keys: str | Sequence[str],
+    aggregates: dict[str, tuple[str, str | None]],
+) -> list[dict[str, Any]]:
+    """Single-pass grouped aggregation.
+
+    Args:
+        rows: Input rows.
+        keys: Group key column(s).
+        aggregates: Mapping of output column to ``(function, source column)``.
+            Functions: sum, count, min, max, avg, first, last. ``count`` accepts
+            ``None`` as the source column to count rows.
+
+    Returns:
+        One dictionary per group with the key columns and aggregate outputs.
+
+    Example:
+        >>> group_by(stock, ["item_id", "warehouse_id"], {"balance": ("sum", "qty")})
+    """
+    for func, _ in aggregates.values():
+        if func not in _AGGREGATES:
+            raise ValidationError(f"Unsupported aggregate: {func!r}")
+
+    key_cols = (keys,) if isinstance(keys, str) else tuple(keys)
+    get_key = _key_func(key_cols)
+    specs = tuple((name, func, col) for name, (func, col) in aggregates.items())
+    groups: dict[Any, list[Any]] = {}
+
+    for row in rows:
+        k = get_key(row)
+        state = groups.get(k)
+        if state is None:
+            state = groups[k] = [_initial(func) for _, func, _ in specs]
+        for i, (_, func, col) in enumerate(specs):
+            value = 1 if col is None else row.get(col)
+            if value is None and func != "count":
+                continue
+            state[i] = _step(func, state[i], value)
+
+    out = []
+    for k, state in groups.items():
+        key_values = (k,) if len(key_cols) == 1 else k
+        result = dict(zip(key_cols, key_values))
+        for (name, func, _), acc in zip(specs, state):
+            result[name] = _final(func, acc)
+        out.append(result)
+    return out
+
+
+_MISSING = object()
+
+
+def _initial(func: str) -> Any:
+    if func in ("sum", "count"):
+        return 0
+    if func == "avg":
+        return [0.0, 0]
+    return _MISSING
+
+
+def _step(func: str, acc: Any, value: Any) -> Any:
+    if func == "sum":
+        return acc + value
+    if func == "count":
+        return acc + (0 if value is None else 1)
+    if func == "avg":
+        acc[0] += value
+        acc[1] += 1
+        return acc
+    if func == "min":
+        return value if acc is _MISSING or value < acc else acc
+    if func == "max":
+        return value if acc is _MISSING or value > acc else acc
+    if func == "first":
+        return value if acc is _MISSING else acc
+    return value  # last
+
+
+def _final(func: str, acc: Any) -> Any:
+    if func == "avg":
+        return acc[0] / acc[1] if acc[1] else None
+    return None if acc is _MISSING else acc
@@ -6,10 +6,12 @@ Provides dataclass-based models for common AlignBooks entities with smart defaul
 from __future__ import annotations
 
 import uuid
-from dataclasses import dataclass, field
-from typing import Any
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from typing import Any, Iterable
 
 from .constants import ZERO_GUID
+from .executors import Executor, map_chunked
 
 
 def _new_guid() -> str:
@@ -168,6 +170,34 @@ class ItemDetail:
         }
 
 
+def _lines_to_api(chunk: list[dict[str, Any]], is_inter_state: bool) -> list[dict[str, Any]]:
+    return [ItemDetail(**line).to_api_dict(is_inter_state=is_inter_state) for line in chunk]
+
+
+def item_lines_to_api(
+    lines: Iterable[ItemDetail | dict[str, Any]],
+    *,
+    is_inter_state: bool = False,
+    executor: Executor | str | None = None,
+    chunk_size: int = 2000,
+) -> list[dict[str, Any]]:
+    """Convert many line items to API dicts, optionally on a process pool.
+
+    Args:
+        lines: :class:`ItemDetail` objects or dicts of their fields.
+        is_inter_state: If True, applies IGST; otherwise CGST+SGST.
+        executor: Where to run the conversion (see :mod:`alignbooks.executors`).
+        chunk_size: Lines per worker task.
+
+    Returns:
+        AbItemDetail dicts in input order.
+    """
+    rows = [asdict(line) if isinstance(line, ItemDetail) else line for line in lines]
+    return map_chunked(
+        partial(_lines_to_api, is_inter_state=is_inter_state), rows, executor, chunk_size
+    )
+
+
 def build_document_shell(
     *,
     party_id: str,
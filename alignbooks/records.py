@@ -0,0 +1,160 @@
+"""Compact, slot-based row records for large list endpoints.
+
+``ShortList``, ``List_Document`` and ``GetItemBalanceForList`` return thousands of
+flat rows that share one key layout. Holding each row as a dict repeats the key
+table per row; a record class generated per layout stores the (interned) keys
+once on the class and only the values on each instance.
+
+Records are built directly by the JSON decoder via ``object_pairs_hook``, so no
+intermediate dict is created.
+"""
+
+from __future__ import annotations
+
+import json
+import keyword
+import sys
+from typing import Any, Iterator
+
+_TYPE_CACHE: dict[tuple[type, tuple[str, ...]], type] = {}
+
+
+def _attr_name(key: str, taken: set[str]) -> str:
+    """Map a JSON key onto a valid, unique slot name."""
+    name = key if key.isidentifier() and not keyword.iskeyword(key) else "f_" + "".join(
+        ch if ch.isalnum() else "_" for ch in key
+    )
+    while name in taken or name.startswith("_"):
+        name = "f" + name
+    taken.add(name)
+    return name
+
+
+class Record:
+    """Base class for generated row records.
+
+    Records behave like read-mostly mappings (``row["name"]``, ``row.get(...)``,
+    ``keys()``) as well as objects (``row.name``). Use :meth:`to_dict` to get a
+    plain dictionary back.
+    """
+
+    __slots__ = ()
+
+    _keys: tuple[str, ...] = ()
+    _fields: tuple[str, ...] = ()
+    _index: dict[str, str] = {}
+
+    def __init__(self, *values: Any):
+        for attr, value in zip(self._fields, values):
+            object.__setattr__(self, attr, value)
+
+    @classmethod
+    def of(cls, keys: tuple[str, ...]) -> type[Record]:
+        """Return the record subclass of ``cls`` for one key layout (cached)."""
+        cache_key = (cls, keys)
+        record_cls = _TYPE_CACHE.get(cache_key)
+        if record_cls is None:
+            interned = tuple(sys.intern(k) for k in keys)
+            # Reserve method/attribute names so keys like "items" cannot shadow them.
+            taken: set[str] = set(dir(cls))
+            fields = tuple(_attr_name(k, taken) for k in interned)
+            record_cls = type(cls.__name__, (cls,), {
+                "__slots__": fields,
+                "_keys": interned,
+                "_fields": fields,
+                "_index": dict(zip(interned, fields)),
+            })
+            _TYPE_CACHE[cache_key] = record_cls
+        return record_cls
+
+    @classmethod
+    def from_pairs(cls, pairs: list[tuple[str, Any]]) -> Record:
+        """Build a record from decoder key/value pairs."""
+        keys = tuple(k for k, _ in pairs)
+        return cls.of(keys)(*(v for _, v in pairs))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Record:
+        """Build a record from an existing dictionary."""
+        return cls.of(tuple(data))(*data.values())
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, self._index[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Record):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        attr = self._index.get(key)
+        return default if attr is None else getattr(self, attr)
+
+    def keys(self) -> tuple[str, ...]:
+        return self._keys
+
+    def values(self) -> list[Any]:
+        return [getattr(self, attr) for attr in self._fields]
+
+    def items(self) -> list[tuple[str, Any]]:
+        return list(zip(self._keys, self.values()))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert back to a plain (recursively converted) dictionary."""
+        return {k: _plain(v) for k, v in zip(self._keys, self.values())}
+
+    def __repr__(self) -> str:
+        body = ", ".join(f"{k}={v!r}" for k, v in self.items())
+        return f"{type(self).__name__}({body})"
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+class MasterRecord(Record):
+    """Row from ``ShortList`` / ``ShortList_*`` (id, name, ...)."""
+
+    __slots__ = ()
+
+
+class DocumentHeader(Record):
+    """Transaction header row from ``List_Document``."""
+
+    __slots__ = ()
+
+
+class ItemBalance(Record):
+    """Stock row from ``GetItemBalanceForList`` (item_id, balance)."""
+
+    __slots__ = ()
+
+
+def decode_records(text: str | bytes, record_cls: type[Record] = Record) -> Any:
+    """Decode JSON text, building ``record_cls`` records for every object."""
+    return json.loads(text, object_pairs_hook=record_cls.from_pairs)
+
+
+def to_records(rows: list[dict[str, Any]], record_cls: type[Record] = Record) -> list[Record]:
+    """Convert already-decoded dict rows into records."""
+    return [record_cls.from_dict(row) for row in rows]
@@ -0,0 +1,253 @@
+"""Background refresh of slow, frequently-read endpoints.
+
+Dashboard figures are expensive to compute server-side but change slowly, so a
+page view should never wait for them. :class:`BackgroundRefresher` calls each
+registered function on its own schedule (with jitter, so refreshes don't
+synchronize) and serves the latest value from memory. A read of a value older
+than its interval returns the stale value immediately and triggers a refresh
+(stale-while-revalidate).
+
+Example:
+    >>> refresher = ab.reports.dashboard_refresher(interval=300)
+    >>> refresher.get("dashboard")          # instant after the first fetch
+    >>> refresher.stop()
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+logger = logging.getLogger("alignbooks")
+
+_MISS = object()
+
+
+class _Entry:
+    __slots__ = (
+        "fn", "interval", "jitter", "value", "fetched_at", "error",
+        "in_flight", "ready", "refreshes", "failures", "next_due", "queued_due",
+    )
+
+    def __init__(self, fn: Callable[[], Any], interval: float, jitter: float):
+        self.fn = fn
+        self.interval = interval
+        self.jitter = jitter
+        self.value: Any = _MISS
+        self.fetched_at: float | None = None
+        self.error: BaseException | None = None
+        self.in_flight = False
+        self.ready = threading.Event()
+        self.refreshes = 0
+        self.failures = 0
+        self.next_due: float | None = None
+        self.queued_due: float | None = None  # due time of this entry's heap item
+
+
+class BackgroundRefresher:
+    """Periodically refresh registered values and serve them from memory.
+
+    Args:
+        max_concurrent: Maximum refreshes running at the same time.
+        jitter: Default jitter as a fraction of the interval (0.1 = +/-10%).
+
+    The refresher is thread-based: one scheduler thread plus a pool of
+    ``max_concurrent`` workers. It can also be used without :meth:`start`, in
+    which case values are only refreshed on read (stale-while-revalidate).
+    """
+
+    def __init__(self, max_concurrent: int = 2, jitter: float = 0.1):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.jitter = jitter
+        self._entries: dict[str, _Entry] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pool = ThreadPoolExecutor(max_concurrent, thread_name_prefix="alignbooks-refresh")
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+
+    # --- registration ---
+
+    def register(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        interval: float,
+        *,
+        jitter: float | None = None,
+        prefetch: bool = True,
+    ) -> None:
+        """Register a value to keep fresh.
+
+        Args:
+            name: Key used with :meth:`get`.
+            fn: Zero-argument callable fetching the value, e.g. ``ab.reports.dashboard``.
+            interval: Seconds between refreshes; values older than this are stale.
+            jitter: Per-entry jitter fraction (default: the refresher's).
+            prefetch: Schedule the first fetch immediately rather than on first read.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        entry = _Entry(fn, interval, self.jitter if jitter is None else jitter)
+        with self._lock:
+            self._entries[name] = entry
+            if prefetch:
+                entry.next_due = entry.queued_due = time.monotonic()
+                heapq.heappush(self._heap, (entry.queued_due, name))
+                self._wakeup.notify()
+
+    def unregister(self, name: str) -> None:
+        """Stop refreshing ``name`` and drop its value."""
+        with self._lock:
+            self._entries.pop(name, None)
+
+    # --- reading ---
+
+    def get(self, name: str, default: Any = _MISS, timeout: float | None = None) -> Any:
+        """Return the latest value of ``name``.
+
+        A stale value is returned immediately while a refresh runs in the
+        background. Only the very first read waits for a fetch.
+
+        Args:
+            name: Registered name.
+            default: Returned if no value is available (instead of raising).
+            timeout: Maximum seconds to wait for the first fetch.
+
+        Raises:
+            KeyError: If ``name`` is not registered.
+            Exception: The fetch error, if the first fetch failed and no default is given.
+        """
+        with self._lock:
+            entry = self._entries[name]
+            if entry.value is _MISS or self._age(entry) >= entry.interval:
+                self._submit(name, entry)
+
+        if entry.value is _MISS:
+            entry.ready.wait(timeout)
+        if entry.value is not _MISS:
+            return entry.value
+        if default is not _MISS:
+            return default
+        if entry.error is not None:
+            raise entry.error
+        raise TimeoutError(f"No value for {name!r} yet")
+
+    def age(self, name: str) -> float | None:
+        """Seconds since ``name`` was last fetched, or None if never."""
+        entry = self._entries[name]
+        return None if entry.fetched_at is None else self._age(entry)
+
+    def refresh(self, name: str) -> None:
+        """Schedule an immediate refresh of ``name``."""
+        with self._lock:
+            self._submit(name, self._entries[name])
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-entry refresh counts, failures and age."""
+        return {
+            name: {
+                "refreshes": e.refreshes,
+                "failures": e.failures,
+                "age": None if e.fetched_at is None else round(self._age(e), 3),
+                "in_flight": e.in_flight,
+            }
+            for name, e in list(self._entries.items())
+        }
+
+    # --- scheduling ---
+
+    @staticmethod
+    def _age(entry: _Entry) -> float:
+        return time.monotonic() - entry.fetched_at if entry.fetched_at is not None else float("inf")
+
+    def _submit(self, name: str, entry: _Entry) -> None:
+        # Caller holds the lock. At most one refresh per entry is in flight.
+        if entry.in_flight or self._stopped:
+            return
+        entry.in_flight = True
+        self._pool.submit(self._run, name, entry)
+
+    def _run(self, name: str, entry: _Entry) -> None:
+        try:
+            value = entry.fn()
+        except Exception as exc:  # keep serving the last good value
+            logger.warning("Background refresh of %s failed: %s", name, exc)
+            entry.error = exc
+            entry.failures += 1
+            fetched = False
+        else:
+            entry.value = value
+            entry.error = None
+            entry.fetched_at = time.monotonic()
+            entry.refreshes += 1
+            fetched = True
+        with self._lock:
+            entry.in_flight = False
+            if self._entries.get(name) is entry:
+                spread = entry.interval * entry.jitter
+                delay = entry.interval + random.uniform(-spread, spread)
+                if not fetched:
+                    delay = min(delay, max(entry.interval / 4, 1.0))  # retry failures sooner
+                entry.next_due = time.monotonic() + delay
+                # One schedule per entry: a refresh triggered by get()/refresh()
+                # only moves the due time instead of starting another chain.
+                if entry.queued_due is None or entry.next_due < entry.queued_due:
+                    if entry.queued_due is not None:
+                        self._heap.remove((entry.queued_due, name))
+                        heapq.heapify(self._heap)
+                    entry.queued_due = entry.next_due
+                    heapq.heappush(self._heap, (entry.queued_due, name))
+                    self._wakeup.notify()
+        entry.ready.set()
+
+    def _loop(self) -> None:
+        with self._lock:
+            while not self._stopped:
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    due, name = heapq.heappop(self._heap)
+                    entry = self._entries.get(name)
+                    if entry is None or entry.queued_due != due:
+                        continue  # unregistered (or re-registered) since queued
+                    if entry.next_due > due:  # refreshed out of band since queued
+                        entry.queued_due = entry.next_due
+                        heapq.heappush(self._heap, (entry.queued_due, name))
+                        continue
+                    entry.queued_due = None
+                    self._submit(name, entry)
+                timeout = self._heap[0][0] - now if self._heap else None
+                self._wakeup.wait(timeout)
+
+    def start(self) -> BackgroundRefresher:
+        """Start the scheduler thread (idempotent); returns self."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="alignbooks-refresher", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop the scheduler and the refresh workers."""
+        with self._lock:
+            self._stopped = True
+            self._wakeup.notify_all()
+        if self._thread is not None and wait:
+            self._thread.join()
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
@@ -0,0 +1,150 @@
+"""Indexed catalogue of all discovered AlignBooks endpoints.
+
+``SERVICE_MAP`` only lists the 155 endpoints that live outside ABDataService.
+The registry covers all 924 endpoints with per-endpoint metadata: service,
+kind (read/write/delete/action), idempotency, cacheability and TTL hint, heavy
+and date-range flags, the payload wrapper key (``info`` vs ``invoice``), the
+expected response shape and the live test status.
+
+Data is loaded lazily from the packaged ``endpoints.json`` on first use. That
+file is generated by ``scripts/build_endpoint_registry.py``. Entries without a
+live test are classified from the endpoint name, so treat them as hints.
+
+Example:
+    >>> from alignbooks.registry import endpoint_info, get_registry
+    >>> endpoint_info("SaveUpdate_Invoice").body_key
+    'invoice'
+    >>> [e.name for e in get_registry().select(kind="read", heavy=True)][:3]
+"""
+
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple
+
+from .constants import SERVICE_MAP, Service
+
+DATA_FILE = Path(__file__).with_name("endpoints.json")
+
+_IDEMPOTENT, _CACHEABLE, _HEAVY, _DATE_RANGE = 1, 2, 4, 8
+
+
+class Endpoint(NamedTuple):
+    """Metadata of one endpoint.
+
+    Attributes:
+        name: Endpoint name.
+        service: Service URL suffix (e.g. ``ABDataService.svc``).
+        kind: ``"read"``, ``"write"``, ``"delete"`` or ``"action"``.
+        idempotent: Safe to retry (reads and deletes).
+        cacheable: Read whose result is stable enough to cache.
+        ttl: Suggested cache TTL in seconds, if any.
+        heavy: Slow server-side computation (reports, bulk, SQL).
+        date_range: Accepts ``from_date``/``to_date`` and can be chunked by date.
+        body_key: Payload wrapper key (``"info"``, ``"invoice"``, ...), if any.
+        response: ``"list"``, ``"dict"``, ``"envelope"``, ``"document"``,
+            ``"encrypted"`` or ``"unknown"``.
+        status: Live test status from endpoint_status.json (``""`` if untested).
+        keys: Top-level request keys observed in live tests.
+    """
+
+    name: str
+    service: str
+    kind: str
+    idempotent: bool
+    cacheable: bool
+    ttl: int | None
+    heavy: bool
+    date_range: bool
+    body_key: str | None
+    response: str
+    status: str
+    keys: tuple[str, ...]
+
+
+class EndpointRegistry:
+    """Lookup and filtering over the endpoint catalogue.
+
+    Entries are decoded from the compact rows on first access.
+    """
+
+    def __init__(self, data: dict[str, Any]):
+        self._services: list[str] = data["services"]
+        self._kinds: list[str] = data["kinds"]
+        self._responses: list[str] = data["responses"]
+        self._rows: dict[str, list[Any]] = data["endpoints"]
+        self._decoded: dict[str, Endpoint] = {}
+
+    @classmethod
+    def load(cls, path: str | Path = DATA_FILE) -> EndpointRegistry:
+        """Load a registry data file."""
+        with open(path, encoding="utf-8") as fh:
+            return cls(json.load(fh))
+
+    def get(self, name: str) -> Endpoint | None:
+        """Metadata for ``name``, or None for an unknown endpoint."""
+        entry = self._decoded.get(name)
+        if entry is None:
+            row = self._rows.get(name)
+            if row is None:
+                return None
+            service, kind, flags, ttl, body_key, response, status, keys = row
+            entry = self._decoded[name] = Endpoint(
+                name=name,
+                service=self._services[service],
+                kind=self._kinds[kind],
+                idempotent=bool(flags & _IDEMPOTENT),
+                cacheable=bool(flags & _CACHEABLE),
+                ttl=ttl,
+                heavy=bool(flags & _HEAVY),
+                date_range=bool(flags & _DATE_RANGE),
+                body_key=body_key,
+                response=self._responses[response],
+                status=status,
+                keys=tuple(keys),
+            )
+        return entry
+
+    def __getitem__(self, name: str) -> Endpoint:
+        entry = self.get(name)
+        if entry is None:
+            raise KeyError(name)
+        return entry
+
+    def service_for(self, name: str) -> str:
+        """Service URL suffix for ``name`` (ABDataService for unknown endpoints)."""
+        row = self._rows.get(name)
+        if row is not None:
+            return self._services[row[0]]
+        return SERVICE_MAP.get(name, Service.DATA)
+
+    def select(self, **criteria: Any) -> list[Endpoint]:
+        """Endpoints whose attributes equal every keyword, e.g. ``kind="read", heavy=True``."""
+        out = []
+        for name in self._rows:
+            entry = self.get(name)
+            if all(getattr(entry, field) == value for field, value in criteria.items()):
+                out.append(entry)
+        return out
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+@lru_cache(maxsize=None)
+def get_registry() -> EndpointRegistry:
+    """The packaged registry, loaded on first call."""
+    return EndpointRegistry.load()
+
+
+def endpoint_info(name: str) -> Endpoint | None:
+    """Shortcut for ``get_registry().get(name)``."""
+    return get_registry().get(name)
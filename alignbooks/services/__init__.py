@@ -8,6 +8,8 @@ from .inventory import InventoryService
 from .reports import ReportsService
 from .config import ConfigService
 from .documents import DocumentsService
+from .query import QueryService
+from .notifications import NotificationsService
 
 __all__ = [
     "MastersService",
@@ -22,4 +24,6 @@ __all__ = [
     "ReportsService",
     "ConfigService",
     "DocumentsService",
+    "QueryService",
+    "NotificationsService",
 ]
@@ -2,14 +2,69 @@
 
 from __future__ import annotations
 
-from typing import Any
+import logging
+import time
+from typing import Any, Iterable, Mapping
 
+from .._concurrency import run_parallel
+from ..constants import VType
+from ..fingerprints import FingerprintStore, HydrateReport, document_fingerprint
+from ..records import DocumentHeader
+from ..tracing import traced
 from ._base import BaseService
+from .query import QueryService
+
+logger = logging.getLogger("alignbooks")
+
+# Display endpoint per VType; everything else is served by Display_Invoice.
+DISPLAY_ENDPOINTS = {
+    VType.ESTIMATE: "Display_Estimate",
+    VType.SALES_ORDER: "Display_Order",
+    VType.PURCHASE_ORDER: "Display_Order",
+}
 
 
 class DocumentsService(BaseService):
     """Document utility operations."""
 
+    def list(
+        self,
+        vtype: int,
+        from_date: str = "",
+        to_date: str = "",
+        location_id: str = "",
+        as_records: bool = False,
+    ) -> list[dict[str, Any]] | list[DocumentHeader]:
+        """List transaction headers of any document type.
+
+        Args:
+            vtype: Document type (VType constant).
+            from_date: Start date (YYYY-MM-DD).
+            to_date: End date (YYYY-MM-DD).
+            location_id: Branch/location ID filter.
+            as_records: Return compact :class:`DocumentHeader` rows instead of dicts.
+
+        Returns:
+            List of document headers (no line items).
+        """
+        result = self._call(
+            "List_Document", self._list_body(vtype, from_date, to_date, location_id),
+            records=DocumentHeader if as_records else None,
+        )
+        return result if isinstance(result, list) else []
+
+    @staticmethod
+    def _list_body(vtype: int, from_date: str, to_date: str, location_id: str) -> dict[str, Any]:
+        return {
+            "info": {
+                "master_id": "",
+                "branch_id": location_id,
+                "from_date": from_date,
+                "to_date": to_date,
+                "master_type": vtype,
+            }
+        }
+
     def delete(self, doc_id: str, vtype: int) -> dict[str, Any]:
         """Delete a document by ID and VType.
 
@@ -37,3 +92,121 @@ class DocumentsService(BaseService):
             Tuple of (pdf_bytes, filename).
         """
         return self._client.get_pdf(doc_id, vtype, format_id)
+
+    def display(self, doc_id: str, vtype: int, endpoint: str | None = None) -> dict[str, Any]:
+        """Fetch one full document (header and line items).
+
+        Args:
+            doc_id: Document ID (GUID).
+            vtype: Document type (VType constant).
+            endpoint: ``Display_*`` endpoint (default: chosen from ``vtype``).
+        """
+        endpoint = endpoint or DISPLAY_ENDPOINTS.get(vtype, "Display_Invoice")
+        return self._call(endpoint, {"id": doc_id, "vtype": vtype})
+
+    @traced("documents.hydrate")
+    def hydrate(
+        self,
+        vtype: int,
+        from_date: str = "",
+        to_date: str = "",
+        *,
+        store: FingerprintStore,
+        headers: Iterable[Mapping[str, Any]] | None = None,
+        location_id: str = "",
+        endpoint: str | None = None,
+        probe_table: str | None = None,
+        probe_columns: Iterable[str] = ("modified_on",),
+        id_field: str = "id",
+        date_field: str = "vdate",
+        max_workers: int = 8,
+    ) -> HydrateReport:
+        """Fetch full documents whose fingerprint changed since the last sync.
+
+        Each ``List_Document`` header is hashed together with an optional probe
+        row fetched in bulk via QueryExecute (``SELECT id, <probe_columns> FROM
+        <probe_table> WHERE id IN (...)``). Only documents that are new or whose
+        hash differs from ``store`` are fetched with ``Display_*``; successful
+        fetches update the store, failed ones are retried on the next sync.
+
+        Args:
+            vtype: Document type (VType constant).
+            from_date: Start date (YYYY-MM-DD).
+            to_date: End date (YYYY-MM-DD).
+            store: Fingerprints from previous syncs.
+            headers: Already-fetched headers (skips the ``List_Document`` call
+                and removal detection). Removal detection is also skipped when
+                the listing is not a list, or is empty while ``store`` knows
+                documents in the range.
+            location_id: Branch/location ID filter for ``List_Document``.
+            endpoint: ``Display_*`` endpoint (default: chosen from ``vtype``).
+            probe_table: Transaction table holding a modification marker (e.g.
+                ``"tr_order"``). Without it only header fields are compared.
+            probe_columns: Probe columns folded into the fingerprint.
+            id_field: Header field with the document ID.
+            date_field: Header field with the voucher date.
+            max_workers: Maximum concurrent ``Display_*`` calls.
+
+        Returns:
+            :class:`~alignbooks.fingerprints.HydrateReport` with the fetched documents.
+        """
+        start = time.monotonic()
+        report = HydrateReport()
+        # Deletions can only be inferred from a complete, unfiltered listing.
+        complete = headers is None and not location_id
+        if headers is None:
+            result = self._call(
+                "List_Document", self._list_body(vtype, from_date, to_date, location_id)
+            )
+            if not isinstance(result, list):
+                logger.warning("Hydrate vtype %s: List_Document returned no rows list", vtype)
+                complete, result = False, []
+            headers = result
+        headers = [h for h in headers if h.get(id_field)]
+
+        probes: dict[str, Any] = {}
+        if probe_table and headers:
+            columns = list(probe_columns)
+            rows = QueryService(self._client).fetch_in(
+                probe_table, "id", [h[id_field] for h in headers], ["id", *columns]
+            )
+            probes = {str(row["id"]): [row.get(c) for c in columns] for row in rows}
+
+        known = store.get_many(vtype, from_date, to_date)
+        if complete and not headers and known:
+            # Far more likely an odd response than every document deleted at once.
+            logger.warning(
+                "Hydrate vtype %s: empty listing, %d known documents kept", vtype, len(known)
+            )
+            complete = False
+        seen: set[str] = set()
+        stale: list[tuple[str, str, str]] = []
+        for header in headers:
+            doc_id = str(header[id_field])
+            seen.add(doc_id)
+            fingerprint = document_fingerprint(header, probes.get(doc_id))
+            if known.get(doc_id) == fingerprint:
+                report.unchanged.append(doc_id)
+            else:
+                stale.append((doc_id, str(header.get(date_field) or ""), fingerprint))
+        if complete:
+            report.removed = [doc_id for doc_id in known if doc_id not in seen]
+
+        results = run_parallel(
+            lambda job: self.display(job[0], vtype, endpoint), stale, max_workers,
+            return_exceptions=True,
+        )
+        fresh = []
+        for (doc_id, vdate, fingerprint), result in zip(stale, results):
+            if isinstance(result, Exception):
+                report.failed.append((doc_id, result))
+            else:
+                report.documents[doc_id] = result
+                fresh.append((doc_id, vtype, vdate, fingerprint))
+        store.put_many(fresh)
+        if report.removed:
+            store.forget(report.removed)
+
+        report.elapsed = time.monotonic() - start
+        logger.info("Hydrate vtype %s: %r", vtype, report)
+        return report
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from typing import Any
 
-from ..constants import VType
+from ..constants import ZERO_GUID, VType
+from ..records import ItemBalance
+from ..stock import StockSnapshot
 from ._base import BaseService
 
 
@@ -34,3 +36,62 @@ class InventoryService(BaseService):
             "id": adjustment_id,
             "vtype": VType.MATERIAL_ADJUSTMENT,
         })
+
+    def item_balances(
+        self,
+        warehouse_id: str,
+        branch_id: str = ZERO_GUID,
+        voucher_type: int = VType.SALES_INVOICE,
+        as_records: bool = False,
+    ) -> list[dict[str, Any]] | list[ItemBalance]:
+        """Get live stock balances for every item in a warehouse.
+
+        Args:
+            warehouse_id: Warehouse ID (GUID). The zero GUID returns nothing.
+            branch_id: Branch ID filter (default: all branches).
+            voucher_type: Document context for the balance (default 4).
+            as_records: Return compact :class:`ItemBalance` rows instead of dicts.
+
+        Returns:
+            List of ``{item_id, balance}`` rows.
+        """
+        result = self._call("GetItemBalanceForList", {
+            "voucher_type": voucher_type,
+            "branch_id": branch_id,
+            "warehouse_id": warehouse_id,
+        }, records=ItemBalance if as_records else None)
+        return result if isinstance(result, list) else []
+
+    def moved_stock(self, from_date: str, to_date: str) -> list[dict[str, Any]]:
+        """List items with stock movement in a date range.
+
+        Args:
+            from_date: Start date (YYYY-MM-DD).
+            to_date: End date (YYYY-MM-DD).
+        """
+        result = self._call("GetMovedOnlyStock", {
+            "from_date": from_date,
+            "to_date": to_date,
+        })
+        return result if isinstance(result, list) else []
+
+    def stock_snapshot(
+        self,
+        warehouse_ids: list[str],
+        branch_id: str = ZERO_GUID,
+        load: bool = True,
+    ) -> StockSnapshot:
+        """Create a :class:`~alignbooks.stock.StockSnapshot` for some warehouses.
+
+        Args:
+            warehouse_ids: Warehouses to track.
+            branch_id: Branch filter (default: all branches).
+            load: Poll all warehouses immediately (default True).
+
+        Returns:
+            Snapshot whose ``refresh()`` returns per-warehouse deltas.
+        """
+        snapshot = StockSnapshot(warehouse_ids, service=self, branch_id=branch_id)
+        if load:
+            snapshot.refresh()
+        return snapshot
@@ -2,20 +2,27 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterable
 
+from ..bulk import DEFAULT_IGNORE, UpsertReport, bulk_upsert
 from ..constants import ZERO_GUID, MasterType
+from ..executors import Executor
+from ..records import MasterRecord
+from ..tracing import traced
 from ._base import BaseService
 
 
 class MastersService(BaseService):
     """Generic master data operations using ShortList endpoint."""
 
-    def shortlist(self, master_type: int) -> list[dict[str, Any]]:
+    def shortlist(
+        self, master_type: int, as_records: bool = False
+    ) -> list[dict[str, Any]] | list[MasterRecord]:
         """Get a short list of master records.
 
         Args:
             master_type: MasterType constant (e.g. MasterType.VENDOR).
+            as_records: Return compact :class:`MasterRecord` rows instead of dicts.
 
         Returns:
             List of master records with id, name, and other fields.
@@ -23,16 +30,48 @@ class MastersService(BaseService):
         result = self._call("ShortList", {
             "new_id": ZERO_GUID,
             "master_type": master_type,
-        })
+        }, records=MasterRecord if as_records else None)
         return result if isinstance(result, list) else []
 
 
-class VendorsService(BaseService):
+class MasterServiceBase(BaseService):
+    """Shared behaviour of the master services with list/create/update."""
+
+    @traced()
+    def bulk_upsert(
+        self,
+        records: Iterable[dict[str, Any]],
+        *,
+        key: str = "name",
+        journal: str | None = None,
+        ignore: Iterable[str] = DEFAULT_IGNORE,
+        max_workers: int = 8,
+        dry_run: bool = False,
+        executor: Executor | str | None = None,
+    ) -> UpsertReport:
+        """Create new and update changed masters; skip unchanged ones.
+
+        See :func:`alignbooks.bulk.bulk_upsert`.
+
+        Example:
+            >>> report = ab.items.bulk_upsert(feed, journal="items.journal")
+            >>> report.as_dict()
+        """
+        return bulk_upsert(
+            self, records, key=key, journal=journal, ignore=ignore,
+            max_workers=max_workers, dry_run=dry_run, executor=executor,
+        )
+
+
+class VendorsService(MasterServiceBase):
     """Vendor (supplier) operations."""
 
-    def list(self) -> list[dict[str, Any]]:
+    def list(self, as_records: bool = False) -> list[dict[str, Any]] | list[MasterRecord]:
         """List all vendors.
 
+        Args:
+            as_records: Return compact :class:`MasterRecord` rows instead of dicts.
+
         Returns:
             List of vendor records.
 
@@ -44,7 +83,7 @@ class VendorsService(BaseService):
         result = self._call("ShortList", {
             "new_id": ZERO_GUID,
             "master_type": MasterType.VENDOR,
-        })
+        }, records=MasterRecord if as_records else None)
         return result if isinstance(result, list) else []
 
     def get(self, vendor_id: str) -> dict[str, Any]:
@@ -102,19 +141,22 @@ class VendorsService(BaseService):
         })
 
 
-class CustomersService(BaseService):
+class CustomersService(MasterServiceBase):
     """Customer operations."""
 
-    def list(self) -> list[dict[str, Any]]:
+    def list(self, as_records: bool = False) -> list[dict[str, Any]] | list[MasterRecord]:
         """List all customers.
 
+        Args:
+            as_records: Return compact :class:`MasterRecord` rows instead of dicts.
+
         Returns:
             List of customer records.
         """
         result = self._call("ShortList", {
             "new_id": ZERO_GUID,
             "master_type": MasterType.CUSTOMER,
-        })
+        }, records=MasterRecord if as_records else None)
         return result if isinstance(result, list) else []
 
     def get(self, customer_id: str) -> dict[str, Any]:
@@ -140,12 +182,15 @@ class CustomersService(BaseService):
         })
 
 
-class ItemsService(BaseService):
+class ItemsService(MasterServiceBase):
     """Item/product operations."""
 
-    def list(self) -> list[dict[str, Any]]:
+    def list(self, as_records: bool = False) -> list[dict[str, Any]] | list[MasterRecord]:
         """List all items.
 
+        Args:
+            as_records: Return compact :class:`MasterRecord` rows instead of dicts.
+
         Returns:
             List of item records.
 
@@ -157,7 +202,7 @@ class ItemsService(BaseService):
         result = self._call("ShortList", {
             "new_id": ZERO_GUID,
             "master_type": MasterType.ITEM,
-        })
+        }, records=MasterRecord if as_records else None)
         return result if isinstance(result, list) else []
 
     def get(self, item_id: str) -> dict[str, Any]:
@@ -194,23 +239,25 @@ class ItemsService(BaseService):
             "item_information": data,
         })
 
-    def list_with_balance(self) -> list[dict[str, Any]]:
+    def list_with_balance(
+        self, as_records: bool = False
+    ) -> list[dict[str, Any]] | list[MasterRecord]:
         """List items with stock balance."""
         result = self._call("ShortList_ItemWithBalance", {
             "new_id": ZERO_GUID,
-        })
+        }, records=MasterRecord if as_records else None)
         return result if isinstance(result, list) else []
 
 
-class LedgersService(BaseService):
+class LedgersService(MasterServiceBase):
     """Ledger/account operations."""
 
-    def list(self) -> list[dict[str, Any]]:
+    def list(self, as_records: bool = False) -> list[dict[str, Any]] | list[MasterRecord]:
         """List all ledgers."""
         result = self._call("ShortList", {
             "new_id": ZERO_GUID,
             "master_type": MasterType.LEDGER,
-        })
+        }, records=MasterRecord if as_records else None)
         return result if isinstance(result, list) else []
 
     def get(self, ledger_id: str) -> dict[str, Any]:
@@ -227,3 +274,10 @@ class LedgersService(BaseService):
             "is_new_mode": True,
             "info": data,
         })
+
+    def update(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Update an existing ledger."""
+        return self._call("SaveUpdate_Ledger", {
+            "is_new_mode": False,
+            "info": data,
+        })
@@ -0,0 +1,45 @@
+"""Outbound notification services: WhatsApp."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from ..dispatch import WhatsAppDispatcher
+from ._base import BaseService
+
+
+class NotificationsService(BaseService):
+    """WhatsApp messaging via the company's configured provider."""
+
+    def send_whatsapp(
+        self,
+        phone: str,
+        message: str,
+        attachments: list[dict[str, Any]] | None = None,
+    ) -> dict[str, Any]:
+        """Send one WhatsApp message (``SendWhatsAppMessage``).
+
+        Args:
+            phone: Recipient number without ``+`` prefix (e.g. ``919XXXXXXXXX``).
+            message: Message text.
+            attachments: Optional attachment entries.
+        """
+        return self._call("SendWhatsAppMessage", {
+            "phone_nos": phone,
+            "message": message,
+            "attachments": attachments or [],
+        })
+
+    def dispatcher(self, path: str = "whatsapp_queue.db", **kwargs: Any) -> WhatsAppDispatcher:
+        """Open a persistent, concurrent WhatsApp queue.
+
+        Args:
+            path: SQLite file holding the queue.
+            **kwargs: Passed to :class:`~alignbooks.dispatch.WhatsAppDispatcher`.
+
+        Example:
+            >>> with ab.notifications.dispatcher("whatsapp.db") as dispatcher:
+            ...     dispatcher.enqueue("919XXXXXXXXX", "Your invoice", doc_id=doc_id, vtype=6)
+            ...     dispatcher.run()
+        """
+        return WhatsAppDispatcher(self._client, path, **kwargs)
@@ -0,0 +1,269 @@
+"""Direct SQL services built on the QueryExecute endpoint."""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Sequence
+
+from .._concurrency import RateLimiter, run_parallel
+from ..exceptions import ValidationError
+from ..sql import Select, chunked, identifier, quote, split_range
+from ..tracing import traced
+from ._base import BaseService
+
+if TYPE_CHECKING:
+    from ..colstore import ColumnStore
+
+logger = logging.getLogger("alignbooks")
+
+
+class QueryService(BaseService):
+    """QueryExecute operations (MySQL on the ab007 database).
+
+    Example:
+        >>> rows = ab.query.select("mst_item", ["id", "name"], is_active=1)
+        >>> names = ab.query.fetch_in("mst_item", "id", item_ids, ["id", "name"])
+        >>> year = ab.query.query_parallel(Select("et_stock").where("vdate", ">=", "2025-04-01"),
+        ...                                partition_by="vdate", shards=12)
+        >>> store = ab.query.spill(Select("et_stock"), "cache/et_stock", key="id")
+    """
+
+    def execute(self, sql: str) -> list[dict[str, Any]]:
+        """Run a raw SQL statement.
+
+        Args:
+            sql: MySQL query text. Remember the company_id filter.
+
+        Returns:
+            List of row dictionaries (empty when the server says "No Result").
+        """
+        result = self._call("QueryExecute", {"query": sql})
+        return result if isinstance(result, list) else []
+
+    def run(self, query: Select) -> list[dict[str, Any]]:
+        """Execute a :class:`~alignbooks.sql.Select` scoped to this client's company."""
+        return self.execute(query.to_sql(self._client.company_id))
+
+    def select(
+        self,
+        table: str,
+        columns: Iterable[str] | str = "*",
+        *,
+        order_by: Iterable[str] = (),
+        limit: int | None = None,
+        **filters: Any,
+    ) -> list[dict[str, Any]]:
+        """Select rows from a company table with equality filters.
+
+        Args:
+            table: Table name (e.g. ``"mst_party"``).
+            columns: Columns to return (default ``*``).
+            order_by: Sort columns.
+            limit: Maximum rows.
+            **filters: ``column=value`` equality predicates.
+
+        Returns:
+            List of row dictionaries.
+        """
+        query = Select(table, columns).where_eq(**filters)
+        if order_by:
+            query.order_by(*order_by)
+        if limit is not None:
+            query.limit(limit)
+        return self.run(query)
+
+    @traced()
+    def fetch_in(
+        self,
+        table: str,
+        column: str,
+        values: Iterable[Any],
+        columns: Iterable[str] | str = "*",
+        *,
+        chunk_size: int = 500,
+        max_workers: int = 4,
+        **filters: Any,
+    ) -> list[dict[str, Any]]:
+        """Fetch rows whose ``column`` is in ``values`` using batched IN-queries.
+
+        Replaces one ``Display_*`` call per id with a few QueryExecute calls. Large
+        lists are split into chunks of ``chunk_size`` that run concurrently.
+
+        Args:
+            table: Table name.
+            column: Column matched against ``values`` (usually ``"id"``).
+            values: Keys to fetch; duplicates are removed.
+            columns: Columns to return (default ``*``).
+            chunk_size: Maximum values per IN list (default 500).
+            max_workers: Maximum concurrent QueryExecute calls (default 4).
+            **filters: Extra ``column=value`` equality predicates.
+
+        Returns:
+            Concatenated rows from all chunks.
+        """
+        unique = list(dict.fromkeys(values))
+        if not unique:
+            return []
+
+        base = Select(table, columns).where_eq(**filters)
+        queries = [base.copy().where_in(column, chunk) for chunk in chunked(unique, chunk_size)]
+        logger.debug("fetch_in %s.%s: %d keys in %d chunks", table, column, len(unique), len(queries))
+
+        rows: list[dict[str, Any]] = []
+        for chunk_rows in run_parallel(self.run, queries, max_workers):
+            rows.extend(chunk_rows)
+        return rows
+
+    def _probe(self, query: Select | str, column: str) -> tuple[Any, Any, int]:
+        stats = f"MIN({column}) AS lo, MAX({column}) AS hi, COUNT(*) AS n"
+        if isinstance(query, Select):
+            probe = query.copy().order_by()
+            probe.columns = (stats,)
+            rows = self.run(probe)
+        else:
+            rows = self.execute(
+                f"SELECT {stats} FROM ({query.replace('{shard}', '1 = 1')}) AS shard_probe"
+            )
+        if not rows:
+            return None, None, 0
+        return rows[0].get("lo"), rows[0].get("hi"), int(rows[0].get("n") or 0)
+
+    @traced()
+    def query_parallel(
+        self,
+        query: Select | str,
+        partition_by: str = "vdate",
+        shards: int = 8,
+        *,
+        order_by: Sequence[str] = (),
+        max_workers: int = 4,
+        rate: float | None = None,
+        min_shard_rows: int = 5_000,
+    ) -> list[dict[str, Any]]:
+        """Run one large query as concurrent range shards and merge the rows.
+
+        A ``MIN``/``MAX``/``COUNT`` probe on ``partition_by`` sizes the shards:
+        dates split by day, numbers evenly, GUIDs by their leading bits. Each
+        shard adds ``partition_by >= lo AND partition_by < hi`` to the query.
+
+        Args:
+            query: A :class:`~alignbooks.sql.Select` (company-scoped as usual),
+                or raw SQL containing a ``{shard}`` placeholder in its WHERE
+                clause, e.g. ``"SELECT * FROM et_stock WHERE company_id = '..'
+                AND {shard}"``. LIMIT/OFFSET are not supported.
+            partition_by: Column to shard on (``"vdate"``, ``"id"``, ...).
+            shards: Maximum shards.
+            order_by: Sort of the merged result (``"col"`` or ``"col DESC"``).
+            max_workers: Maximum concurrent QueryExecute calls.
+            rate: Maximum shard queries started per second (default: unlimited).
+            min_shard_rows: Shards are merged so each covers at least this many
+                rows (by the probe's count), avoiding tiny queries.
+
+        Returns:
+            All rows of the query.
+        """
+        column = identifier(partition_by)
+        if isinstance(query, Select):
+            if query._limit is not None or query._offset is not None:
+                raise ValidationError("query_parallel does not support LIMIT/OFFSET")
+        elif "{shard}" not in query:
+            raise ValidationError("Raw SQL for query_parallel needs a {shard} placeholder")
+
+        lo, hi, count = self._probe(query, column)
+        if count == 0 or lo is None:
+            return []
+        shards = max(1, min(shards, math.ceil(count / max(min_shard_rows, 1))))
+        bounds = split_range(lo, hi, shards)
+
+        def shard_query(i: int) -> Select | str:
+            upper = "<=" if i == len(bounds) - 2 else "<"
+            if isinstance(query, Select):
+                return query.copy().where(column, ">=", bounds[i]).where(column, upper, bounds[i + 1])
+            return query.replace("{shard}", (
+                f"{column} >= {quote(bounds[i])} AND {column} {upper} {quote(bounds[i + 1])}"
+            ))
+
+        limiter = RateLimiter(rate) if rate else None
+
+        def run_shard(i: int) -> list[dict[str, Any]]:
+            if limiter is not None:
+                limiter.wait()
+            shard = shard_query(i)
+            return self.run(shard) if isinstance(shard, Select) else self.execute(shard)
+
+        logger.debug("query_parallel on %s: %d rows in %d shards", column, count, len(bounds) - 1)
+        rows: list[dict[str, Any]] = []
+        for shard_rows in run_parallel(run_shard, range(len(bounds) - 1), max_workers):
+            rows.extend(shard_rows)
+
+        # Stable sorts from the last key to the first give a multi-key ordering.
+        for spec in reversed(tuple(order_by)):
+            name, _, direction = spec.partition(" ")
+            rows.sort(key=lambda r: (r.get(name) is None, r.get(name)),
+                      reverse=direction.upper() == "DESC")
+        return rows
+
+    def query_iter(
+        self,
+        query: Select,
+        page_size: int = 50_000,
+        order_by: Sequence[str] = ("id",),
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Run a :class:`~alignbooks.sql.Select` page by page with LIMIT/OFFSET.
+
+        Args:
+            query: The query (without LIMIT/OFFSET).
+            page_size: Rows per QueryExecute call.
+            order_by: Stable sort used for paging when the query has none.
+
+        Yields:
+            Non-empty pages of rows.
+        """
+        if query._limit is not None or query._offset is not None:
+            raise ValidationError("query_iter does not support LIMIT/OFFSET")
+        offset = 0
+        while True:
+            page = query.copy().limit(page_size).offset(offset)
+            if not page._order_by:
+                page.order_by(*order_by)
+            rows = self.run(page)
+            if rows:
+                yield rows
+            if len(rows) < page_size:
+                return
+            offset += page_size
+
+    @traced()
+    def spill(
+        self,
+        query: Select,
+        path: str,
+        *,
+        key: str | None = "id",
+        page_size: int = 50_000,
+        schema: Sequence[tuple[str, str]] | None = None,
+    ) -> ColumnStore:
+        """Page a large query into a memory-mapped :class:`~alignbooks.colstore.ColumnStore`.
+
+        Only one page is held in memory at a time. Other processes can open
+        the result read-only with ``ColumnStore(path)``.
+
+        Args:
+            query: The query (without LIMIT/OFFSET).
+            path: Dataset directory (replaced when the spill completes).
+            key: Primary-key column to index for :meth:`ColumnStore.get`.
+            page_size: Rows per QueryExecute call.
+            schema: ``(name, kind)`` columns; inferred from the first page if omitted.
+
+        Returns:
+            The opened store.
+        """
+        from ..colstore import ColumnStoreWriter
+
+        with ColumnStoreWriter(path, schema, key=key) as writer:
+            for rows in self.query_iter(query, page_size, order_by=(key or "id",)):
+                writer.write(rows)
+        store = writer.close()
+        logger.debug("Spilled %d rows of %s to %s", len(store), query.table, path)
+        return store
@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
-from typing import Any
+from datetime import date
+from typing import Any, Iterable, Sequence
 
+from ..refresh import BackgroundRefresher
+from ..report_runner import ReportRunner
+from ..tracing import traced
 from ._base import BaseService
 
 
 class ReportsService(BaseService):
     """Report operations."""
 
+    def __init__(self, client):
+        super().__init__(client)
+        self._runners: dict[str, ReportRunner] = {}
+
     def dashboard(self) -> dict[str, Any]:
         """Get dashboard key figures data."""
         return self._call("GetDashboardKeyFiguresDataList")
@@ -17,3 +25,82 @@ class ReportsService(BaseService):
     def dashboard_widgets(self) -> dict[str, Any]:
         """Get dashboard widget data."""
         return self._call("GetDashboardWidgetDataList")
+
+    def dashboard_refresher(
+        self,
+        interval: float = 300,
+        max_concurrent: int = 2,
+        start: bool = True,
+    ) -> BackgroundRefresher:
+        """Keep the dashboard figures and widgets fresh in the background.
+
+        Args:
+            interval: Seconds between refreshes (jittered by +/-10%).
+            max_concurrent: Maximum refreshes in flight at once.
+            start: Start the scheduler thread immediately.
+
+        Returns:
+            A :class:`~alignbooks.refresh.BackgroundRefresher` serving
+            ``"dashboard"`` and ``"widgets"``.
+        """
+        refresher = BackgroundRefresher(max_concurrent=max_concurrent)
+        refresher.register("dashboard", self.dashboard, interval)
+        refresher.register("widgets", self.dashboard_widgets, interval)
+        return refresher.start() if start else refresher
+
+    def get_report_filter(self, body: dict[str, Any]) -> Any:
+        """Get the filter definition of a report (``GetReportFilter``)."""
+        return self._call("GetReportFilter", body)
+
+    def get_report_data(self, body: dict[str, Any]) -> Any:
+        """Run a report and return its data (``GetReportData``)."""
+        return self._call("GetReportData", body)
+
+    def display_custom_report(self, body: dict[str, Any]) -> Any:
+        """Run a saved custom report (``DisplayCustomReport``)."""
+        return self._call("DisplayCustomReport", body)
+
+    @traced()
+    def run_report(
+        self,
+        body: dict[str, Any],
+        from_date: str | date,
+        to_date: str | date,
+        *,
+        endpoint: str = "GetReportData",
+        chunk: str | int = "month",
+        key: str | Sequence[str] | None = None,
+        opening: Iterable[str] | None = None,
+        closing: Iterable[str] | None = None,
+        max_workers: int = 4,
+        **kwargs: Any,
+    ) -> list[dict[str, Any]]:
+        """Run a long-period report as concurrent date-range chunks.
+
+        Completed chunks are cached, so rerunning an overlapping period only
+        fetches the new days. See :class:`~alignbooks.report_runner.ReportRunner`.
+
+        Args:
+            body: Report request body; ``from_date``/``to_date`` are set per chunk.
+            from_date: Period start (YYYY-MM-DD).
+            to_date: Period end (YYYY-MM-DD).
+            endpoint: Report endpoint (default ``GetReportData``).
+            chunk: ``"month"``, ``"week"`` or a number of days.
+            key: Entity key column(s) for balance-style merging.
+            opening: Opening-balance columns (taken from the first chunk).
+            closing: Closing-balance columns (taken from the last chunk).
+            max_workers: Maximum concurrent chunk calls.
+            **kwargs: Passed to :meth:`ReportRunner.run` (``from_key``, ``to_key``).
+
+        Returns:
+            Merged report rows.
+        """
+        # One runner per endpoint, so its chunk cache survives between calls.
+        runner = self._runners.get(endpoint)
+        if runner is None:
+            runner = self._runners[endpoint] = ReportRunner(self._client, endpoint)
+        runner.max_workers = max_workers
+        return runner.run(
+            body, from_date, to_date,
+            chunk=chunk, key=key, opening=opening, closing=closing, **kwargs,
+        )
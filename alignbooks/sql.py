@@ -0,0 +1,279 @@
+"""Safe SQL construction for the QueryExecute endpoint.
+
+QueryExecute runs raw MySQL against the ab007 database, and most tables are
+shared between companies, so every query must carry a ``company_id`` filter.
+:class:`Select` injects that filter, quotes values, and compiles each query
+*shape* (table, columns, predicate layout) to a template only once.
+
+Example:
+    >>> q = Select("mst_item", ["id", "name"]).where("is_active", "=", 1).limit(10)
+    >>> q.to_sql("my-company-id")
+    "SELECT id, name FROM mst_item WHERE company_id = 'my-company-id' AND is_active = 1 LIMIT 10"
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Sequence
+
+from .exceptions import ValidationError
+
+_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+_OPERATORS = frozenset({"=", "!=", "<>", "<", "<=", ">", ">=", "LIKE", "NOT LIKE", "IS", "IS NOT"})
+_ESCAPES = {
+    "\\": "\\\\",
+    "'": "\\'",
+    "\0": "\\0",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\x1a": "\\Z",
+}
+_ESCAPE_RE = re.compile("|".join(re.escape(ch) for ch in _ESCAPES))
+_WS_RE = re.compile(r"\s+")
+
+
+def quote(value: Any) -> str:
+    """Render a Python value as a MySQL literal.
+
+    Raises:
+        ValidationError: For unsupported types or non-finite floats.
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValidationError(f"Cannot quote non-finite float {value!r}")
+        return repr(value)
+    if isinstance(value, datetime):
+        value = value.strftime("%Y-%m-%d %H:%M:%S")
+    elif isinstance(value, date):
+        value = value.strftime("%Y-%m-%d")
+    if isinstance(value, str):
+        return "'" + _ESCAPE_RE.sub(lambda m: _ESCAPES[m.group(0)], value) + "'"
+    raise ValidationError(f"Cannot quote value of type {type(value).__name__}")
+
+
+def identifier(name: str) -> str:
+    """Validate a column/table identifier (``col`` or ``alias.col``)."""
+    if not _IDENT_RE.match(name):
+        raise ValidationError(f"Invalid SQL identifier: {name!r}")
+    return name
+
+
+def normalize(sql: str) -> str:
+    """Collapse whitespace and drop a trailing semicolon."""
+    return _WS_RE.sub(" ", sql).strip().rstrip(";").rstrip()
+
+
+def chunked(values: Sequence[Any], size: int) -> list[Sequence[Any]]:
+    """Split ``values`` into consecutive chunks of at most ``size`` items."""
+    if size < 1:
+        raise ValidationError("chunk size must be >= 1")
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+
+_HEX_PREFIX_RE = re.compile(r"^[0-9A-Fa-f]{8}")
+
+
+def split_range(lo: Any, hi: Any, shards: int) -> list[Any]:
+    """Boundaries splitting ``[lo, hi]`` into at most ``shards`` ranges.
+
+    Shard ``i`` covers ``bounds[i] <= x < bounds[i + 1]``, except the last,
+    which includes ``bounds[-1]``. Numbers split evenly, dates (``YYYY-MM-DD``
+    prefixes) split by day and GUIDs by their leading 32 bits. Other values
+    give a single shard.
+    """
+    if shards <= 1 or lo == hi:
+        return [lo, hi]
+    key: Callable[[Any], Any] = str
+    if isinstance(lo, (int, float)) and isinstance(hi, (int, float)) \
+            and not isinstance(lo, bool) and not isinstance(hi, bool):
+        key = float
+        step = (hi - lo) / shards
+        inner = [lo + step * i for i in range(1, shards)]
+        if isinstance(lo, int) and isinstance(hi, int):
+            inner = [lo + math.ceil((hi - lo) * i / shards) for i in range(1, shards)]
+    elif _as_date(lo) is not None and _as_date(hi) is not None:
+        first, last = _as_date(lo), _as_date(hi)
+        days = (last - first).days
+        inner = [(first + timedelta(days=math.ceil(days * i / shards))).isoformat()
+                 for i in range(1, shards)]
+    elif isinstance(lo, str) and isinstance(hi, str) \
+            and _HEX_PREFIX_RE.match(lo) and _HEX_PREFIX_RE.match(hi):
+        first, last = int(lo[:8], 16), int(hi[:8], 16)
+        # GUIDs compare case-insensitively; emit bounds in the input's case.
+        spec = "08X" if hi[:8].isupper() or lo[:8].isupper() else "08x"
+        inner = [format(first + (last - first) * i // shards, spec) for i in range(1, shards)]
+        key = str.lower
+    else:
+        return [lo, hi]
+    bounds = [lo]
+    for value in inner:
+        if key(bounds[-1]) < key(value) < key(hi):
+            bounds.append(value)
+    bounds.append(hi)
+    return bounds
+
+
+def _as_date(value: Any) -> date | None:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and len(value) >= 10:
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    return None
+
+
+@lru_cache(maxsize=256)
+def _compile(
+    table: str,
+    columns: tuple[str, ...],
+    predicates: tuple[tuple[str, str], ...],
+    order_by: tuple[str, ...],
+    has_limit: bool,
+    has_offset: bool = False,
+) -> str:
+    """Build the statement template for one query shape.
+
+    ``predicates`` holds ``(column, operator)`` pairs; ``IN`` predicates expand
+    their value list at render time, so the template is independent of list size.
+    """
+    select_list = ", ".join(columns).replace("{", "{{").replace("}", "}}")
+    sql = f"SELECT {select_list} FROM {table}"
+    if predicates:
+        sql += " WHERE " + " AND ".join(f"{col} {op} {{}}" for col, op in predicates)
+    if order_by:
+        sql += " ORDER BY " + ", ".join(order_by)
+    if has_limit:
+        sql += " LIMIT {}"
+    if has_offset:
+        sql += " OFFSET {}"
+    return normalize(sql)
+
+
+def template_cache_info():
+    """Hit/miss statistics of the compiled-shape cache."""
+    return _compile.cache_info()
+
+
+class Select:
+    """Minimal SELECT builder with automatic ``company_id`` scoping.
+
+    Args:
+        table: Table name (e.g. ``"mst_item"``).
+        columns: Column expressions (default ``*``). These are trusted SQL.
+        company_scoped: Prepend ``company_id = <company>`` (default True). Disable
+            for global tables such as ``information_schema.tables``.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        columns: Iterable[str] | str = "*",
+        *,
+        company_scoped: bool = True,
+    ):
+        self.table = identifier(table)
+        self.columns = (columns,) if isinstance(columns, str) else tuple(columns)
+        self.company_scoped = company_scoped
+        self._predicates: list[tuple[str, str, Any]] = []
+        self._order_by: tuple[str, ...] = ()
+        self._limit: int | None = None
+        self._offset: int | None = None
+
+    def where(self, column: str, op: str, value: Any) -> Select:
+        """Add an ``AND column op value`` predicate."""
+        op = op.upper()
+        if op not in _OPERATORS:
+            raise ValidationError(f"Unsupported operator: {op!r}")
+        self._predicates.append((identifier(column), op, value))
+        return self
+
+    def where_eq(self, **filters: Any) -> Select:
+        """Add equality predicates from keyword arguments."""
+        for column, value in filters.items():
+            self.where(column, "=", value)
+        return self
+
+    def where_in(self, column: str, values: Iterable[Any]) -> Select:
+        """Add an ``AND column IN (...)`` predicate."""
+        values = tuple(values)
+        if not values:
+            raise ValidationError(f"Empty IN list for column {column!r}")
+        self._predicates.append((identifier(column), "IN", values))
+        return self
+
+    def order_by(self, *columns: str) -> Select:
+        """Set ``ORDER BY`` (append ``" DESC"`` to a column for descending)."""
+        for col in columns:
+            name, _, direction = col.partition(" ")
+            identifier(name)
+            if direction and direction.upper() not in ("ASC", "DESC"):
+                raise ValidationError(f"Invalid sort direction in {col!r}")
+        self._order_by = tuple(columns)
+        return self
+
+    def limit(self, n: int) -> Select:
+        """Set ``LIMIT``."""
+        self._limit = int(n)
+        return self
+
+    def offset(self, n: int) -> Select:
+        """Set ``OFFSET`` (requires :meth:`limit`)."""
+        self._offset = int(n)
+        return self
+
+    def copy(self) -> Select:
+        """Return an independent copy of this builder."""
+        other = Select(self.table, self.columns, company_scoped=self.company_scoped)
+        other._predicates = list(self._predicates)
+        other._order_by = self._order_by
+        other._limit = self._limit
+        other._offset = self._offset
+        return other
+
+    def to_sql(self, company_id: str | None = None) -> str:
+        """Render the final SQL text.
+
+        Raises:
+            ValidationError: If the query is company-scoped and no company_id is given.
+        """
+        predicates = list(self._predicates)
+        if self.company_scoped:
+            if not company_id:
+                raise ValidationError(f"company_id is required for table {self.table!r}")
+            predicates.insert(0, ("company_id", "=", company_id))
+
+        template = _compile(
+            self.table,
+            self.columns,
+            tuple((col, op) for col, op, _ in predicates),
+            self._order_by,
+            self._limit is not None,
+            self._offset is not None,
+        )
+        args = [
+            "(" + ", ".join(quote(v) for v in value) + ")" if op == "IN" else quote(value)
+            for _, op, value in predicates
+        ]
+        if self._limit is not None:
+            args.append(str(self._limit))
+        if self._offset is not None:
+            if self._limit is None:
+                raise ValidationError("OFFSET requires LIMIT")
+            args.append(str(self._offset))
+        return template.format(*args)
+
+    def __repr__(self) -> str:
+        return f"Select({self.table!r}, {list(self.columns)!r})"
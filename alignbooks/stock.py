@@ -0,0 +1,225 @@
+"""Column-backed stock snapshots with cheap poll-to-poll deltas.
+
+``GetItemBalanceForList`` returns the full ``{item_id, balance}`` list for a
+warehouse (~2,000 rows). :class:`StockSnapshot` keeps one shared
+``item_id -> position`` index and a ``float64`` array of balances per warehouse,
+so diffing two polls is a single pass over two flat arrays rather than a
+dict-of-dicts comparison.
+
+Example:
+    >>> snap = ab.inventory.stock_snapshot([WAREHOUSE_GEN, WAREHOUSE_SHOP])
+    >>> deltas = snap.refresh()                       # later poll
+    >>> for item_id, old, new in deltas[WAREHOUSE_GEN].changed:
+    ...     print(item_id, old, "->", new)
+    >>> snap.totals()
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from array import array
+from typing import TYPE_CHECKING, Any, Iterable
+
+from ._concurrency import run_parallel
+from .constants import ZERO_GUID
+
+if TYPE_CHECKING:
+    from .services.inventory import InventoryService
+
+logger = logging.getLogger("alignbooks")
+
+
+class StockDelta:
+    """Changes in one warehouse between two polls.
+
+    Attributes:
+        warehouse_id: Warehouse the delta belongs to.
+        changed: ``(item_id, old_balance, new_balance)`` for every changed item.
+        new_negatives: ``(item_id, balance)`` for items that dropped below zero.
+        total_before: Warehouse balance total before the update.
+        total_after: Warehouse balance total after the update.
+    """
+
+    __slots__ = ("warehouse_id", "changed", "new_negatives", "total_before", "total_after")
+
+    def __init__(self, warehouse_id: str, changed, new_negatives, total_before, total_after):
+        self.warehouse_id = warehouse_id
+        self.changed: list[tuple[str, float, float]] = changed
+        self.new_negatives: list[tuple[str, float]] = new_negatives
+        self.total_before: float = total_before
+        self.total_after: float = total_after
+
+    def __bool__(self) -> bool:
+        return bool(self.changed)
+
+    def __repr__(self) -> str:
+        return (
+            f"StockDelta({self.warehouse_id!r}, changed={len(self.changed)}, "
+            f"new_negatives={len(self.new_negatives)}, total={self.total_after:g})"
+        )
+
+
+class StockSnapshot:
+    """Latest item balances for a set of warehouses.
+
+    Args:
+        warehouse_ids: Warehouses to track.
+        service: InventoryService used by :meth:`refresh` (optional when rows
+            are fed manually through :meth:`update`).
+        branch_id: Branch filter for ``GetItemBalanceForList``.
+        tolerance: Absolute difference below which balances count as unchanged.
+    """
+
+    def __init__(
+        self,
+        warehouse_ids: Iterable[str],
+        service: InventoryService | None = None,
+        branch_id: str = ZERO_GUID,
+        tolerance: float = 1e-9,
+    ):
+        self.warehouse_ids = list(warehouse_ids)
+        self.branch_id = branch_id
+        self.tolerance = tolerance
+        self._service = service
+
+        self.item_ids: list[str] = []
+        self._index: dict[str, int] = {}
+        self._balances: dict[str, array] = {wh: array("d") for wh in self.warehouse_ids}
+        self.refreshed_at: float | None = None
+
+    # --- polling ---
+
+    def refresh(
+        self,
+        moved_from: str | None = None,
+        moved_to: str | None = None,
+        max_workers: int = 4,
+    ) -> dict[str, StockDelta]:
+        """Poll the server and apply the new balances.
+
+        With ``moved_from``/``moved_to`` set, ``GetMovedOnlyStock`` is tried first
+        and only the moved items are updated. If those rows carry no balances
+        (or, with several warehouses, no ``warehouse_id``), this falls back to
+        a full poll.
+
+        Returns:
+            Mapping of warehouse ID to its :class:`StockDelta`.
+        """
+        if self._service is None:
+            raise RuntimeError("StockSnapshot has no InventoryService to refresh from")
+
+        if moved_from is not None:
+            deltas = self._refresh_moved(moved_from, moved_to or moved_from)
+            if deltas is not None:
+                return deltas
+
+        polls = run_parallel(
+            lambda wh: self._service.item_balances(wh, self.branch_id),
+            self.warehouse_ids,
+            max_workers,
+        )
+        return {wh: self.update(wh, rows) for wh, rows in zip(self.warehouse_ids, polls)}
+
+    def _refresh_moved(self, from_date: str, to_date: str) -> dict[str, StockDelta] | None:
+        rows = self._service.moved_stock(from_date, to_date)
+        per_warehouse: dict[str, list[dict[str, Any]]] = {wh: [] for wh in self.warehouse_ids}
+        single = self.warehouse_ids[0] if len(self.warehouse_ids) == 1 else None
+        for row in rows:
+            if row.get("item_id") is None or not isinstance(row.get("balance"), (int, float)):
+                logger.info("GetMovedOnlyStock rows carry no balances; doing a full poll")
+                return None
+            wh = row.get("warehouse_id") or single
+            if wh is None:
+                logger.info("GetMovedOnlyStock rows carry no warehouse_id; doing a full poll")
+                return None
+            if wh in per_warehouse:
+                per_warehouse[wh].append(row)
+        return {wh: self.update(wh, wh_rows, partial=True) for wh, wh_rows in per_warehouse.items()}
+
+    # --- applying data ---
+
+    def update(
+        self,
+        warehouse_id: str,
+        rows: Iterable[Any],
+        *,
+        partial: bool = False,
+    ) -> StockDelta:
+        """Apply ``{item_id, balance}`` rows for one warehouse and diff them.
+
+        Args:
+            warehouse_id: Warehouse the rows belong to.
+            rows: Balance rows (dicts or records).
+            partial: If False (full poll), items absent from ``rows`` are set to 0.
+
+        Returns:
+            The :class:`StockDelta` against the previous state.
+        """
+        old = self._balances.setdefault(warehouse_id, array("d"))
+        if warehouse_id not in self.warehouse_ids:
+            self.warehouse_ids.append(warehouse_id)
+
+        new = array("d", old) if partial else array("d", bytes(8 * len(self.item_ids)))
+        for row in rows:
+            pos = self._position(row["item_id"])
+            if pos >= len(new):
+                new.extend([0.0] * (pos + 1 - len(new)))
+            new[pos] = float(row["balance"] or 0.0)
+
+        # New items may have grown the index; pad every column to the same length.
+        size = len(self.item_ids)
+        for column in (new, *self._balances.values()):
+            if len(column) < size:
+                column.extend([0.0] * (size - len(column)))
+
+        tol = self.tolerance
+        ids = self.item_ids
+        changed = [
+            (ids[i], a, b) for i, (a, b) in enumerate(zip(old, new)) if abs(a - b) > tol
+        ]
+        new_negatives = [(item_id, b) for item_id, a, b in changed if b < 0 <= a]
+        delta = StockDelta(warehouse_id, changed, new_negatives, sum(old), sum(new))
+
+        self._balances[warehouse_id] = new
+        self.refreshed_at = time.time()
+        return delta
+
+    def _position(self, item_id: str) -> int:
+        pos = self._index.get(item_id)
+        if pos is None:
+            pos = self._index[item_id] = len(self.item_ids)
+            self.item_ids.append(item_id)
+        return pos
+
+    # --- queries ---
+
+    def balance(self, item_id: str, warehouse_id: str | None = None) -> float:
+        """Balance of one item in a warehouse, or summed over all warehouses."""
+        pos = self._index.get(item_id)
+        if pos is None:
+            return 0.0
+        columns = [self._balances[warehouse_id]] if warehouse_id else self._balances.values()
+        return sum(col[pos] for col in columns if pos < len(col))
+
+    def totals(self) -> dict[str, float]:
+        """Total balance per warehouse."""
+        return {wh: sum(col) for wh, col in self._balances.items()}
+
+    def negatives(self, warehouse_id: str | None = None) -> list[tuple[str, str, float]]:
+        """``(item_id, warehouse_id, balance)`` for every negative balance."""
+        targets = [warehouse_id] if warehouse_id else list(self._balances)
+        ids = self.item_ids
+        return [
+            (ids[i], wh, bal)
+            for wh in targets
+            for i, bal in enumerate(self._balances[wh])
+            if bal < 0
+        ]
+
+    def to_dict(self, warehouse_id: str) -> dict[str, float]:
+        """Plain ``item_id -> balance`` mapping for one warehouse."""
+        return dict(zip(self.item_ids, self._balances[warehouse_id]))
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
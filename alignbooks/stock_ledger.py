@@ -0,0 +1,345 @@
+"""Local stock ledger rebuilt from ``et_stock`` rows.
+
+Stock reports via ``GetReportFilter`` are blocked (see endpoint_status.json), so
+balances are rebuilt from ``et_stock`` through QueryExecute. :class:`StockLedger`
+ingests those rows incrementally and keeps, per (item, warehouse, batch), the
+movement dates with a running prefix sum. "Balance as of date X" is then a
+binary search instead of a rescan of the full history.
+
+``et_stock`` has no modification marker, so :meth:`StockLedger.sync` re-reads a
+trailing window of days (``resync_days``) before the watermark and replaces
+those rows by ID: back-dated, edited and deleted rows inside the window are
+picked up. Changes dated before the window are not seen; run
+``sync(..., full=True)`` periodically (e.g. after a period is reopened) to
+rebuild from scratch.
+
+Example:
+    >>> ledger = StockLedger.load("stock_ledger.json.gz")   # or StockLedger()
+    >>> ledger.sync(ab.query)                                 # recent rows only
+    >>> ledger.balance_as_of("2025-12-31", item_id="...", warehouse_id="...")
+    >>> ledger.save("stock_ledger.json.gz")
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+from bisect import bisect_right, insort
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping
+
+from .sql import Select
+
+if TYPE_CHECKING:
+    from .services.query import QueryService
+
+logger = logging.getLogger("alignbooks")
+
+Key = tuple  # (item_id, warehouse_id, batch_id)
+Movement = tuple  # (key, day, qty) applied for one row ID
+
+
+def _day(value: Any) -> str:
+    """Normalize a vdate value to ``YYYY-MM-DD``."""
+    return str(value)[:10]
+
+
+class _Series:
+    """Dated movements of one key with cumulative balances."""
+
+    __slots__ = ("dates", "cum")
+
+    def __init__(self):
+        self.dates: list[str] = []
+        self.cum: list[float] = []
+
+    def add(self, day: str, qty: float) -> None:
+        dates, cum = self.dates, self.cum
+        if not dates or day > dates[-1]:
+            dates.append(day)
+            cum.append((cum[-1] if cum else 0.0) + qty)
+        elif day == dates[-1]:
+            cum[-1] += qty
+        else:
+            # Back-dated movement: insert and shift the later prefix sums.
+            pos = bisect_right(dates, day)
+            if pos and dates[pos - 1] == day:
+                start = pos - 1
+            else:
+                insort(dates, day)
+                cum.insert(pos, cum[pos - 1] if pos else 0.0)
+                start = pos
+            for i in range(start, len(cum)):
+                cum[i] += qty
+
+    def as_of(self, day: str) -> float:
+        pos = bisect_right(self.dates, day)
+        return self.cum[pos - 1] if pos else 0.0
+
+    @property
+    def balance(self) -> float:
+        return self.cum[-1] if self.cum else 0.0
+
+
+class StockLedger:
+    """Running stock balances per (item, warehouse, batch) with as-of queries.
+
+    Args:
+        item_field: Row field holding the item ID (default ``item_id``).
+        warehouse_field: Row field holding the warehouse ID (default ``warehouse_id``).
+        batch_field: Row field holding the batch ID (default ``batch_id``; missing
+            values are treated as no batch).
+        date_field: Row field holding the voucher date (default ``vdate``).
+        quantity: Signed quantity field name, or a callable ``row -> float``
+            (default ``qty``).
+        id_field: Unique row ID; rows in the resync window are replaced by ID
+            (synced rows without one would be counted again on every sync).
+        resync_days: Days before the watermark that :meth:`sync` re-reads to
+            pick up back-dated, edited and deleted rows.
+    """
+
+    def __init__(
+        self,
+        item_field: str = "item_id",
+        warehouse_field: str = "warehouse_id",
+        batch_field: str = "batch_id",
+        date_field: str = "vdate",
+        quantity: str | Callable[[Mapping[str, Any]], float] = "qty",
+        id_field: str = "id",
+        resync_days: int = 7,
+    ):
+        self.item_field = item_field
+        self.warehouse_field = warehouse_field
+        self.batch_field = batch_field
+        self.date_field = date_field
+        self.quantity = quantity
+        self.id_field = id_field
+        self.resync_days = resync_days
+        self._reset()
+
+    def _reset(self) -> None:
+        self._series: dict[Key, _Series] = {}
+        self._by_item: dict[str, list[Key]] = {}
+        self.checkpoints: dict[str, dict[Key, float]] = {}
+        self.watermark: str = ""
+        # Movements of rows dated on/after _tracked_from, by row ID, so that
+        # re-read rows replace (rather than add to) what was applied before.
+        self._movements: dict[Any, Movement] = {}
+        self._tracked_from = ""
+        self.rows_ingested = 0
+
+    # --- ingestion ---
+
+    def ingest(self, rows: Iterable[Mapping[str, Any]]) -> int:
+        """Apply et_stock rows.
+
+        A row whose ID was already applied (and is still tracked) replaces the
+        earlier movement; an unchanged row is skipped.
+
+        Returns:
+            Number of rows applied.
+        """
+        qty_of = self.quantity if callable(self.quantity) else None
+        qty_field = self.quantity if qty_of is None else None
+        applied = 0
+
+        for row in rows:
+            day = _day(row[self.date_field])
+            row_id = row.get(self.id_field)
+            key = (
+                row[self.item_field],
+                row.get(self.warehouse_field) or "",
+                row.get(self.batch_field) or "",
+            )
+            qty = float((qty_of(row) if qty_of is not None else row.get(qty_field)) or 0.0)
+            if row_id is not None and day >= self._tracked_from:
+                previous = self._movements.get(row_id)
+                if previous == (key, day, qty):
+                    continue
+                if previous is not None:
+                    self._apply(previous, -1)
+                self._movements[row_id] = (key, day, qty)
+
+            if day > self.watermark:
+                self._roll_watermark(day)
+            self._apply((key, day, qty))
+            applied += 1
+
+        self.rows_ingested += applied
+        return applied
+
+    def _apply(self, movement: Movement, sign: int = 1) -> None:
+        key, day, qty = movement
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+            self._by_item.setdefault(key[0], []).append(key)
+        series.add(day, sign * qty)
+
+    def _roll_watermark(self, day: str) -> None:
+        # Take a month-end checkpoint whenever ingestion crosses into a new month.
+        if self.watermark and day[:7] != self.watermark[:7]:
+            self.checkpoints[self.watermark[:7]] = self.balances_as_of(self.watermark)
+        self.watermark = day
+
+    def _resync_from(self) -> str:
+        if not self.watermark:
+            return ""
+        start = (date.fromisoformat(self.watermark) - timedelta(days=self.resync_days)).isoformat()
+        return max(start, self._tracked_from)
+
+    def _untrack_before(self, day: str) -> None:
+        if day <= self._tracked_from:
+            return
+        self._movements = {i: m for i, m in self._movements.items() if m[1] >= day}
+        self._tracked_from = day
+
+    def sync(
+        self,
+        query: QueryService,
+        table: str = "et_stock",
+        columns: Iterable[str] | str = "*",
+        page_size: int = 50_000,
+        full: bool = False,
+    ) -> int:
+        """Fetch and apply rows dated on/after the resync window via QueryExecute.
+
+        Rows re-read from the window replace their earlier movements by ID, and
+        tracked rows of the window that are no longer returned are removed.
+        Month-end checkpoints from the window onwards are recomputed.
+
+        Args:
+            query: The client's :class:`~alignbooks.services.query.QueryService`.
+            table: Source table (default ``et_stock``).
+            columns: Columns to select (must include the configured fields).
+            page_size: Rows per QueryExecute call.
+            full: Discard all balances and rebuild from the whole table.
+
+        Returns:
+            Number of rows applied (new or changed).
+        """
+        if full:
+            self._reset()
+        applied = 0
+        offset = 0
+        since = self._resync_from()
+        missing = {i: m for i, m in self._movements.items() if m[1] >= since}
+        while True:
+            select = Select(table, columns)
+            if since:
+                select.where(self.date_field, ">=", since)
+            select.order_by(self.date_field, self.id_field).limit(page_size).offset(offset)
+            rows = query.run(select)
+            for row in rows:
+                missing.pop(row.get(self.id_field), None)
+            applied += self.ingest(rows)
+            self._untrack_before(self._resync_from())
+            if len(rows) < page_size:
+                break
+            offset += page_size
+
+        removed = 0
+        for row_id, movement in missing.items():
+            self._apply(movement, -1)
+            self._movements.pop(row_id, None)
+            removed += 1
+        for month in self.checkpoints:
+            if month >= since[:7]:
+                self.checkpoints[month] = self.balances_as_of(f"{month}-31")
+        logger.info(
+            "Stock ledger sync: %d rows applied, %d removed, watermark %s",
+            applied, removed, self.watermark,
+        )
+        return applied
+
+    # --- queries ---
+
+    def _keys(self, item_id: str | None, warehouse_id: str | None, batch_id: str | None):
+        keys = self._by_item.get(item_id, []) if item_id is not None else self._series.keys()
+        for key in keys:
+            if warehouse_id is not None and key[1] != warehouse_id:
+                continue
+            if batch_id is not None and key[2] != batch_id:
+                continue
+            yield key
+
+    def balance(
+        self,
+        item_id: str,
+        warehouse_id: str | None = None,
+        batch_id: str | None = None,
+    ) -> float:
+        """Current balance, summed over any unspecified warehouse/batch."""
+        return sum(self._series[k].balance for k in self._keys(item_id, warehouse_id, batch_id))
+
+    def balance_as_of(
+        self,
+        day: str,
+        item_id: str,
+        warehouse_id: str | None = None,
+        batch_id: str | None = None,
+    ) -> float:
+        """Balance at the end of ``day`` (YYYY-MM-DD) in O(log n) per key."""
+        day = _day(day)
+        return sum(self._series[k].as_of(day) for k in self._keys(item_id, warehouse_id, batch_id))
+
+    def balances_as_of(self, day: str) -> dict[Key, float]:
+        """Balances of every (item, warehouse, batch) key at the end of ``day``."""
+        day = _day(day)
+        return {key: series.as_of(day) for key, series in self._series.items()}
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    # --- persistence ---
+
+    def compact(self, before: str) -> None:
+        """Fold movements dated on/before ``before`` into one opening entry per key.
+
+        Rows dated on/before ``before`` can no longer be replaced by a sync.
+        """
+        before = _day(before)
+        self._untrack_before((date.fromisoformat(before) + timedelta(days=1)).isoformat())
+        for series in self._series.values():
+            pos = bisect_right(series.dates, before)
+            if pos > 1:
+                series.dates[:pos] = [series.dates[pos - 1]]
+                series.cum[:pos] = [series.cum[pos - 1]]
+
+    def save(self, path: str) -> None:
+        """Write the ledger to a gzip-compressed JSON file."""
+        state = {
+            "watermark": self.watermark,
+            "tracked_from": self._tracked_from,
+            "movements": [[i, list(k), d, q] for i, (k, d, q) in self._movements.items()],
+            "rows_ingested": self.rows_ingested,
+            "series": [[list(key), s.dates, s.cum] for key, s in self._series.items()],
+            "checkpoints": {
+                month: [[list(key), bal] for key, bal in balances.items()]
+                for month, balances in self.checkpoints.items()
+            },
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as fh:
+            json.dump(state, fh, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str, **kwargs: Any) -> StockLedger:
+        """Restore a ledger written by :meth:`save` (kwargs configure field names)."""
+        ledger = cls(**kwargs)
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            state = json.load(fh)
+        ledger.watermark = state["watermark"]
+        ledger._tracked_from = state["tracked_from"]
+        ledger._movements = {i: (tuple(k), d, q) for i, k, d, q in state["movements"]}
+        ledger.rows_ingested = state["rows_ingested"]
+        for key, dates, cum in state["series"]:
+            key = tuple(key)
+            series = ledger._series[key] = _Series()
+            series.dates, series.cum = dates, cum
+            ledger._by_item.setdefault(key[0], []).append(key)
+        ledger.checkpoints = {
+            month: {tuple(key): bal for key, bal in entries}
+            for month, entries in state["checkpoints"].items()
+        }
+        return ledger
@@ -0,0 +1,222 @@
+"""Opt-in per-call tracing with Chrome trace and OpenTelemetry export.
+
+Attach a :class:`Tracer` to the client to record a span tree for every call::
+
+    service method (e.g. bulk_upsert, run_report)
+      api_call
+        token             ab_token build (PBKDF2 + AES)
+        http.ttfb         connect + request + server time until headers
+        http.download     response body transfer
+        parse.envelope    ReturnCode envelope JSON
+        parse.table       JsonDataTable decode
+
+Gaps between a service span and its ``api_call`` children are the service's
+own post-processing. Spans are linked through a context variable, so work
+fanned out with the SDK's thread pools nests under the span that started it.
+
+Example:
+    >>> ab = AlignBooks(..., tracer=Tracer())
+    >>> ab.items.bulk_upsert(feed)
+    >>> ab.tracer.save_chrome_trace("sync.trace.json")   # open in chrome://tracing
+    >>> ab.tracer.summary()["http.ttfb"]
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Iterator
+
+_current: contextvars.ContextVar[tuple[Tracer, Span] | None] = contextvars.ContextVar(
+    "alignbooks_span", default=None
+)
+_NOOP = nullcontext()
+_ids = itertools.count(1)
+
+
+class Span:
+    """One timed operation. Times are ``time.perf_counter_ns()`` values."""
+
+    __slots__ = ("name", "span_id", "parent_id", "start", "end", "thread_id", "attrs")
+
+    def __init__(self, name: str, parent_id: int | None, attrs: dict[str, Any]):
+        self.name = name
+        self.span_id = next(_ids)
+        self.parent_id = parent_id
+        self.start = time.perf_counter_ns()
+        self.end = 0
+        self.thread_id = threading.get_ident()
+        self.attrs = attrs
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds."""
+        return (self.end - self.start) / 1e9
+
+    def set(self, **attrs: Any) -> None:
+        """Add attributes to the span."""
+        self.attrs.update(attrs)
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, {self.duration * 1000:.2f} ms)"
+
+
+class Tracer:
+    """Collects spans for calls made while it is attached to a client.
+
+    Args:
+        max_spans: Spans kept in memory; the oldest are dropped beyond this.
+    """
+
+    def __init__(self, max_spans: int = 100_000):
+        self.max_spans = max_spans
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+        # Anchor perf_counter to wall-clock time for exporters that need epoch times.
+        self._epoch_offset_ns = time.time_ns() - time.perf_counter_ns()
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Span]:
+        """Record a span around the ``with`` block, nested under the current span."""
+        parent = _current.get()
+        span = Span(name, parent[1].span_id if parent is not None else None, attrs)
+        token = _current.set((self, span))
+        try:
+            yield span
+        except BaseException as exc:
+            span.attrs["error"] = type(exc).__name__
+            raise
+        finally:
+            span.end = time.perf_counter_ns()
+            _current.reset(token)
+            with self._lock:
+                self.spans.append(span)
+                if len(self.spans) > self.max_spans:
+                    del self.spans[: len(self.spans) - self.max_spans]
+
+    def clear(self) -> None:
+        """Drop all recorded spans."""
+        with self._lock:
+            self.spans.clear()
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Count, total and mean seconds per span name."""
+        out: dict[str, dict[str, float]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            entry = out.setdefault(span.name, {"count": 0, "total": 0.0})
+            entry["count"] += 1
+            entry["total"] += span.duration
+        for entry in out.values():
+            entry["mean"] = entry["total"] / entry["count"]
+        return out
+
+    # --- export ---
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Spans as Chrome trace-event JSON (``chrome://tracing`` / Perfetto)."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events = [
+            {
+                "name": s.name,
+                "cat": "alignbooks",
+                "ph": "X",
+                "ts": s.start / 1000,
+                "dur": (s.end - s.start) / 1000,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": {**s.attrs, "span_id": s.span_id, "parent_id": s.parent_id},
+            }
+            for s in spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path: str) -> None:
+        """Write :meth:`to_chrome_trace` to ``path``."""
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.to_chrome_trace(), fh, default=str)
+
+    def export_otel(self, tracer_provider: Any = None) -> int:
+        """Replay the recorded spans into OpenTelemetry (``opentelemetry-api``).
+
+        Args:
+            tracer_provider: Provider to use (default: the global provider).
+
+        Returns:
+            Number of spans exported.
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError as exc:
+            raise ImportError(
+                "OpenTelemetry export requires opentelemetry-api: pip install opentelemetry-api"
+            ) from exc
+
+        otel = trace.get_tracer("alignbooks", tracer_provider=tracer_provider)
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        exported: dict[int, Any] = {}
+        for s in spans:
+            parent = exported.get(s.parent_id)
+            ctx = trace.set_span_in_context(parent) if parent is not None else None
+            attrs = {k: v if isinstance(v, (str, bool, int, float)) else str(v)
+                     for k, v in s.attrs.items()}
+            otel_span = otel.start_span(
+                s.name, context=ctx, attributes=attrs,
+                start_time=s.start + self._epoch_offset_ns,
+            )
+            otel_span.end(end_time=s.end + self._epoch_offset_ns)
+            exported[s.span_id] = otel_span
+        return len(exported)
+
+
+def span(name: str, **attrs: Any):
+    """Child span under the active tracer, or a no-op when tracing is off."""
+    current = _current.get()
+    if current is None:
+        return _NOOP
+    return current[0].span(name, **attrs)
+
+
+def annotate(**attrs: Any) -> None:
+    """Add attributes to the current span, if any."""
+    current = _current.get()
+    if current is not None:
+        current[1].attrs.update(attrs)
+
+
+def active() -> bool:
+    """True if a traced operation is in progress in this context."""
+    return _current.get() is not None
+
+
+def traced(name: str | None = None) -> Callable:
+    """Decorate a service method so it becomes the parent span of its API calls.
+
+    The tracer is taken from ``self._client.tracer``; without one, the method
+    runs untouched.
+    """
+
+    def decorate(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            tracer = getattr(self._client, "tracer", None)
+            if tracer is None:
+                return fn(self, *args, **kwargs)
+            with tracer.span(span_name):
+                return fn(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
@@ -0,0 +1,312 @@
+"""Pluggable HTTP transports, including record-and-replay for offline runs.
+
+:class:`~alignbooks.client.AlignBooksClient` sends every request through a
+transport's ``post(url, headers=..., data=..., timeout=...)`` with the body
+already encoded as JSON bytes. The default :class:`RequestsTransport` wraps the
+client's ``requests.Session``.
+
+:class:`RecordingTransport` wraps another transport and captures each exchange
+(request body, response text, status and latency) into a gzip-compressed JSONL
+cassette. :class:`ReplayTransport` serves a cassette without network access,
+sleeping for the recorded (optionally scaled) latency, so full sync jobs can be
+profiled locally and repeatably.
+
+Exchanges are matched on the URL path and canonical request body. The
+``ab_token`` header is ignored because it is re-randomized for every call.
+Credentials (:data:`REDACTED_KEYS`, e.g. the ``LoginUser`` password) are masked
+in recorded bodies and responses and ignored when matching.
+
+Example:
+    >>> with RecordingTransport(RequestsTransport(), "sync.jsonl.gz") as rec:
+    ...     ab = AlignBooks(..., transport=rec)
+    ...     run_sync(ab)
+    >>> ab = AlignBooks(..., transport=ReplayTransport("sync.jsonl.gz", latency_scale=0))
+    >>> run_sync(ab)                                   # offline, deterministic
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Iterable, Mapping, Protocol
+from urllib.parse import urlsplit
+
+import requests
+
+from . import tracing
+from ._json import loads
+from .exceptions import ReplayMissError
+
+logger = logging.getLogger("alignbooks")
+
+
+class Transport(Protocol):
+    """Interface the client uses to send a request.
+
+    The returned object must provide ``status_code``, ``text`` and
+    ``raise_for_status()`` (a ``requests.Response`` qualifies).
+    """
+
+    def post(
+        self, url: str, *, headers: Mapping[str, str], data: bytes, timeout: Any
+    ) -> Any: ...
+
+    def close(self) -> None: ...
+
+
+class RequestsTransport:
+    """Send requests with a ``requests.Session``.
+
+    Args:
+        session: Session to use (default: a new one, closed by :meth:`close`).
+    """
+
+    def __init__(self, session: requests.Session | None = None):
+        self._owns_session = session is None
+        self.session = session if session is not None else requests.Session()
+
+    def post(self, url: str, *, headers: Mapping[str, str], data: bytes, timeout: Any):
+        if not tracing.active():
+            return self.session.post(url, headers=headers, data=data, timeout=timeout)
+        # Traced: stream so time-to-first-byte and body download are timed separately.
+        with tracing.span("http.ttfb", bytes_out=len(data)) as sp:
+            resp = self.session.post(url, headers=headers, data=data, timeout=timeout, stream=True)
+            sp.set(status=resp.status_code)
+        with tracing.span("http.download") as sp:
+            sp.set(bytes_in=len(resp.content))
+        return resp
+
+    def close(self) -> None:
+        if self._owns_session:
+            self.session.close()
+
+
+class RecordedResponse:
+    """Minimal response served by :class:`ReplayTransport`."""
+
+    __slots__ = ("url", "status_code", "text", "elapsed")
+
+    def __init__(self, url: str, status_code: int, text: str, elapsed: float):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.elapsed = elapsed
+
+    @property
+    def content(self) -> bytes:
+        return self.text.encode("utf-8")
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+# Keys whose values never reach a cassette.
+REDACTED_KEYS = frozenset({
+    "password", "login_id", "apikey", "api_key", "ab_token", "token", "session_id",
+})
+REDACTED = "***"
+
+
+def redact(value: Any, keys: frozenset[str] = REDACTED_KEYS) -> Any:
+    """Copy of a decoded JSON value with the values of ``keys`` masked."""
+    if isinstance(value, dict):
+        return {k: REDACTED if k.lower() in keys else redact(v, keys) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v, keys) for v in value]
+    return value
+
+
+def _redact_text(text: str, keys: frozenset[str]) -> str:
+    """Mask ``keys`` in a JSON response envelope and its embedded JsonDataTable.
+
+    Responses without any such key are returned verbatim.
+    """
+    try:
+        data = json.loads(text.lstrip("\ufeff"))
+    except ValueError:
+        return text
+    masked = redact(data, keys)
+    table = masked.get("JsonDataTable") if isinstance(masked, dict) else None
+    if isinstance(table, str):
+        try:
+            rows = json.loads(table)
+        except ValueError:
+            pass
+        else:
+            clean = redact(rows, keys)
+            if clean != rows:
+                masked["JsonDataTable"] = json.dumps(clean)
+    return text if masked == data else json.dumps(masked)
+
+
+def _match_key(url: str, body: Any, keys: frozenset[str] = REDACTED_KEYS) -> str:
+    canonical = json.dumps(redact(body, keys), sort_keys=True, separators=(",", ":"))
+    return urlsplit(url).path + " " + canonical
+
+
+class RecordingTransport:
+    """Record every exchange passing through ``inner`` to a cassette file.
+
+    Args:
+        inner: Transport performing the real requests.
+        path: Cassette path (gzip JSONL); written on :meth:`save` / :meth:`close`.
+        redact_keys: JSON keys whose values are masked in the cassette
+            (case-insensitive, default :data:`REDACTED_KEYS`).
+    """
+
+    def __init__(self, inner: Transport, path: str, redact_keys: Iterable[str] = REDACTED_KEYS):
+        self.inner = inner
+        self.path = path
+        self.redact_keys = frozenset(k.lower() for k in redact_keys)
+        self.exchanges: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def post(self, url: str, *, headers: Mapping[str, str], data: bytes, timeout: Any):
+        start = time.perf_counter()
+        resp = self.inner.post(url, headers=headers, data=data, timeout=timeout)
+        elapsed = time.perf_counter() - start
+        exchange = {
+            "path": urlsplit(url).path,
+            "body": redact(loads(data), self.redact_keys),
+            "status": resp.status_code,
+            "text": _redact_text(resp.text, self.redact_keys),
+            "elapsed": round(elapsed, 6),
+        }
+        with self._lock:
+            self.exchanges.append(exchange)
+        return resp
+
+    def save(self) -> None:
+        """Write the recorded exchanges to :attr:`path`."""
+        with self._lock:
+            exchanges = list(self.exchanges)
+        with gzip.open(self.path, "wt", encoding="utf-8") as fh:
+            for exchange in exchanges:
+                fh.write(json.dumps(exchange, separators=(",", ":")) + "\n")
+        logger.info("Recorded %d exchanges to %s", len(exchanges), self.path)
+
+    def close(self) -> None:
+        self.save()
+        self.inner.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ReplayTransport:
+    """Serve responses from a cassette written by :class:`RecordingTransport`.
+
+    Repeated identical requests are answered with the recorded responses in
+    order. Once those run out, the last one is repeated.
+
+    Args:
+        path: Cassette path.
+        latency_scale: Multiplier for recorded latencies (1.0 = original,
+            0 = no delay).
+        redact_keys: Keys ignored when matching requests (as used when recording).
+    """
+
+    def __init__(
+        self, path: str, latency_scale: float = 1.0, redact_keys: Iterable[str] = REDACTED_KEYS
+    ):
+        self.path = path
+        self.latency_scale = latency_scale
+        self.redact_keys = frozenset(k.lower() for k in redact_keys)
+        self._exchanges: dict[str, deque[dict[str, Any]]] = defaultdict(deque)
+        self._lock = threading.Lock()
+        self.served = 0
+
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    exchange = json.loads(line)
+                    key = _match_key(exchange["path"], exchange["body"], self.redact_keys)
+                    self._exchanges[key].append(exchange)
+
+    def post(self, url: str, *, headers: Mapping[str, str], data: bytes, timeout: Any):
+        key = _match_key(url, loads(data), self.redact_keys)
+        with self._lock:
+            queue = self._exchanges.get(key)
+            if not queue:
+                raise ReplayMissError(f"No recorded exchange for {urlsplit(url).path}")
+            exchange = queue.popleft() if len(queue) > 1 else queue[0]
+            self.served += 1
+
+        delay = exchange["elapsed"] * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+        return RecordedResponse(url, exchange["status"], exchange["text"], exchange["elapsed"])
+
+    def close(self) -> None:
+        pass
+
+
+def wire_size(resp: Any) -> int:
+    """Bytes received on the wire for ``resp`` (compressed size when encoded)."""
+    raw = getattr(resp, "raw", None)
+    if raw is not None:
+        try:
+            size = raw.tell()
+        except (AttributeError, OSError, ValueError):
+            size = 0
+        if size:
+            return size
+    length = getattr(resp, "headers", {}).get("Content-Length")
+    if length and length.isdigit():
+        return int(length)
+    return len(resp.content)
+
+
+class WireStats:
+    """Running totals of request and response sizes.
+
+    ``response_wire_bytes`` counts what crossed the network (compressed when
+    the server honoured ``Accept-Encoding``) and ``response_bytes`` the decoded
+    size, so their difference is the saving from compression.
+    """
+
+    __slots__ = ("requests", "request_bytes", "response_wire_bytes", "response_bytes", "_lock")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.request_bytes = 0
+        self.response_wire_bytes = 0
+        self.response_bytes = 0
+
+    def add(self, request_bytes: int, wire_bytes: int, decoded_bytes: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.request_bytes += request_bytes
+            self.response_wire_bytes += wire_bytes
+            self.response_bytes += decoded_bytes
+
+    @property
+    def saved_bytes(self) -> int:
+        return max(0, self.response_bytes - self.response_wire_bytes)
+
+    @property
+    def compression_ratio(self) -> float:
+        """Decoded / wire response bytes (1.0 = no compression)."""
+        return self.response_bytes / self.response_wire_bytes if self.response_wire_bytes else 1.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "request_bytes": self.request_bytes,
+            "response_wire_bytes": self.response_wire_bytes,
+            "response_bytes": self.response_bytes,
+            "saved_bytes": self.saved_bytes,
+            "compression_ratio": round(self.compression_ratio, 2),
+        }
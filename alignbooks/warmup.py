@@ -0,0 +1,138 @@
+"""Start-up warm-up of sessions, setup and master data.
+
+A fresh worker pays for ``LoginUser``, one ``ShortList`` per master type,
+``Display_CompanySetup`` and ``Display_DocumentNumberingSetup`` one after the
+other on its first real requests. :func:`warmup` logs in, then fetches the rest
+concurrently: responses land in the client's
+:class:`~alignbooks.cache.ResponseCache` (where a TTL policy covers them), the
+connection pool is opened to several keep-alive connections, and master lists
+are returned as :class:`~alignbooks.joins.Index` lookups by id.
+
+Example:
+    >>> report = ab.warmup()
+    >>> report
+    WarmupReport(ok=6, failed=0, elapsed=0.9s)
+    >>> report.indexes[MasterType.ITEM].first(item_id)["name"]
+    >>> await ab.awarmup()          # e.g. in an ASGI startup hook
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from ._concurrency import run_parallel
+from .constants import ZERO_GUID, MasterType, Service
+from .joins import Index
+from .registry import get_registry
+
+if TYPE_CHECKING:
+    from .client import AlignBooksClient
+
+logger = logging.getLogger("alignbooks")
+
+DEFAULT_MASTERS = (MasterType.VENDOR, MasterType.CUSTOMER, MasterType.ITEM, MasterType.LEDGER)
+SETUP_ENDPOINTS = ("Display_CompanySetup", "Display_DocumentNumberingSetup")
+
+
+class WarmupReport:
+    """Outcome of :func:`warmup`.
+
+    Attributes:
+        timings: Seconds per step (``"LoginUser"``, ``"ShortList:<type>"``,
+            setup endpoint names, ...), in completion order.
+        results: Response of every successful step.
+        indexes: Master records by id, per master type.
+        failed: Exception of every failed step.
+        elapsed: Wall time in seconds.
+    """
+
+    __slots__ = ("timings", "results", "indexes", "failed", "elapsed")
+
+    def __init__(self):
+        self.timings: dict[str, float] = {}
+        self.results: dict[str, Any] = {}
+        self.indexes: dict[int, Index] = {}
+        self.failed: dict[str, Exception] = {}
+        self.elapsed = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """True when every step succeeded."""
+        return not self.failed
+
+    def __repr__(self) -> str:
+        return (
+            f"WarmupReport(ok={len(self.results)}, failed={len(self.failed)}, "
+            f"elapsed={self.elapsed:.1f}s)"
+        )
+
+
+def warmup(
+    client: AlignBooksClient,
+    masters: Iterable[int] = DEFAULT_MASTERS,
+    *,
+    setup: bool = True,
+    extra: Iterable[tuple[str, dict[str, Any] | None]] = (),
+    max_workers: int = 8,
+    refresh: bool = False,
+) -> WarmupReport:
+    """Log in, then load setup and master lists concurrently.
+
+    Args:
+        client: Client to warm up.
+        masters: Master types whose ``ShortList`` to load.
+        setup: Also load company and document numbering setup.
+        extra: Further ``(endpoint, body)`` calls to make alongside.
+        max_workers: Maximum concurrent calls.
+        refresh: Bypass cached responses (the fresh ones still replace them).
+
+    Returns:
+        A :class:`WarmupReport`; failures are recorded, not raised, except a
+        failed login.
+    """
+    report = WarmupReport()
+    start = time.perf_counter()
+
+    def timed(name: str, fn: Callable[[], Any]) -> Any:
+        began = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            report.timings[name] = time.perf_counter() - began
+
+    timed("registry", get_registry)
+    if client.auto_login and not client._logged_in:
+        report.results["LoginUser"] = timed("LoginUser", client.login)
+
+    steps: list[tuple[str, str, dict[str, Any] | None, str | None]] = [
+        (f"ShortList:{master_type}", "ShortList",
+         {"new_id": ZERO_GUID, "master_type": master_type}, None)
+        for master_type in masters
+    ]
+    if setup:
+        steps += [(endpoint, endpoint, None, Service.CONFIG) for endpoint in SETUP_ENDPOINTS]
+    steps += [(endpoint, endpoint, body, None) for endpoint, body in extra]
+
+    def run(step: tuple[str, str, dict[str, Any] | None, str | None]) -> Any:
+        name, endpoint, body, service = step
+        return timed(name, lambda: client.api_call(
+            endpoint, body, service, use_cache=not refresh
+        ))
+
+    for (name, _, body, _), result in zip(
+        steps, run_parallel(run, steps, max_workers, return_exceptions=True)
+    ):
+        if isinstance(result, Exception):
+            logger.warning("Warm-up of %s failed: %s", name, result)
+            report.failed[name] = result
+            continue
+        report.results[name] = result
+        if name.startswith("ShortList:"):
+            rows = [r for r in result if r.get("id")] if isinstance(result, list) else []
+            report.indexes[body["master_type"]] = Index(rows, "id")
+
+    report.elapsed = time.perf_counter() - start
+    logger.info("Warm-up finished: %r", report)
+    return report
@@ -0,0 +1,120 @@
+"""CPU-stage scaling: serial vs thread pool vs process pool.
+
+Runs the CPU-bound bulk stages on synthetic data at increasing worker counts
+and prints wall time and speed-up over serial:
+
+* ``item_lines_to_api`` over 100K invoice lines;
+* ``aggregate_invoices`` over 20K hydrated invoices;
+* ``bulk_upsert`` change detection (``dry_run``) over 100K item masters.
+
+    python benchmarks/bench_process_pool.py [--lines 100000] [--invoices 20000] [--masters 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from alignbooks.bulk import bulk_upsert
+from alignbooks.constants import VType
+from alignbooks.executors import ProcessExecutor, SerialExecutor, ThreadExecutor
+from alignbooks.gst import aggregate_invoices
+from alignbooks.models import item_lines_to_api
+
+
+def _lines(n: int) -> list[dict]:
+    return [{
+        "item_id": f"item-{i % 2000}", "item_name": f"Item {i % 2000}",
+        "unit_name": "PCS", "qty": 1 + i % 7, "rate": 10.0 + i % 300,
+        "tax_rate": (5, 12, 18)[i % 3], "hsn_code": "6109",
+    } for i in range(n)]
+
+
+def _invoices(n: int) -> list[dict]:
+    out = []
+    for i in range(n):
+        inter = i % 4 == 0
+        lines = []
+        for j in range(5):
+            taxable = 100.0 + (i * j) % 900
+            rate = (5, 12, 18)[j % 3]
+            tax = taxable * rate / 100
+            lines.append({
+                "hsn_code": f"61{j:02d}", "tax_rate": rate, "taxable": taxable, "qty": j + 1,
+                "igst_tax_amount": tax if inter else 0,
+                "cgst_tax_amount": 0 if inter else tax / 2,
+                "sgst_tax_amount": 0 if inter else tax / 2,
+                "unit": {"id": "u1", "name": "PCS"},
+            })
+        out.append({
+            "vtype": VType.SALES_INVOICE,
+            "party_gst_no": f"07AAAAA{i % 500:04d}A1Z5" if i % 3 else "",
+            "place_of_supply": {"id": "07", "name": "Delhi"},
+            "item_detail": lines,
+        })
+    return out
+
+
+class _Masters:
+    """Offline master service: ``list`` returns the current rows, nothing is sent."""
+
+    def __init__(self, n: int):
+        self.rows = [{"id": f"i{i}", "name": f"Item {i}", "sale_rate": 10.0 + i % 300,
+                      "description": f"Cotton tee, batch {i // 100}"} for i in range(n)]
+
+    def list(self) -> list[dict]:
+        return self.rows
+
+
+def _feed(n: int) -> list[dict]:
+    return [{"name": f"Item {i}", "sale_rate": 10.0 + (i + i % 10) % 300,
+             "description": f"  Cotton tee, batch {i // 100} "} for i in range(n)]
+
+
+def _time(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--invoices", type=int, default=20_000)
+    parser.add_argument("--masters", type=int, default=100_000)
+    args = parser.parse_args()
+
+    lines = _lines(args.lines)
+    invoices = _invoices(args.invoices)
+    masters, feed = _Masters(args.masters), _feed(args.masters)
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, cores} & set(range(1, cores + 1))) or [1]
+
+    stages = {
+        f"item_lines_to_api ({args.lines:,} lines)":
+            lambda ex: item_lines_to_api(lines, executor=ex, chunk_size=2000),
+        f"aggregate_invoices ({args.invoices:,} invoices)":
+            lambda ex: aggregate_invoices(invoices, ex, chunk_size=500),
+        f"bulk_upsert dry run ({args.masters:,} masters)":
+            lambda ex: bulk_upsert(masters, feed, key="name", dry_run=True,
+                                   executor=ex, chunk_size=2000),
+    }
+
+    print(f"{cores} CPU core(s)")
+    for title, stage in stages.items():
+        print(f"\n{title}")
+        base = _time(lambda: stage(SerialExecutor()))
+        print(f"  {'serial':<12} {base:7.2f}s   1.00x")
+        for n in counts:
+            with ThreadExecutor(n) as ex:
+                t = _time(lambda: stage(ex))
+            print(f"  {'threads x' + str(n):<12} {t:7.2f}s  {base / t:5.2f}x")
+            with ProcessExecutor(n) as ex:
+                ex.map_chunks(len, [[0]] * n)  # warm up the worker processes
+                t = _time(lambda: stage(ex))
+            print(f"  {'processes x' + str(n):<12} {t:7.2f}s  {base / t:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
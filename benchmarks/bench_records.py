@@ -0,0 +1,67 @@
+"""Resident-memory comparison: dict rows vs slot records.
+
+Builds synthetic payloads shaped like the live endpoints (row counts from
+endpoint_status.json) and measures retained memory with tracemalloc.
+
+    python benchmarks/bench_records.py
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import tracemalloc
+import uuid
+
+from alignbooks.records import DocumentHeader, ItemBalance, MasterRecord, decode_records
+
+
+def _vendors(n: int) -> str:
+    return json.dumps([{
+        "id": str(uuid.uuid4()), "name": f"Vendor {i}", "city": "Delhi",
+        "phone": f"98{i:08d}", "gstin": f"07ABCDE{i:04d}F1Z5",
+        "credit_limit": 0, "credit_days": 30,
+    } for i in range(n)])
+
+
+def _balances(n: int) -> str:
+    return json.dumps([{"item_id": str(uuid.uuid4()), "balance": float(i % 700)} for i in range(n)])
+
+
+def _headers(n: int) -> str:
+    return json.dumps([{
+        "id": str(uuid.uuid4()), "vno": f"SI/{i}", "vdate": "2026-02-01T00:00:00",
+        "party_id": str(uuid.uuid4()), "party_name": f"Customer {i % 225}",
+        "net_amount": 1180.0 + i, "tax_amount": 180.0, "branch_id": str(uuid.uuid4()),
+        "status": 0, "remark": "",
+    } for i in range(n)])
+
+
+def _retained(build) -> tuple[int, object]:
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, value
+
+
+def main() -> None:
+    cases = [
+        ("ShortList (351 vendors)", _vendors(351), MasterRecord),
+        ("GetItemBalanceForList (1952 items)", _balances(1952), ItemBalance),
+        ("List_Document (3460 headers)", _headers(3460), DocumentHeader),
+        ("List_Document (50000 headers)", _headers(50_000), DocumentHeader),
+    ]
+    print(f"{'payload':40} {'dicts':>12} {'records':>12} {'saved':>7}")
+    for label, text, record_cls in cases:
+        as_dicts, _ = _retained(lambda: json.loads(text))
+        as_records, rows = _retained(lambda: decode_records(text, record_cls))
+        assert rows[0].to_dict() == json.loads(text)[0]
+        saved = 100 * (1 - as_records / as_dicts)
+        print(f"{label:40} {as_dicts / 1024:10.0f}KB {as_records / 1024:10.0f}KB {saved:6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Build alignbooks/endpoints.json from the discovered service map.
+
+Sources:
+    alignbooks/api_service_map.json   all 924 endpoints -> service (from main.js)
+    endpoint_status.json              live test results, request/response samples
+
+Everything not covered by a live test is classified from the endpoint name
+(verb tokens such as Display/Get/SaveUpdate/Delete), so treat those entries
+as hints. Re-run after updating either source:
+
+    python scripts/build_endpoint_registry.py
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SERVICE_MAP = ROOT / "alignbooks" / "api_service_map.json"
+STATUS = ROOT / "endpoint_status.json"
+OUTPUT = ROOT / "alignbooks" / "endpoints.json"
+
+SERVICES = [
+    "ABDataService.svc", "ABUtilityService.svc", "ABConfigurationService.svc",
+    "ABReportService.svc", "ABImportService.svc", "ABEnterpriseService.svc",
+]
+KINDS = ["read", "write", "delete", "action"]
+RESPONSES = ["unknown", "list", "dict", "envelope", "document", "encrypted"]
+
+IDEMPOTENT, CACHEABLE, HEAVY, DATE_RANGE = 1, 2, 4, 8
+
+READ = {"Display", "Get", "ShortList", "Short", "List", "Search", "Show", "Is", "Validate",
+        "Fill", "Download", "Check", "Query", "Verify"}
+WRITE = {"Save", "SaveUpdate", "Update", "Create", "Post", "Apply", "Merge", "Copy", "Import",
+         "Upload", "Change", "Close", "Process", "Add", "Manage", "Cancel", "Restore",
+         "Convert", "Mark", "Submit", "File", "Set", "Configure", "Unadjust", "Clear", "Pull",
+         "Recall", "Active", "Register", "Reset", "Connect", "Refresh"}
+DELETE = {"Delete"}
+ACTION = {"Send", "Generate", "Login", "Test", "Invite", "Resend", "Export", "Click"}
+
+VOLATILE = {"Balance", "Stock", "Status", "Pending", "Count", "Notification", "Dashboard",
+            "Captcha", "OTP", "Statement", "Stastics"}
+HEAVY_TOKENS = {"Report", "Statement", "Analysis", "GSTR", "Bulk", "Dashboard"}
+HEAVY_NAMES = {"QueryExecute", "List_Document", "GetItemBalanceForList", "GetDocumentPrint"}
+
+# Wrapper key of the request payload where it is known from the service code.
+BODY_KEYS = {
+    "SaveUpdate_Invoice": "invoice",
+    "SaveUpdate_Item": "item_information",
+    "List_Document": "info",
+}
+
+
+def tokens(name: str) -> list[str]:
+    out = []
+    for part in name.split("_"):
+        out.extend(re.findall(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+", part) or [part])
+    return out
+
+
+def classify(name: str) -> str:
+    if name.startswith(("SaveUpdate", "ShortList")):
+        return "write" if name.startswith("Save") else "read"
+    if "OTP" in name:
+        return "action"
+    for token in tokens(name):
+        for kind, verbs in (("read", READ), ("write", WRITE), ("delete", DELETE),
+                            ("action", ACTION)):
+            if token in verbs:
+                return kind
+    return "action"
+
+
+def ttl_hint(name: str, service: str) -> int | None:
+    if service == "ABConfigurationService.svc" or re.search(r"Setup|Format|Rights", name):
+        return 86400
+    if name.endswith("Info"):
+        return 3600
+    if name.startswith("ShortList"):
+        return 300
+    return None
+
+
+def response_shape(name: str, kind: str, sample: dict | None) -> str:
+    fmt = (sample or {}).get("response_format") or ""
+    if name == "LoginUser":
+        return "encrypted"
+    if name == "GetDocumentPrint":
+        return "document"
+    if fmt.startswith("list"):
+        return "list"
+    if fmt.startswith(("dict", "full", "nested")):
+        return "envelope" if "ReturnCode" in fmt else "dict"
+    if name.startswith(("ShortList", "List")) or re.search(r"List(For\w+)?$", name):
+        return "list"
+    if kind in ("write", "delete") or name.startswith("Send"):
+        return "envelope"
+    if name.startswith("Display") or "_Display_" in name:
+        return "dict"
+    return "unknown"
+
+
+def build() -> dict:
+    service_map = json.loads(SERVICE_MAP.read_text(encoding="utf-8"))
+    status = json.loads(STATUS.read_text(encoding="utf-8"))["endpoints"]
+
+    endpoints = {}
+    for name, raw_service in sorted(service_map.items()):
+        service = raw_service.lstrip("/") + ".svc"
+        sample = status.get(name)
+        kind = classify(name)
+        toks = set(tokens(name))
+
+        flags = 0
+        if kind in ("read", "delete"):
+            flags |= IDEMPOTENT
+        if kind == "read" and not toks & VOLATILE and name != "QueryExecute":
+            flags |= CACHEABLE
+        if name in HEAVY_NAMES or toks & HEAVY_TOKENS or service == "ABReportService.svc":
+            flags |= HEAVY
+        body = (sample or {}).get("request_body")
+        keys = sorted(body) if isinstance(body, dict) else []
+        if "from_date" in keys and "to_date" in keys:
+            flags |= DATE_RANGE
+
+        body_key = BODY_KEYS.get(name)
+        if body_key is None and kind == "write" and name.startswith(("SaveUpdate_", "Save_")):
+            body_key = "info"
+
+        endpoints[name] = [
+            SERVICES.index(service),
+            KINDS.index(kind),
+            flags,
+            ttl_hint(name, service) if flags & CACHEABLE else None,
+            body_key,
+            RESPONSES.index(response_shape(name, kind, sample)),
+            (sample or {}).get("status") or "",
+            keys,
+        ]
+
+    return {
+        "version": 1,
+        "services": SERVICES,
+        "kinds": KINDS,
+        "responses": RESPONSES,
+        "fields": ["service", "kind", "flags", "ttl", "body_key", "response", "status", "keys"],
+        "endpoints": endpoints,
+    }
+
+
+def main() -> None:
+    data = build()
+    OUTPUT.write_text(json.dumps(data, separators=(",", ":")) + "\n", encoding="utf-8")
+    print(f"Wrote {len(data['endpoints'])} endpoints to {OUTPUT.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
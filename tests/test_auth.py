@@ -1,5 +1,7 @@
 import unittest
-from alignbooks.auth import make_ab_token
+from datetime import datetime, timedelta
+from alignbooks.auth import decode_ab_token, decode_ab_tokens, make_ab_token, verify_ab_token
+from alignbooks.exceptions import InvalidTokenError
 
 class TestAuth(unittest.TestCase):
     def test_make_token(self):
@@ -15,5 +17,29 @@ class TestAuth(unittest.TestCase):
         self.assertTrue(isinstance(token, str))
         self.assertTrue(len(token) > 20)
 
+    def test_decode_round_trip(self):
+        token = make_ab_token("key", "ent", "comp", "user", "a@b.com", "pwd", "QueryExecute")
+        info = decode_ab_token(token)
+        self.assertEqual((info["apiname"], info["company_id"], info["user_id"]),
+                         ("QueryExecute", "comp", "user"))
+        self.assertNotIn("password", info)
+        self.assertEqual(decode_ab_token(token, include_password=True)["password"], "pwd")
+
+        verify_ab_token(token, company_id="comp", max_age=60)
+        with self.assertRaises(InvalidTokenError):
+            verify_ab_token(token, company_id="other")
+        with self.assertRaises(InvalidTokenError):
+            verify_ab_token(token, max_age=60, now=datetime.now() + timedelta(hours=1))
+
+    def test_invalid_and_batch(self):
+        token = make_ab_token("key", "ent", "comp", "user", "a@b.com", "pwd", "List_Document")
+        for bad in ("not base64!", "QUJD", token[:-8] + "AAAAAAA="):
+            with self.assertRaises(InvalidTokenError):
+                decode_ab_token(bad)
+        results = decode_ab_tokens([token, "QUJD", token], chunk_size=2)
+        self.assertEqual(results[0]["apiname"], "List_Document")
+        self.assertIsNone(results[1])
+        self.assertEqual(results[2], results[0])
+
 if __name__ == "__main__":
     unittest.main()
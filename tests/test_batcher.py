@@ -0,0 +1,85 @@
+import threading
+import time
+import unittest
+from alignbooks.batcher import WriteBatcher, merge_update
+from alignbooks.exceptions import ValidationError
+
+
+class FakeItems:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.sent = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def update(self, data):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if data.get("name") == "bad":
+            raise RuntimeError("rejected")
+        self.sent.append(data)
+        return {"ReturnCode": 0, "IDValue": data["id"]}
+
+
+class TestWriteBatcher(unittest.TestCase):
+    def test_merge_update(self):
+        record = {"id": "i1", "rates": {"sale": 1, "mrp": 2}}
+        merge_update(record, {"rates": {"sale": 5}, "name": "Bolt"})
+        self.assertEqual(record, {"id": "i1", "rates": {"sale": 5, "mrp": 2}, "name": "Bolt"})
+
+    def test_coalesces_per_record(self):
+        items = FakeItems()
+        with WriteBatcher(window=0.05) as batcher:
+            first = batcher.update(items, {"id": "i1", "name": "Bolt", "rate": 1})
+            second = batcher.update(items, {"id": "i1", "rate": 2})
+            other = batcher.update(items, {"id": "i2", "rate": 9})
+            with self.assertRaises(ValidationError):
+                batcher.update(items, {"rate": 3})
+        self.assertEqual(first.result(), second.result())
+        self.assertEqual(first.result()["IDValue"], "i1")
+        self.assertEqual(other.result()["IDValue"], "i2")
+        self.assertEqual(len(items.sent), 2)
+        self.assertIn({"id": "i1", "name": "Bolt", "rate": 2}, items.sent)
+        self.assertEqual(batcher.stats()["coalesced"], 1)
+
+    def test_services_of_different_companies_are_not_merged(self):
+        company_a, company_b = FakeItems(), FakeItems()
+        with WriteBatcher(window=0.05) as batcher:
+            batcher.update(company_a, {"id": "i1", "rate": 1})
+            batcher.update(company_b, {"id": "i1", "rate": 2})
+        self.assertEqual(company_a.sent, [{"id": "i1", "rate": 1}])
+        self.assertEqual(company_b.sent, [{"id": "i1", "rate": 2}])
+
+    def test_loader_and_failures(self):
+        items = FakeItems()
+        full = {"i1": {"id": "i1", "name": "Bolt", "rate": 1, "unit": "PCS"},
+                "i2": {"id": "i2", "name": "bad"}}
+        with WriteBatcher(window=0, loader=lambda service, rid: full[rid]) as batcher:
+            ok = batcher.update(items, {"id": "i1", "rate": 4})
+            bad = batcher.update(items, {"id": "i2", "rate": 1})
+        self.assertEqual(items.sent, [{"id": "i1", "name": "Bolt", "rate": 4, "unit": "PCS"}])
+        self.assertEqual(full["i1"]["rate"], 1)
+        self.assertTrue(ok.done())
+        with self.assertRaises(RuntimeError):
+            bad.result()
+
+    def test_same_record_never_concurrent(self):
+        items = FakeItems(delay=0.05)
+        batcher = WriteBatcher(window=0, max_workers=4)
+        futures = []
+        for rate in range(3):
+            futures.append(batcher.update(items, {"id": "i1", "rate": rate}))
+            time.sleep(0.01)
+        batcher.close()
+        self.assertEqual(items.max_active, 1)
+        self.assertEqual(items.sent[-1]["rate"], 2)
+        self.assertTrue(all(f.done() for f in futures))
+
+
+if __name__ == "__main__":
+    unittest.main()
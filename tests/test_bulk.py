@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from alignbooks.bulk import bulk_upsert, record_hash
+from alignbooks.executors import ProcessExecutor
+
+
+class FakeMasters:
+    def __init__(self, rows):
+        self.rows = rows
+        self.created, self.updated = [], []
+
+    def list(self):
+        return self.rows
+
+    def create(self, data):
+        self.created.append(data)
+        return {"ReturnCode": 0, "IDValue": "new-" + data["name"]}
+
+    def update(self, data):
+        if data["name"] == "Broken":
+            raise RuntimeError("rejected")
+        self.updated.append(data)
+        return {"ReturnCode": 0}
+
+
+class TestBulkUpsert(unittest.TestCase):
+    def test_hash_ignores_noise(self):
+        self.assertEqual(record_hash({"name": " Bolt ", "rate": 5.0, "note": ""}),
+                         record_hash({"rate": 5, "name": "Bolt", "id": "x"}))
+
+    def test_second_run_only_sends_changes(self):
+        journal = os.path.join(tempfile.mkdtemp(), "items.journal")
+        feed = [{"name": "Bolt", "rate": 5}, {"name": "Nut", "rate": 1},
+                {"name": "Broken", "rate": 3}]
+        service = FakeMasters([{"id": "i1", "name": "Bolt"}, {"id": "i9", "name": "Broken"}])
+
+        report = bulk_upsert(service, feed, journal=journal)
+        self.assertEqual((report.created, report.updated, len(report.failed)), (1, 1, 1))
+        self.assertEqual(service.updated[0]["id"], "i1")
+
+        service.rows.append({"id": "new-Nut", "name": "Nut"})
+        feed[1] = {"name": "Nut", "rate": 2}
+        report = bulk_upsert(service, feed, journal=journal)
+        self.assertEqual((report.created, report.updated, report.unchanged), (0, 1, 1))
+        self.assertEqual(len(report.failed), 1)
+
+    def test_compares_with_server_records(self):
+        service = FakeMasters([{"id": "i1", "name": "Bolt", "rate": 5.0},
+                               {"id": "i2", "name": "Nut", "rate": 1, "unit": "pcs"}])
+        feed = [{"name": "Bolt", "rate": 5}, {"name": "nut ", "rate": 2}]
+        report = bulk_upsert(service, feed)
+        self.assertEqual((report.created, report.updated, report.unchanged), (0, 1, 1))
+        self.assertEqual(service.updated, [{"name": "nut ", "rate": 2, "id": "i2"}])
+
+        # An edit made on the server is detected even when the journal says "sent".
+        journal = os.path.join(tempfile.mkdtemp(), "items.journal")
+        bulk_upsert(service, [{"name": "Bolt", "rate": 6}], journal=journal)
+        report = bulk_upsert(service, [{"name": "Bolt", "rate": 6}], journal=journal)
+        self.assertEqual(report.updated, 1)
+
+    def test_process_executor_matches_serial(self):
+        feed = [{"name": f"Item {i}", "rate": i % 7} for i in range(50)]
+        rows = [{"id": f"i{i}", "name": f"Item {i}", "rate": 0} for i in range(0, 50, 2)]
+        serial = bulk_upsert(FakeMasters(rows), feed, dry_run=True)
+        with ProcessExecutor(max_workers=2) as pool:
+            parallel = bulk_upsert(FakeMasters(rows), feed, dry_run=True,
+                                   executor=pool, chunk_size=8)
+        self.assertEqual(parallel.as_dict()["unchanged"], serial.as_dict()["unchanged"])
+        self.assertEqual((parallel.created, parallel.updated, parallel.unchanged), (25, 21, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
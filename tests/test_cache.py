@@ -0,0 +1,46 @@
+import os
+import tempfile
+import time
+import unittest
+from alignbooks.cache import ResponseCache, cache_key
+
+class TestResponseCache(unittest.TestCase):
+    def test_key_is_canonical(self):
+        a = cache_key("svc", "GetPartyInfo", {"party_id": "p", "vtype": 18}, "c1")
+        b = cache_key("svc", "GetPartyInfo", {"vtype": 18, "party_id": "p"}, "c1")
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, cache_key("svc", "GetPartyInfo", {"party_id": "p", "vtype": 18}, "c2"))
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        for k in ("a", "b"):
+            cache.set(k, "E", k, ttl=60)
+        cache.get("a")
+        cache.set("c", "E", "c", ttl=60)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "a")
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_size_bound_and_ttl(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.set("big", "E", "x" * 50, ttl=60)
+        self.assertIsNone(cache.get("big"))
+        cache.set("short", "E", 1, ttl=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("short"))
+
+    def test_disk_tier_and_invalidate(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite")
+            first = ResponseCache(path=path)
+            first.set("k", "Display_CompanySetup", {"a": 1}, ttl=60)
+            first.close()
+
+            second = ResponseCache(path=path)
+            self.assertEqual(second.get("k"), {"a": 1})
+            second.invalidate("Display_CompanySetup")
+            self.assertIsNone(second.get("k"))
+            second.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import math
+import os
+import re
+import tempfile
+import unittest
+from alignbooks.colstore import NULL_INT, _encode
+from alignbooks.exceptions import NotFoundError, ValidationError
+from alignbooks.export import infer_schema
+from alignbooks.services.query import QueryService
+from alignbooks.sql import Select
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if numpy is not None:
+    from alignbooks.colstore import ColumnStore, ColumnStoreWriter
+
+ROWS = [{"id": f"r{i:03d}", "item_id": f"i{i % 3}", "qty": i * 1.5, "vtype": i % 4,
+         "posted": i % 2 == 0} for i in range(25)]
+
+class PagingClient:
+    """Answers LIMIT/OFFSET QueryExecute pages from in-memory rows."""
+
+    company_id = "c1"
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def api_call(self, endpoint, body=None, **kwargs):
+        sql = body["query"]
+        self.queries.append(sql)
+        limit, offset = map(int, re.search(r"LIMIT (\d+) OFFSET (\d+)", sql).groups())
+        return self.rows[offset:offset + limit]
+
+class TestQueryIter(unittest.TestCase):
+    def test_pages_until_short_page(self):
+        client = PagingClient(ROWS)
+        pages = list(QueryService(client).query_iter(Select("et_stock"), page_size=10))
+        self.assertEqual([len(p) for p in pages], [10, 10, 5])
+        self.assertIn("ORDER BY id", client.queries[0])
+
+class TestEncoding(unittest.TestCase):
+    def test_inferred_numbers_are_not_truncated(self):
+        schema = dict(infer_schema([{"qty": 5, "id": "r1"}, {"qty": 10, "id": "r2"}]))
+        self.assertEqual(schema["qty"], "float64")
+        self.assertEqual(_encode(2.5, schema["qty"], {}), 2.5)
+
+    def test_encode_nulls_and_declared_ints(self):
+        strings = {}
+        self.assertEqual(_encode("7", "int64", strings), 7)
+        self.assertEqual(_encode(None, "int64", strings), NULL_INT)
+        self.assertEqual(_encode("n/a", "int64", strings), NULL_INT)
+        with self.assertRaises(ValidationError):
+            _encode(2.5, "int64", strings)
+        self.assertEqual([_encode(v, "string", strings) for v in ("a", "b", "a", None)],
+                         [0, 1, 0, -1])
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class TestColumnStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "et_stock")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_spill_and_reopen(self):
+        client = PagingClient(list(reversed(ROWS)))
+        store = QueryService(client).spill(Select("et_stock"), self.path, page_size=7)
+        self.assertEqual(len(store), 25)
+        self.assertEqual(len(client.queries), 4)
+
+        reopened = ColumnStore(self.path)
+        qty = reopened.column("qty")
+        self.assertIsInstance(qty, numpy.memmap)
+        self.assertAlmostEqual(float(qty.sum()), sum(r["qty"] for r in ROWS))
+        self.assertEqual(reopened.get("r007"), ROWS[7])
+        self.assertEqual(reopened.locate(["r024", "nope"]).tolist(), [0, -1])
+        with self.assertRaises(NotFoundError):
+            reopened.get("nope")
+        with self.assertRaises(ValueError):
+            qty[0] = 1.0  # read-only mapping
+
+    def test_nulls_and_shared_strings(self):
+        schema = [("id", "int64"), ("name", "string"), ("rate", "float64"), ("ok", "bool")]
+        with ColumnStoreWriter(self.path, schema) as writer:
+            writer.write([{"id": 2, "name": "a", "rate": None, "ok": True}])
+            writer.write([{"id": 1, "name": None, "rate": "", "ok": None},
+                          {"id": 3, "name": "a", "rate": 2.5}])
+        store = ColumnStore(self.path)
+        self.assertEqual(store.values("name"), ["a", None, "a"])
+        self.assertEqual(store.column("name").tolist(), [0, -1, 0])
+        self.assertEqual(store.values("ok"), [True, None, None])
+        self.assertTrue(math.isnan(store.column("rate")[0]))
+        self.assertEqual(store.get(3), {"id": 3, "name": "a", "rate": 2.5, "ok": None})
+
+    def test_empty_spill(self):
+        store = QueryService(PagingClient([])).spill(Select("et_stock"), self.path)
+        self.assertEqual((len(store), store.columns, store.key), (0, [], None))
+        self.assertEqual(os.listdir(self.tmp.name), ["et_stock"])
+        with self.assertRaises(ValidationError):
+            store.get("r001")
+
+    def test_failed_write_keeps_previous_dataset(self):
+        with ColumnStoreWriter(self.path) as writer:
+            writer.write(ROWS[:3])
+        with self.assertRaises(RuntimeError):
+            with ColumnStoreWriter(self.path) as writer:
+                writer.write(ROWS)
+                raise RuntimeError("query failed")
+        self.assertEqual(len(ColumnStore(self.path)), 3)
+        self.assertEqual(os.listdir(self.tmp.name), ["et_stock"])
+
+if __name__ == "__main__":
+    unittest.main()
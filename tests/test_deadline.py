@@ -0,0 +1,67 @@
+import json
+import time
+import unittest
+import requests
+from alignbooks._concurrency import run_parallel
+from alignbooks.client import AlignBooksClient
+from alignbooks.deadline import deadline, remaining
+from alignbooks.exceptions import DeadlineExceededError
+from alignbooks.transport import RecordedResponse
+
+
+class SlowTransport:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.timeouts = []
+
+    def post(self, url, *, headers, data, timeout):
+        self.timeouts.append(timeout)
+        if self.delay > timeout[1]:
+            time.sleep(timeout[1])
+            raise requests.ReadTimeout("read timed out")
+        time.sleep(self.delay)
+        return RecordedResponse(url, 200, json.dumps({"ReturnCode": 0, "JsonDataTable": "[]"}), 0.0)
+
+
+def make_client(transport, **kwargs):
+    return AlignBooksClient("e", "p", "k", "ent", "c1", "u", auto_login=False,
+                            transport=transport, **kwargs)
+
+
+class TestTimeouts(unittest.TestCase):
+    def test_per_endpoint_defaults(self):
+        transport = SlowTransport()
+        client = make_client(transport, timeout=30, endpoint_timeouts={"ShortList": (2, 5)})
+        client.api_call("ShortList")
+        client.api_call("QueryExecute", {"query": "SELECT 1"})
+        client.api_call("Display_Item", {"id": "x"}, timeout=(1, 7))
+        client.api_call("Display_Ledger", {"id": "x"})
+        self.assertEqual(transport.timeouts, [(2.0, 5.0), (10.0, 300.0), (1.0, 7.0), (10.0, 30.0)])
+
+    def test_deadline_clips_and_fails_fast(self):
+        transport = SlowTransport()
+        client = make_client(transport)
+        with deadline(5):
+            with deadline(60):  # nested deadlines never extend the budget
+                self.assertLessEqual(remaining(), 5)
+            client.api_call("QueryExecute", {"query": "SELECT 1"})
+        self.assertLessEqual(transport.timeouts[0][1], 5)
+        self.assertIsNone(remaining())
+
+        with deadline(0):
+            with self.assertRaises(DeadlineExceededError):
+                client.api_call("ShortList")
+        self.assertEqual(len(transport.timeouts), 1)
+
+    def test_deadline_propagates_to_pool_and_timeouts(self):
+        client = make_client(SlowTransport(delay=1.0))
+        start = time.monotonic()
+        with deadline(0.1):
+            results = run_parallel(lambda _: client.api_call("ShortList"), range(4),
+                                   return_exceptions=True)
+        self.assertTrue(all(isinstance(r, DeadlineExceededError) for r in results))
+        self.assertLess(time.monotonic() - start, 0.8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import threading
+import unittest
+from alignbooks.dispatch import WhatsAppDispatcher
+
+
+class FakeClient:
+    def __init__(self, fail_times=0):
+        self.sent = []
+        self.fail_times = fail_times
+        self.lock = threading.Lock()
+
+    def get_pdf(self, doc_id, vtype, format_id=""):
+        return b"%PDF", f"{doc_id}.pdf"
+
+    def api_call(self, endpoint, body):
+        with self.lock:
+            if self.fail_times:
+                self.fail_times -= 1
+                raise RuntimeError("proxy timeout")
+            self.sent.append((body["phone_nos"], body["message"], len(body["attachments"])))
+        return {"ReturnCode": 0}
+
+
+class TestWhatsAppDispatcher(unittest.TestCase):
+    def test_dedupe_order_and_pdf(self):
+        client = FakeClient()
+        with WhatsAppDispatcher(client, ":memory:", max_workers=4) as d:
+            self.assertTrue(d.enqueue("+91111", "first", doc_id="inv1", vtype=6))
+            self.assertFalse(d.enqueue("91111", "first", doc_id="inv1", vtype=6))
+            d.enqueue("91111", "second")
+            d.enqueue("91222", "other")
+            report = d.run()
+        self.assertEqual(report.sent, 3)
+        mine = [m for m in client.sent if m[0] == "91111"]
+        self.assertEqual(mine, [("91111", "first", 1), ("91111", "second", 0)])
+
+    def test_pdf_lookahead_is_bounded(self):
+        class Tracking(FakeClient):
+            rendered = peak = 0
+
+            def get_pdf(self, doc_id, vtype, format_id=""):
+                with self.lock:
+                    self.rendered += 1
+                    self.peak = max(self.peak, self.rendered - len(self.sent))
+                return super().get_pdf(doc_id, vtype, format_id)
+
+        client = Tracking()
+        with WhatsAppDispatcher(client, ":memory:", max_workers=1, pdf_lookahead=2) as d:
+            for i in range(20):
+                d.enqueue("91111", f"invoice {i}", doc_id=f"inv{i}", vtype=6)
+            report = d.run()
+        self.assertEqual(report.sent, 20)
+        self.assertLessEqual(client.peak, 2)
+
+    def test_retry_and_restart(self):
+        path = os.path.join(tempfile.mkdtemp(), "queue.db")
+        client = FakeClient(fail_times=1)
+        d = WhatsAppDispatcher(client, path, backoff=0.01, max_backoff=0.01)
+        d.enqueue("91111", "a")
+        d.enqueue("91111", "b")
+        d.close()
+
+        with WhatsAppDispatcher(client, path, backoff=0.01, max_backoff=0.01) as d:
+            report = d.run()
+            self.assertEqual((report.sent, report.retried), (2, 1))
+            self.assertEqual([m[1] for m in client.sent], ["a", "b"])
+            self.assertEqual(d.counts(), {"sent": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
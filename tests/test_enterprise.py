@@ -0,0 +1,75 @@
+import json
+import threading
+import unittest
+import requests
+from requests.adapters import BaseAdapter
+from alignbooks.auth import decode_ab_token
+from alignbooks.enterprise import EnterpriseClient
+
+
+class EnterpriseAdapter(BaseAdapter):
+    """Fake AlignBooks server keyed by the company in each request's ab_token."""
+
+    def __init__(self, companies):
+        super().__init__()
+        self.companies = companies
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        endpoint = request.url.rsplit("/", 1)[1]
+        company_id = decode_ab_token(request.headers["ab_token"])["company_id"]
+        with self._lock:
+            self.calls.append((company_id, endpoint))
+        if endpoint == "GetCompaniesListofEnterprise":
+            rows = [{"company_id": cid, "company_name": name} for cid, name in self.companies.items()]
+        else:
+            rows = [{"company_id": company_id, "endpoint": endpoint}]
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.url = request.url
+        resp.request = request
+        resp._content = json.dumps({"ReturnCode": 0, "JsonDataTable": json.dumps(rows)}).encode()
+        return resp
+
+    def close(self):
+        pass
+
+
+def make_enterprise(companies, **kwargs):
+    enterprise = EnterpriseClient("e", "p", "k", "ent", "c1", "u", **kwargs)
+    adapter = EnterpriseAdapter(companies)
+    enterprise._session.mount("https://", adapter)
+    return enterprise, adapter
+
+
+class TestEnterpriseClient(unittest.TestCase):
+    def test_discovery_and_fan_out(self):
+        enterprise, adapter = make_enterprise({"c1": "Head Office", "c2": "Branch"})
+        results = enterprise.map(lambda c: c.api_call("ShortList", {"master_type": 3}))
+
+        self.assertEqual(enterprise.companies, {"c1": "Head Office", "c2": "Branch"})
+        self.assertEqual(results["c2"], [{"company_id": "c2", "endpoint": "ShortList"}])
+        self.assertIn(("c1", "GetCompaniesListofEnterprise"), adapter.calls)
+
+    def test_clients_are_lazy_and_share_the_session(self):
+        enterprise, adapter = make_enterprise({}, company_ids=["c1", "c2"])
+        self.assertEqual(enterprise._clients, {})
+        first = enterprise.company("c2")
+        self.assertIs(enterprise.company("c2"), first)
+        self.assertIs(first._session, enterprise.company("c1")._session)
+        self.assertFalse(first._owns_session)
+        self.assertEqual(adapter.calls, [])
+
+    def test_login_state_is_per_company(self):
+        enterprise, adapter = make_enterprise({}, company_ids=["c1", "c2"])
+        enterprise.company("c1").api_call("ShortList")
+        self.assertTrue(enterprise.company("c1")._logged_in)
+        self.assertFalse(enterprise.company("c2")._logged_in)
+
+        enterprise.company("c2").api_call("ShortList")
+        logins = [company for company, endpoint in adapter.calls if endpoint == "LoginUser"]
+        self.assertEqual(logins, ["c1", "c2"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from alignbooks.constants import VType
+from alignbooks.executors import ProcessExecutor, ThreadExecutor, encode_chunked, map_chunked
+from alignbooks.gst import GSTAggregator, aggregate_invoices
+from alignbooks.models import ItemDetail, item_lines_to_api
+
+
+def double(chunk):
+    return [x * 2 for x in chunk]
+
+
+def invoice(i):
+    return {
+        "vtype": VType.SALES_INVOICE,
+        "party_gst_no": "07AAAAA0000A1Z5" if i % 2 else "",
+        "item_detail": [{"hsn_code": "6109", "tax_rate": 5, "taxable": 100.0 + i,
+                         "cgst_tax_amount": 2.5, "sgst_tax_amount": 2.5, "qty": 1}],
+    }
+
+
+class TestExecutors(unittest.TestCase):
+    def test_strategies_agree(self):
+        items = list(range(25))
+        expected = [x * 2 for x in items]
+        self.assertEqual(map_chunked(double, items, chunk_size=4), expected)
+        self.assertEqual(map_chunked(double, items, ThreadExecutor(2), chunk_size=4), expected)
+        with ProcessExecutor(max_workers=2) as pool:
+            self.assertEqual(map_chunked(double, items, pool, chunk_size=4), expected)
+            self.assertEqual(encode_chunked(double, [1, 2], pool), [b"2", b"4"])
+
+    def test_gst_and_item_lines_on_process_pool(self):
+        invoices = [invoice(i) for i in range(40)]
+        serial = GSTAggregator().add_invoices(invoices)
+        with ProcessExecutor(max_workers=2) as pool:
+            parallel = aggregate_invoices(invoices, pool, chunk_size=7)
+            lines = item_lines_to_api([ItemDetail("i1", qty=2, rate=50, tax_rate=18)] * 3,
+                                      executor=pool, chunk_size=2)
+        self.assertEqual(parallel.gstr1(), serial.gstr1())
+        self.assertEqual(parallel.documents, 40)
+        self.assertEqual([line["amount"] for line in lines], [100, 100, 100])
+        self.assertEqual(lines[0]["cgst_tax_amount"], 9.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from alignbooks.export import (
+    DatasetWriter, _coerce, document_lines, flatten, header_schema, infer_schema, line_schema,
+)
+from alignbooks.exceptions import ValidationError
+from alignbooks.models import ItemDetail, build_document_shell
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+def _invoice(doc_id, vdate, lines=2):
+    doc = build_document_shell(party_id="p1", party_name="Acme", vdate=vdate,
+                               item_details=[ItemDetail("i1", qty=2, rate=50, tax_rate=18).to_api_dict()
+                                             for _ in range(lines)])
+    doc["id"] = doc_id
+    return doc
+
+class TestSchemas(unittest.TestCase):
+    def test_flatten_references(self):
+        row = flatten({"party": {"id": "p1", "name": "Acme"}, "tags": [1], "qty": 2})
+        self.assertEqual(row, {"party_id": "p1", "party_name": "Acme", "tags": [1], "qty": 2})
+
+    def test_template_schemas(self):
+        header = dict(header_schema())
+        self.assertEqual(header["party_id"], "string")
+        self.assertEqual(header["vtype"], "int64")
+        self.assertNotIn("item_detail", header)
+        self.assertEqual(header["send_for_approval"], "bool")
+        lines = dict(line_schema())
+        self.assertEqual(lines["qty"], "float64")
+        self.assertEqual(lines["item_id"], "string")
+        self.assertEqual(line_schema()[0], ("document_id", "string"))
+
+    def test_infer_and_coerce(self):
+        rows = [{"a": 1, "b": 1.5, "c": "x", "d": True, "line_no": 1}, {"a": 2, "b": 2, "line_no": 2}]
+        schema = dict(infer_schema(rows))
+        self.assertEqual(schema, {"a": "float64", "b": "float64", "c": "string", "d": "bool",
+                                  "line_no": "int64"})
+        self.assertEqual(dict(infer_schema(rows, int_columns=["a"]))["a"], "int64")
+        self.assertEqual(_coerce("7", "int64"), 7)
+        self.assertEqual(_coerce(7.0, "int64"), 7)
+        with self.assertRaises(ValidationError):
+            _coerce(2.5, "int64")
+        self.assertIsNone(_coerce("", "float64"))
+        self.assertEqual(_coerce("12.5", "float64"), 12.5)
+        self.assertEqual(_coerce([1, 2], "string"), "[1,2]")
+
+    def test_document_lines(self):
+        rows = document_lines(_invoice("d1", "2025-04-03"), vtype=6)
+        self.assertEqual([r["line_no"] for r in rows], [1, 2])
+        self.assertEqual(rows[0]["document_id"], "d1")
+        self.assertEqual(rows[0]["item_id"], "i1")
+
+@unittest.skipIf(pyarrow is None, "pyarrow not installed")
+class TestDatasetWriter(unittest.TestCase):
+    def test_partitioned_row_groups(self):
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = DatasetWriter(tmp, line_schema(), company_id="c1", row_group_size=3)
+            for i, vdate in enumerate(["2025-04-03", "2025-04-20", "2025-05-02"]):
+                writer.write(document_lines(_invoice(f"d{i}", vdate)), vtype=6)
+            files = writer.close()
+            april = os.path.join(tmp, "company=c1", "vtype=6", "month=2025-04", "part-00000.parquet")
+            self.assertEqual(files[april], 4)
+            self.assertEqual(pq.ParquetFile(april).num_row_groups, 2)
+            self.assertEqual(writer.rows_written, 6)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from alignbooks.fingerprints import FingerprintStore, document_fingerprint
+from alignbooks.services.documents import DocumentsService
+
+
+class FakeClient:
+    company_id = "c1"
+
+    def __init__(self, headers, modified):
+        self.headers = headers
+        self.modified = modified
+        self.calls = []
+
+    def api_call(self, endpoint, body=None, **kwargs):
+        self.calls.append(endpoint)
+        if endpoint == "List_Document":
+            if not isinstance(self.headers, list):
+                return self.headers
+            return [dict(h) for h in self.headers]
+        if endpoint == "QueryExecute":
+            return [{"id": k, "modified_on": v} for k, v in self.modified.items()]
+        if body["id"] == "bad":
+            raise RuntimeError("no rights")
+        return {"id": body["id"], "item_detail": []}
+
+
+class TestHydrate(unittest.TestCase):
+    def test_fingerprint_ignores_volatile_fields(self):
+        a = document_fingerprint({"id": "d1", "amount": 10, "row_num": 1}, ["t1"])
+        self.assertEqual(a, document_fingerprint({"id": "d1", "amount": 10.0, "row_num": 7}, ["t1"]))
+        self.assertNotEqual(a, document_fingerprint({"id": "d1", "amount": 10}, ["t2"]))
+
+    def test_only_changed_documents_are_fetched(self):
+        headers = [{"id": f"d{i}", "vdate": "2025-04-02", "amount": i} for i in range(5)]
+        headers.append({"id": "bad", "vdate": "2025-04-03"})
+        client = FakeClient(headers, {f"d{i}": "t0" for i in range(5)})
+        docs = DocumentsService(client)
+        with FingerprintStore(":memory:") as store:
+            kwargs = dict(store=store, probe_table="tr_order")
+            first = docs.hydrate(3, "2025-04-01", "2025-04-30", **kwargs)
+            self.assertEqual(len(first.documents), 5)
+            self.assertEqual([d for d, _ in first.failed], ["bad"])
+            self.assertIn("Display_Order", client.calls)
+
+            client.calls.clear()
+            client.modified["d1"] = "t1"
+            client.headers = [h for h in headers if h["id"] != "d4"]
+            second = docs.hydrate(3, "2025-04-01", "2025-04-30", **kwargs)
+            self.assertEqual(sorted(second.documents), ["d1"])
+            self.assertEqual(len(second.unchanged), 3)
+            self.assertEqual(second.removed, ["d4"])
+            self.assertEqual(client.calls.count("Display_Order"), 2)  # d1 + retried "bad"
+            self.assertIsNone(store.get("d4"))
+
+    def test_odd_listing_does_not_remove_documents(self):
+        headers = [{"id": f"d{i}", "vdate": "2025-04-02"} for i in range(3)]
+        client = FakeClient(headers, {})
+        docs = DocumentsService(client)
+        with FingerprintStore(":memory:") as store:
+            docs.hydrate(3, "2025-04-01", "2025-04-30", store=store)
+            for odd in ([], {"ReturnCode": 0, "JsonDataTable": ""}):
+                client.headers = odd
+                report = docs.hydrate(3, "2025-04-01", "2025-04-30", store=store)
+                self.assertEqual(report.removed, [])
+            self.assertIsNotNone(store.get("d1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
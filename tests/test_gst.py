@@ -0,0 +1,59 @@
+import unittest
+from alignbooks.constants import VType
+from alignbooks.gst import GSTAggregator
+from alignbooks.models import ItemDetail, build_document_shell
+
+def _invoice(vtype, gstin="", inter=False, qty=10, rate=100.0):
+    line = ItemDetail(item_id="i1", unit_name="PCS", qty=qty, rate=rate, tax_rate=18).to_api_dict(
+        is_inter_state=inter)
+    line["hsn_code"] = "7318"
+    doc = build_document_shell(party_id="p1", party_gst=gstin, item_details=[line])
+    doc["vtype"] = vtype
+    return doc
+
+class TestGSTAggregator(unittest.TestCase):
+    def test_gstr1_sections(self):
+        gst = GSTAggregator()
+        gst.add_invoices([
+            _invoice(VType.SALES_INVOICE, gstin="07ABCDE1234F1Z5"),
+            _invoice(VType.SALES_INVOICE, inter=True),
+            _invoice(VType.SALES_RETURN, gstin="07ABCDE1234F1Z5", qty=2),
+            _invoice(VType.SALES_ORDER),
+        ])
+        hsn = gst.hsn_summary()
+        self.assertEqual(len(hsn), 1)
+        self.assertEqual(hsn[0]["taxable"], 1800.0)
+        self.assertEqual(hsn[0]["igst"], 180.0)
+        self.assertEqual(hsn[0]["cgst"], 72.0)
+        self.assertEqual(gst.b2b()[0]["taxable"], 800.0)
+        self.assertEqual(gst.b2c()[0]["kind"], "B2CS")
+
+    def test_gstr3b_and_merge(self):
+        sales, purchases = GSTAggregator(), GSTAggregator()
+        sales.add_invoice(_invoice(VType.SALES_INVOICE))
+        purchases.add_invoice(_invoice(VType.PURCHASE_BILL, inter=True, qty=5))
+        summary = sales.merge(purchases).gstr3b()
+        self.assertEqual(summary["3.1a"]["taxable"], 1000.0)
+        self.assertEqual(summary["4"]["igst"], 90.0)
+        self.assertEqual(sales.documents, 2)
+
+    def test_b2c_large(self):
+        gst = GSTAggregator(b2cl_threshold=1000)
+        gst.add_invoice(_invoice(VType.SALES_INVOICE, inter=True))
+        self.assertEqual(gst.b2c()[0]["kind"], "B2CL")
+
+    def test_rows_b2c_large_and_zero_rated_inter_state(self):
+        gst = GSTAggregator(b2cl_threshold=1000)
+        base = {"vtype": VType.SALES_INVOICE, "hsn_code": "7318", "location_state_id": "07"}
+        gst.add_row({**base, "tax_rate": 18, "taxable": 1000, "igst_tax_amount": 180,
+                     "place_of_supply": "27", "invoice_value": 1180})
+        gst.add_row({**base, "tax_rate": 18, "taxable": 500, "igst_tax_amount": 90,
+                     "place_of_supply": "27", "invoice_value": 590})
+        gst.add_row({**base, "tax_rate": 0, "taxable": 300, "place_of_supply": "27"})
+        self.assertEqual([(r["kind"], r["rate"], r["taxable"]) for r in gst.b2c()],
+                         [("B2CL", 18.0, 1000.0), ("B2CS", 0.0, 300.0), ("B2CS", 18.0, 500.0)])
+        self.assertEqual({(r["rate"], r["supply"]) for r in gst.rate_summary()},
+                         {(18.0, "inter"), (0.0, "inter")})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from alignbooks.joins import Index, group_by, hash_join
+
+STOCK = [
+    {"item_id": "i1", "warehouse_id": "w1", "qty": 10},
+    {"item_id": "i1", "warehouse_id": "w2", "qty": -3},
+    {"item_id": "i2", "warehouse_id": "w1", "qty": 5},
+    {"item_id": "i9", "warehouse_id": "w1", "qty": 1},
+]
+ITEMS = [{"id": "i1", "name": "Bolt"}, {"id": "i2", "name": "Nut"}]
+
+class TestJoins(unittest.TestCase):
+    def test_inner_join_with_reusable_index(self):
+        index = Index(ITEMS, "id")
+        rows = hash_join(STOCK, index, on="item_id")
+        self.assertEqual([r["name"] for r in rows], ["Bolt", "Bolt", "Nut"])
+        self.assertEqual(len(hash_join(STOCK[:1], index, on="item_id")), 1)
+
+    def test_left_join_and_suffix(self):
+        rows = hash_join(STOCK, [{"id": "i1", "qty": 99}], on="item_id", right_on="id", how="left")
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]["qty_right"], 99)
+        self.assertIsNone(rows[2]["qty_right"])
+
+    def test_group_by(self):
+        rows = group_by(STOCK, "item_id", {"balance": ("sum", "qty"), "n": ("count", None),
+                                           "low": ("min", "qty")})
+        by_item = {r["item_id"]: r for r in rows}
+        self.assertEqual(by_item["i1"], {"item_id": "i1", "balance": 7, "n": 2, "low": -3})
+
+    def test_group_by_multiple_keys(self):
+        rows = group_by(STOCK, ["item_id", "warehouse_id"], {"avg": ("avg", "qty")})
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0], {"item_id": "i1", "warehouse_id": "w1", "avg": 10.0})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import json
+import unittest
+from alignbooks.records import MasterRecord, Record, decode_records, to_records
+
+
+class TestRecords(unittest.TestCase):
+    def test_mapping_and_attribute_access(self):
+        rows = decode_records('[{"id": "m1", "name": "Acme", "class": "A", "sale rate": 5}]',
+                              MasterRecord)
+        row = rows[0]
+        self.assertIsInstance(row, MasterRecord)
+        self.assertEqual((row["id"], row.name, row.get("class"), row["sale rate"]),
+                         ("m1", "Acme", "A", 5))
+        self.assertEqual(list(row), ["id", "name", "class", "sale rate"])
+        self.assertNotIn("missing", row)
+        self.assertFalse(hasattr(row, "__dict__"))
+
+    def test_keys_named_like_methods_do_not_shadow_them(self):
+        text = '[{"id": 1, "items": [{"a": 1}], "values": 2, "keys": 3, "get": 4, "to_dict": 5}]'
+        row = decode_records(text)[0]
+        self.assertEqual(row.to_dict(), json.loads(text)[0])
+        self.assertEqual(row["items"], [{"a": 1}])
+        self.assertEqual(row.get("get"), 4)
+        self.assertEqual(row.keys(), ("id", "items", "values", "keys", "get", "to_dict"))
+
+    def test_layouts_share_one_class(self):
+        first, second = to_records([{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+        self.assertIs(type(first), type(second))
+        self.assertIs(Record.of(("id", "name")), type(first))
+        self.assertEqual(first, {"id": 1, "name": "a"})
+
+if __name__ == "__main__":
+    unittest.main()
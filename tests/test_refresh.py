@@ -0,0 +1,56 @@
+import threading
+import time
+import unittest
+from alignbooks.refresh import BackgroundRefresher
+
+class TestBackgroundRefresher(unittest.TestCase):
+    def test_stale_while_revalidate(self):
+        calls = []
+        gate = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            if len(calls) > 1:
+                gate.wait(1)
+            return len(calls)
+
+        refresher = BackgroundRefresher()
+        refresher.register("n", fetch, interval=0.05, prefetch=False)
+        self.assertEqual(refresher.get("n"), 1)
+        time.sleep(0.06)
+        self.assertEqual(refresher.get("n"), 1)  # stale value served, refresh in flight
+        gate.set()
+        time.sleep(0.05)
+        self.assertEqual(refresher.get("n"), 2)
+        refresher.stop()
+
+    def test_failure_keeps_last_value(self):
+        state = {"fail": False}
+
+        def fetch():
+            if state["fail"]:
+                raise RuntimeError("boom")
+            return "ok"
+
+        with BackgroundRefresher(max_concurrent=1) as refresher:
+            refresher.register("v", fetch, interval=0.02)
+            self.assertEqual(refresher.get("v", timeout=1), "ok")
+            state["fail"] = True
+            time.sleep(0.1)
+            self.assertEqual(refresher.get("v"), "ok")
+            self.assertGreater(refresher.stats()["v"]["failures"], 0)
+
+    def test_out_of_band_refreshes_keep_one_schedule(self):
+        with BackgroundRefresher() as refresher:
+            refresher.register("d", lambda: time.monotonic(), interval=60)
+            refresher.get("d", timeout=1)
+            for _ in range(5):
+                refresher.refresh("d")
+                deadline = time.monotonic() + 1
+                while refresher.stats()["d"]["in_flight"] and time.monotonic() < deadline:
+                    time.sleep(0.005)
+            self.assertEqual(refresher.stats()["d"]["refreshes"], 6)
+            self.assertEqual(len(refresher._heap), 1)
+
+if __name__ == "__main__":
+    unittest.main()
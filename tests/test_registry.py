@@ -0,0 +1,45 @@
+import unittest
+from alignbooks.cache import ResponseCache
+from alignbooks.constants import SERVICE_MAP, Service
+from alignbooks.registry import endpoint_info, get_registry
+
+class TestEndpointRegistry(unittest.TestCase):
+    def test_covers_service_map(self):
+        registry = get_registry()
+        self.assertGreaterEqual(len(registry), len(SERVICE_MAP))
+        for name, service in SERVICE_MAP.items():
+            self.assertEqual(registry.service_for(name), service)
+        self.assertEqual(registry.service_for("NotAnEndpoint"), Service.DATA)
+        self.assertIsNone(endpoint_info("NotAnEndpoint"))
+        with self.assertRaises(KeyError):
+            registry["NotAnEndpoint"]
+
+    def test_metadata(self):
+        invoice = endpoint_info("SaveUpdate_Invoice")
+        self.assertEqual(invoice.kind, "write")
+        self.assertEqual(invoice.body_key, "invoice")
+        self.assertFalse(invoice.idempotent)
+        self.assertFalse(invoice.cacheable)
+
+        setup = endpoint_info("Display_CompanySetup")
+        self.assertTrue(setup.idempotent and setup.cacheable)
+        self.assertEqual(setup.ttl, 86400)
+
+    def test_select(self):
+        writes = get_registry().select(kind="write")
+        self.assertTrue(writes)
+        self.assertTrue(all(not e.cacheable for e in writes))
+
+    def test_cache_registry_hints(self):
+        self.assertIsNone(ResponseCache(ttls={}).ttl_for("Display_DocumentGeneralSetup"))
+        hinted = ResponseCache(ttls={"GetLedgerInfo": 5}, registry_hints=True)
+        self.assertEqual(hinted.ttl_for("Display_DocumentGeneralSetup"), 86400)
+        self.assertEqual(hinted.ttl_for("GetLedgerInfo"), 5)
+        self.assertIsNone(hinted.ttl_for("SaveUpdate_Invoice"))
+        hinted.set_ttl("Display_DocumentGeneralSetup", None)
+        self.assertIsNone(hinted.ttl_for("Display_DocumentGeneralSetup"))
+        self.assertIsNone(ResponseCache(ttls={"Display_DocumentGeneralSetup": None},
+                                        registry_hints=True).ttl_for("Display_DocumentGeneralSetup"))
+
+if __name__ == "__main__":
+    unittest.main()
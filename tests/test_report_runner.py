@@ -0,0 +1,63 @@
+import json
+import unittest
+from datetime import date
+from alignbooks.cache import ResponseCache
+from alignbooks.client import AlignBooksClient
+from alignbooks.report_runner import ReportRunner, date_chunks, merge_chunks
+from alignbooks.transport import RecordedResponse
+
+
+class ReportTransport:
+    """Answers every report chunk with one row naming its period."""
+
+    def __init__(self):
+        self.reports = 0
+
+    def post(self, url, *, headers, data, timeout):
+        if url.endswith("GetReportData"):
+            self.reports += 1
+            body = json.loads(data)
+            rows = [{"period": body["from_date"]}]
+        else:
+            rows = [{}]
+        return RecordedResponse(url, 200, json.dumps({"ReturnCode": 0,
+                                                      "JsonDataTable": json.dumps(rows)}), 0.0)
+
+class TestReportRunner(unittest.TestCase):
+    def test_month_chunks_are_calendar_aligned(self):
+        chunks = date_chunks("2025-04-15", "2025-06-03")
+        self.assertEqual(chunks, [
+            (date(2025, 4, 15), date(2025, 4, 30)),
+            (date(2025, 5, 1), date(2025, 5, 31)),
+            (date(2025, 6, 1), date(2025, 6, 3)),
+        ])
+        self.assertEqual(date_chunks("2025-12-20", "2026-01-05")[1][0], date(2026, 1, 1))
+
+    def test_merge_balances(self):
+        chunks = [
+            [{"ledger_id": "a", "opening": 10, "debit": 5, "closing": 15}],
+            [{"ledger_id": "a", "opening": 15, "debit": 3, "closing": 18},
+             {"ledger_id": "b", "opening": 1, "debit": 1, "closing": 2}],
+        ]
+        rows = merge_chunks(chunks, key="ledger_id")
+        self.assertEqual(rows[0], {"ledger_id": "a", "opening": 10, "debit": 8, "closing": 18})
+        self.assertEqual(len(merge_chunks(chunks)), 3)
+
+    def test_empty_cache_passed_in_is_used(self):
+        transport = ReportTransport()
+        client = AlignBooksClient("e", "p", "k", "ent", "c1", "u", transport=transport)
+        cache = ResponseCache(ttls={})
+        self.assertEqual(len(cache), 0)
+
+        runner = ReportRunner(client, cache=cache)
+        self.assertIs(runner.cache, cache)
+        runner.run({}, "2025-04-01", "2025-06-30", today=date(2025, 7, 1))
+        self.assertEqual(transport.reports, 3)
+
+        rerun = ReportRunner(client, cache=cache)
+        rows = rerun.run({}, "2025-04-01", "2025-06-30", today=date(2025, 7, 1))
+        self.assertEqual(transport.reports, 3)
+        self.assertEqual((rerun.cached_chunks, len(rows)), (3, 3))
+
+if __name__ == "__main__":
+    unittest.main()
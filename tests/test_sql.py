@@ -0,0 +1,92 @@
+import re
+import threading
+import unittest
+from alignbooks.exceptions import ValidationError
+from alignbooks.services.query import QueryService
+from alignbooks.sql import Select, chunked, quote, split_range
+
+
+class TableClient:
+    """Answers QueryExecute probes and vdate range shards from in-memory rows."""
+
+    company_id = "c1"
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+        self._lock = threading.Lock()
+
+    def api_call(self, endpoint, body=None, **kwargs):
+        sql = body["query"]
+        with self._lock:
+            self.queries.append(sql)
+        dates = [r["vdate"] for r in self.rows]
+        if "MIN(" in sql:
+            return [{"lo": min(dates), "hi": max(dates), "n": len(dates)}]
+        lo, op, hi = re.search(r"vdate >= '([^']*)' AND vdate (<=?) '([^']*)'", sql).groups()
+        return [r for r in self.rows
+                if r["vdate"] >= lo and (r["vdate"] <= hi if op == "<=" else r["vdate"] < hi)]
+
+class TestSQL(unittest.TestCase):
+    def test_quote(self):
+        self.assertEqual(quote("O'Brien\\"), "'O\\'Brien\\\\'")
+        self.assertEqual(quote(None), "NULL")
+        self.assertEqual(quote(True), "1")
+        self.assertEqual(quote(2.5), "2.5")
+        with self.assertRaises(ValidationError):
+            quote(float("nan"))
+
+    def test_company_scope_injected(self):
+        sql = Select("mst_item", ["id", "name"]).where("is_active", "=", 1).limit(10).to_sql("c1")
+        self.assertEqual(
+            sql,
+            "SELECT id, name FROM mst_item WHERE company_id = 'c1' AND is_active = 1 LIMIT 10",
+        )
+        with self.assertRaises(ValidationError):
+            Select("mst_item").to_sql()
+        self.assertEqual(
+            Select("information_schema.tables", company_scoped=False).to_sql(),
+            "SELECT * FROM information_schema.tables",
+        )
+
+    def test_where_in(self):
+        sql = Select("mst_party", "id").where_in("id", ["a", "b"]).to_sql("c1")
+        self.assertEqual(sql, "SELECT id FROM mst_party WHERE company_id = 'c1' AND id IN ('a', 'b')")
+
+    def test_rejects_bad_identifiers(self):
+        with self.assertRaises(ValidationError):
+            Select("mst_item").where("id; DROP TABLE x", "=", 1)
+        with self.assertRaises(ValidationError):
+            Select("mst_item").where("id", "OR 1=1 --", 1)
+
+    def test_chunked(self):
+        self.assertEqual(chunked([1, 2, 3, 4, 5], 2), [[1, 2], [3, 4], [5]])
+
+    def test_split_range(self):
+        self.assertEqual(split_range(1, 100, 4), [1, 26, 51, 76, 100])
+        self.assertEqual(split_range("2025-01-01", "2025-01-03 10:00:00", 2),
+                         ["2025-01-01", "2025-01-02", "2025-01-03 10:00:00"])
+        self.assertEqual(split_range("00000000-aa", "ffffffff-bb", 2)[1], "7fffffff")
+        self.assertEqual(split_range("x", "y", 4), ["x", "y"])
+        upper = split_range("0A000000-AA", "F3000000-BB", 4)
+        self.assertEqual(upper, ["0A000000-AA", "44400000", "7E800000", "B8C00000", "F3000000-BB"])
+        self.assertEqual(len(split_range("0a000000-aa", "F3000000-BB", 4)), 5)
+
+    def test_query_parallel(self):
+        rows = [{"id": i, "vdate": f"2025-{m:02d}-{d:02d}"}
+                for i, (m, d) in enumerate((m, d) for m in range(1, 13) for d in (1, 15, 28))]
+        client = TableClient(rows)
+        result = QueryService(client).query_parallel(
+            Select("et_stock"), "vdate", shards=4, order_by=["id DESC"], min_shard_rows=1, rate=1000,
+        )
+        self.assertEqual([r["id"] for r in result], list(range(len(rows)))[::-1])
+        self.assertEqual(len(client.queries), 5)  # probe + 4 shards
+        self.assertIn("company_id = 'c1'", client.queries[1])
+
+        raw = "SELECT * FROM et_stock WHERE company_id = 'c1' AND {shard}"
+        self.assertEqual(len(QueryService(client).query_parallel(raw, "vdate", shards=3)), len(rows))
+        with self.assertRaises(ValidationError):
+            QueryService(client).query_parallel(Select("et_stock").limit(5))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from alignbooks.stock import StockSnapshot
+
+
+class FakeInventory:
+    def __init__(self, balances, moved):
+        self.balances = balances
+        self.moved = moved
+        self.full_polls = []
+
+    def item_balances(self, warehouse_id, branch_id):
+        self.full_polls.append(warehouse_id)
+        return [{"item_id": k, "balance": v} for k, v in self.balances[warehouse_id].items()]
+
+    def moved_stock(self, from_date, to_date):
+        return self.moved
+
+
+class TestStockSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeInventory({"w1": {"i1": 5, "i2": 1}, "w2": {"i1": 2}}, [])
+        self.snap = StockSnapshot(["w1", "w2"], self.service)
+        self.snap.refresh()
+
+    def test_full_poll_deltas(self):
+        self.service.balances["w1"] = {"i1": 5, "i2": -3}
+        deltas = self.snap.refresh()
+        self.assertEqual(deltas["w1"].changed, [("i2", 1.0, -3.0)])
+        self.assertEqual(deltas["w1"].new_negatives, [("i2", -3.0)])
+        self.assertFalse(deltas["w2"])
+        self.assertEqual(self.snap.balance("i1"), 7.0)
+
+    def test_moved_rows_by_warehouse(self):
+        self.service.moved = [{"item_id": "i1", "warehouse_id": "w2", "balance": 4}]
+        deltas = self.snap.refresh("2025-04-01")
+        self.assertEqual(deltas["w2"].changed, [("i1", 2.0, 4.0)])
+        self.assertEqual(self.snap.balance("i2", "w1"), 1.0)
+        self.assertEqual(self.service.full_polls, ["w1", "w2"])
+
+    def test_moved_rows_without_warehouse_fall_back_to_full_poll(self):
+        self.service.moved = [{"item_id": "i1", "balance": 9}]
+        self.service.balances["w2"] = {"i1": 9}
+        deltas = self.snap.refresh("2025-04-01")
+        self.assertEqual(deltas["w2"].changed, [("i1", 2.0, 9.0)])
+        self.assertEqual(self.service.full_polls, ["w1", "w2", "w1", "w2"])
+
+if __name__ == "__main__":
+    unittest.main()
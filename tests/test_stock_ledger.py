@@ -0,0 +1,95 @@
+import os
+import re
+import tempfile
+import unittest
+from alignbooks.stock_ledger import StockLedger
+
+ROWS = [
+    {"id": "r1", "item_id": "i1", "warehouse_id": "w1", "vdate": "2025-04-01T00:00:00", "qty": 10},
+    {"id": "r2", "item_id": "i1", "warehouse_id": "w2", "vdate": "2025-04-15", "qty": 5},
+    {"id": "r3", "item_id": "i1", "warehouse_id": "w1", "vdate": "2025-05-02", "qty": -4},
+    {"id": "r4", "item_id": "i2", "warehouse_id": "w1", "vdate": "2025-05-02", "qty": 7},
+]
+
+class FakeQuery:
+    """Serves et_stock pages for ``vdate >= ...`` QueryExecute selects."""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.sql = []
+
+    def run(self, select):
+        sql = select.to_sql("c1")
+        self.sql.append(sql)
+        since = re.search(r"vdate >= '([^']*)'", sql)
+        limit, offset = map(int, re.search(r"LIMIT (\d+) OFFSET (\d+)", sql).groups())
+        rows = sorted((r for r in self.rows if not since or r["vdate"][:10] >= since.group(1)),
+                      key=lambda r: (r["vdate"], r["id"]))
+        return [dict(r) for r in rows[offset:offset + limit]]
+
+class TestStockLedger(unittest.TestCase):
+    def setUp(self):
+        self.ledger = StockLedger()
+        self.ledger.ingest(ROWS)
+
+    def test_balances_as_of(self):
+        ledger = self.ledger
+        self.assertEqual(ledger.balance("i1"), 11)
+        self.assertEqual(ledger.balance("i1", "w1"), 6)
+        self.assertEqual(ledger.balance_as_of("2025-03-31", "i1"), 0)
+        self.assertEqual(ledger.balance_as_of("2025-04-30", "i1"), 15)
+        self.assertEqual(ledger.balance_as_of("2025-05-02", "i1", "w1"), 6)
+        self.assertEqual(ledger.checkpoints["2025-04"][("i1", "w1", "")], 10)
+
+    def test_incremental_ingest_dedupes_watermark_day(self):
+        applied = self.ledger.ingest([
+            ROWS[3],
+            {"id": "r5", "item_id": "i2", "warehouse_id": "w1", "vdate": "2025-05-03", "qty": -2},
+        ])
+        self.assertEqual(applied, 1)
+        self.assertEqual(self.ledger.balance("i2"), 5)
+
+    def test_backdated_movement(self):
+        self.ledger.ingest([{"id": "r0", "item_id": "i1", "warehouse_id": "w1", "vdate": "2025-04-10", "qty": 1}])
+        self.assertEqual(self.ledger.balance_as_of("2025-04-09", "i1", "w1"), 10)
+        self.assertEqual(self.ledger.balance_as_of("2025-04-10", "i1", "w1"), 11)
+        self.assertEqual(self.ledger.balance("i1", "w1"), 7)
+
+    def test_sync_picks_up_backdated_edited_and_deleted_rows(self):
+        query = FakeQuery(ROWS)
+        ledger = StockLedger(resync_days=7)
+        self.assertEqual(ledger.sync(query, page_size=2), 4)
+        self.assertEqual(ledger.sync(query), 0)
+        self.assertIn("vdate >= '2025-04-25'", query.sql[-1])
+
+        query.rows.append({"id": "r6", "item_id": "i1", "warehouse_id": "w1",
+                           "vdate": "2025-04-28", "qty": 3})  # back-dated voucher
+        query.rows[3] = dict(ROWS[3], qty=9)                    # edited quantity
+        del query.rows[2]                                       # deleted row r3
+        self.assertEqual(ledger.sync(query), 2)
+        self.assertEqual(ledger.balance("i1", "w1"), 13)
+        self.assertEqual(ledger.balance("i2"), 9)
+        self.assertEqual(ledger.checkpoints["2025-04"][("i1", "w1", "")], 13)
+
+        rebuilt = StockLedger()
+        rebuilt.sync(query)
+        self.assertEqual(rebuilt.balances_as_of("2025-05-31"), ledger.balances_as_of("2025-05-31"))
+
+        query.rows[0] = dict(ROWS[0], qty=20)  # before the window: needs a full rebuild
+        ledger.sync(query)
+        self.assertEqual(ledger.balance("i1", "w1"), 13)
+        ledger.sync(query, full=True)
+        self.assertEqual(ledger.balance("i1", "w1"), 23)
+
+    def test_save_load_and_compact(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ledger.json.gz")
+            self.ledger.save(path)
+            restored = StockLedger.load(path)
+        self.assertEqual(restored.balance_as_of("2025-04-30", "i1"), 15)
+        self.assertEqual(restored.watermark, "2025-05-02")
+        restored.compact("2025-04-30")
+        self.assertEqual(restored.balance_as_of("2025-05-02", "i1", "w1"), 6)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from alignbooks._concurrency import run_parallel
+from alignbooks.client import AlignBooksClient
+from alignbooks.tracing import Tracer, span, traced
+from alignbooks.transport import RecordedResponse
+
+
+class FakeTransport:
+    def post(self, url, **kwargs):
+        return RecordedResponse(url, 200, '{"ReturnCode":0,"JsonDataTable":"[{\\"id\\":1}]"}', 0.0)
+
+    def close(self):
+        pass
+
+
+class Service:
+    def __init__(self, client):
+        self._client = client
+
+    @traced("sync")
+    def sync(self):
+        return run_parallel(lambda n: self._client.api_call("ShortList", {"n": n}), [1, 2])
+
+
+class TestTracing(unittest.TestCase):
+    def test_nesting_across_threads(self):
+        tracer = Tracer()
+        client = AlignBooksClient("e", "p", "k", "ent", "c1", "u", auto_login=False,
+                                  transport=FakeTransport(), tracer=tracer)
+        Service(client).sync()
+
+        by_name = {}
+        for s in tracer.spans:
+            by_name.setdefault(s.name, []).append(s)
+        root = by_name["sync"][0]
+        self.assertEqual([c.parent_id for c in by_name["api_call"]], [root.span_id] * 2)
+        call_ids = {c.span_id for c in by_name["api_call"]}
+        for name in ("token", "parse.envelope", "parse.table"):
+            self.assertTrue(all(s.parent_id in call_ids for s in by_name[name]), name)
+
+        events = tracer.to_chrome_trace()["traceEvents"]
+        self.assertEqual(len(events), len(tracer.spans))
+        self.assertEqual(tracer.summary()["api_call"]["count"], 2)
+
+    def test_noop_without_tracer(self):
+        with span("anything") as s:
+            self.assertIsNone(s)
+
+
+if __name__ == "__main__":
+    unittest.main()
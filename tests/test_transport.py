@@ -0,0 +1,90 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from alignbooks._json import dumps
+from alignbooks.client import AlignBooksClient
+from alignbooks.exceptions import ReplayMissError
+from alignbooks.transport import RecordedResponse, RecordingTransport, ReplayTransport
+
+
+class FakeTransport:
+    def __init__(self):
+        self.calls = 0
+
+    def post(self, url, **kwargs):
+        self.calls += 1
+        rows = [{"id": "i1", "n": self.calls}]
+        payload = {"ReturnCode": 0, "JsonDataTable": json.dumps(rows)}
+        return RecordedResponse(url, 200, json.dumps(payload), 0.0)
+
+    def close(self):
+        pass
+
+
+def make_client(transport):
+    return AlignBooksClient("e", "p", "k", "ent", "c1", "u", auto_login=False, transport=transport)
+
+
+class TestTransport(unittest.TestCase):
+    def test_record_then_replay(self):
+        path = os.path.join(tempfile.mkdtemp(), "cassette.jsonl.gz")
+        with RecordingTransport(FakeTransport(), path) as recorder:
+            client = make_client(recorder)
+            first = client.api_call("ShortList", {"master_type": 2})
+            second = client.api_call("ShortList", {"master_type": 2})
+        self.assertEqual([first[0]["n"], second[0]["n"]], [1, 2])
+
+        replay = ReplayTransport(path, latency_scale=0)
+        client = make_client(replay)
+        self.assertEqual(client.api_call("ShortList", {"master_type": 2})[0]["n"], 1)
+        self.assertEqual(client.api_call("ShortList", {"master_type": 2})[0]["n"], 2)
+        self.assertEqual(client.api_call("ShortList", {"master_type": 2})[0]["n"], 2)
+        with self.assertRaises(ReplayMissError):
+            client.api_call("ShortList", {"master_type": 3})
+
+    def test_credentials_are_redacted(self):
+        class Login(FakeTransport):
+            def post(self, url, **kwargs):
+                rows = [{"user_id": "u1", "session_id": "s3cret"}]
+                return RecordedResponse(url, 200, json.dumps(
+                    {"ReturnCode": 0, "JsonDataTable": json.dumps(rows)}), 0.0)
+
+        path = os.path.join(tempfile.mkdtemp(), "cassette.jsonl.gz")
+        with RecordingTransport(Login(), path) as recorder:
+            AlignBooksClient("me@example.com", "hunter2", "k", "ent", "c1", "u",
+                             transport=recorder).login()
+        with gzip.open(path, "rt") as fh:
+            cassette = fh.read()
+        for secret in ("hunter2", "me@example.com", "s3cret"):
+            self.assertNotIn(secret, cassette)
+        self.assertIn("u1", cassette)
+
+        replay = ReplayTransport(path, latency_scale=0)
+        result = AlignBooksClient("other@example.com", "changed", "k", "ent", "c1", "u",
+                                  transport=replay).login()
+        self.assertEqual(result, [{"user_id": "u1", "session_id": "***"}])
+
+    def test_prepared_body_and_wire_stats(self):
+        sent = []
+
+        class Capture(FakeTransport):
+            def post(self, url, **kwargs):
+                sent.append(kwargs)
+                return super().post(url, **kwargs)
+
+        client = make_client(Capture())
+        prepared = client.prepare({"master_type": 2, "name": "é"})
+        client.api_call("ShortList", prepared)
+        client.api_call("ShortList", prepared)
+        self.assertIs(sent[0]["data"], sent[1]["data"])
+        self.assertNotIn(b" ", dumps({"a": [1, 2]}))
+        self.assertIn("gzip", sent[0]["headers"]["Accept-Encoding"])
+        stats = client.wire_stats.as_dict()
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["request_bytes"], 2 * len(prepared))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from alignbooks.cache import ResponseCache
+from alignbooks.client import AlignBooksClient
+from alignbooks.exceptions import APIError
+from alignbooks.transport import RecordedResponse
+from alignbooks.warmup import warmup
+
+
+class StartupTransport:
+    """Answers every endpoint after a fixed delay, tracking peak concurrency."""
+
+    def __init__(self, delay=0.05, failing=()):
+        self.delay = delay
+        self.failing = failing
+        self.endpoints = []
+        self.active = self.peak = 0
+        self._lock = threading.Lock()
+
+    def post(self, url, *, headers, data, timeout):
+        endpoint = url.rsplit("/", 1)[1]
+        with self._lock:
+            self.endpoints.append(endpoint)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if endpoint in self.failing:
+            body = {"ReturnCode": 1, "Message": "not allowed"}
+        elif endpoint == "ShortList":
+            master_type = json.loads(data)["master_type"]
+            rows = [{"id": f"m{master_type}-{i}", "name": f"Master {i}"} for i in range(3)]
+            body = {"ReturnCode": 0, "JsonDataTable": json.dumps(rows)}
+        else:
+            body = {"ReturnCode": 0, "JsonDataTable": json.dumps([{"endpoint": endpoint}])}
+        return RecordedResponse(url, 200, json.dumps(body), 0.0)
+
+
+def make_client(transport, **kwargs):
+    return AlignBooksClient("e", "p", "k", "ent", "c1", "u", transport=transport, **kwargs)
+
+
+class TestWarmup(unittest.TestCase):
+    def test_logs_in_then_loads_concurrently(self):
+        transport = StartupTransport()
+        client = make_client(transport, cache=ResponseCache())
+        report = client.warmup(masters=(1, 2, 3, 4))
+
+        self.assertTrue(report.ok)
+        self.assertEqual(transport.endpoints[0], "LoginUser")
+        self.assertEqual(transport.endpoints.count("ShortList"), 4)
+        self.assertGreaterEqual(transport.peak, 4)
+        self.assertLess(report.elapsed, 6 * transport.delay)
+        self.assertIn("Display_CompanySetup", report.timings)
+        self.assertEqual(report.indexes[3].first("m3-1")["name"], "Master 1")
+
+        calls = len(transport.endpoints)
+        client.api_call("Display_CompanySetup", service="ABConfigurationService.svc")
+        self.assertEqual(len(transport.endpoints), calls)  # served from the warmed cache
+
+    def test_failures_are_reported(self):
+        client = make_client(StartupTransport(delay=0, failing={"Display_DocumentNumberingSetup"}))
+        report = warmup(client, masters=(2,))
+        self.assertFalse(report.ok)
+        self.assertIsInstance(report.failed["Display_DocumentNumberingSetup"], APIError)
+        self.assertIn("ShortList:2", report.results)
+
+    def test_async_variant(self):
+        transport = StartupTransport(delay=0)
+        report = asyncio.run(make_client(transport).awarmup(masters=(), setup=False,
+                                                              extra=[("GetPrintFormatList", None)]))
+        self.assertEqual(transport.endpoints, ["LoginUser", "GetPrintFormatList"])
+        self.assertEqual(list(report.results), ["LoginUser", "GetPrintFormatList"])
+
+if __name__ == "__main__":
+    unittest.main()